@@ -0,0 +1,124 @@
+"""
+HTML 픽스처로 기존(BeautifulSoup + html.parser) 추출 경로와
+새 추출 경로(src.scrap.html_extract, lxml 단일 파싱)의 초당 처리 페이지 수를 비교하는 마이크로 벤치마크.
+
+실행 (프로젝트 루트에서):
+    python -m benchmarks.parse_benchmark
+    python -m benchmarks.parse_benchmark --repeat 200
+    python -m benchmarks.parse_benchmark --record "https://n.news.naver.com/mnews/article/001/0014850001"
+
+픽스처 파일 이름 규칙: *section_*.html (섹션 페이지), *article_*.html (기사 페이지)
+- synthetic_*.html: 네이버 페이지의 구조(선택자, 스크립트/내비게이션 분량)를 흉내 내어 만든 합성 HTML로, 실제 기사가 아닙니다.
+  기본으로 포함된 픽스처는 이것뿐이므로 출력되는 속도 차이도 합성 마크업에서 측정한 값입니다.
+- section_*.html, article_{oid}_{aid}.html: --record로 저장한 실제 네이버 페이지.
+  실제 페이지에서의 속도 차이는 --record로 페이지를 저장한 뒤 다시 실행하여 확인하세요.
+"""
+import argparse
+import glob
+import os
+import time
+
+import requests
+from bs4 import BeautifulSoup
+
+from src.scrap.html_extract import extract_links, extract_article, ARTICLE_PREFIX
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+
+def legacy_extract_links(html_content):
+    """기존 Scrap.ex_tag 구현"""
+    soup = BeautifulSoup(html_content, "html.parser")
+    a_tags = soup.find_all("a", href=True)
+
+    tag_lst = []
+    for a in a_tags:
+        href = a["href"]
+        if href.startswith(ARTICLE_PREFIX) and "/comment/" not in href:
+            tag_lst.append(href)
+
+    return tag_lst
+
+
+def legacy_extract_article(html_content):
+    """기존 Scrap.art_crawl의 파싱 구현"""
+    title_selector = "h2.media_end_head_headline"
+    date_selector = ".media_end_head_info_datestamp_time"
+    main_selector = "#dic_area"
+
+    soup = BeautifulSoup(html_content, "html.parser")
+
+    title = soup.select_one(title_selector).get_text(strip=True) if soup.select_one(title_selector) else 'N/A'
+    date = soup.select_one(date_selector).get_text(strip=True) if soup.select_one(date_selector) else 'N/A'
+    main = soup.select_one(main_selector).get_text(strip=True) if soup.select_one(main_selector) else 'N/A'
+
+    return {"title": title, "date": date, "main": main}
+
+
+def load_fixtures(pattern):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, pattern))):
+        with open(path, encoding='utf-8') as f:
+            pages.append(f.read())
+    return pages
+
+
+def measure(func, pages, repeat):
+    """func를 모든 페이지에 repeat번 적용하고 초당 처리 페이지 수를 반환"""
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            func(page)
+    elapsed_time = time.perf_counter() - start_time
+    return len(pages) * repeat / elapsed_time
+
+
+def record(urls):
+    """실제 네이버 페이지를 픽스처 폴더에 저장 (합성 픽스처와 함께 측정됨)"""
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for url in urls:
+        response = requests.get(url, headers=HEADERS, timeout=10)
+        if "/mnews/article/" in url:
+            oid, aid = url.split("/mnews/article/")[1].split("?")[0].split("/")[:2]
+            name = f"article_{oid}_{aid}.html"
+        else:
+            name = f"section_{url.split('sid1=')[-1].split('&')[0]}.html"
+        with open(os.path.join(FIXTURE_DIR, name), 'w', encoding='utf-8') as f:
+            f.write(response.text)
+        print(f"저장 완료: {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML 추출 경로 벤치마크")
+    parser.add_argument("--repeat", type=int, default=50, help="픽스처 반복 횟수")
+    parser.add_argument("--record", nargs="+", metavar="URL", help="실제 페이지를 픽스처로 저장")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record)
+        return
+
+    cases = [
+        ("링크 페이지", load_fixtures("*section_*.html"), legacy_extract_links, extract_links),
+        ("기사 페이지", load_fixtures("*article_*.html"), legacy_extract_article, extract_article),
+    ]
+    for name, pages, legacy, fast in cases:
+        if not pages:
+            print(f"[{name}] 픽스처가 없습니다.")
+            continue
+
+        # 두 경로의 추출 결과가 같은지 먼저 확인
+        for page in pages:
+            if legacy(page) != fast(page):
+                raise AssertionError(f"[{name}] 기존 경로와 새 경로의 추출 결과가 다릅니다.")
+
+        legacy_rate = measure(legacy, pages, args.repeat)
+        fast_rate = measure(fast, pages, args.repeat)
+        print(f"[{name}] 픽스처 {len(pages)}개 x {args.repeat}회")
+        print(f"  기존 (BeautifulSoup + html.parser): {legacy_rate:8.1f} pages/sec")
+        print(f"  신규 (lxml 단일 파싱)             : {fast_rate:8.1f} pages/sec ({fast_rate / legacy_rate:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+로컬 네이버 대역 서버(합성 HTML 픽스처)와 가짜 OpenAI 엔드포인트로 스크래핑과 요약의 처리량을 재는 벤치마크.
+실제 네이버와 OpenAI에는 요청하지 않으므로, 동시성/캐시/배치 변경을 매일 실행 전에 반복 가능한 조건에서 비교할 수 있습니다.
+
+시나리오 NxM은 N개 섹션 x 섹션당 M개 기사이며, 각 시나리오마다 다음을 보고합니다.
+    - 스크래핑: 모드별 초당 기사 수, 기사 요청 지연 시간 p50/p95, 헤지 요청 수(async), 멈춘 요청 재요청 수(thread/process), 재시도 수
+    - 요약: 모드별 초당 기사 수, LLM 호출 지연 시간 p50/p95, 기사당 LLM 호출 수, 429 응답 수, 기사당 입력 토큰 수
+
+네트워크 없이 실행하면 tiktoken 인코딩을 내려받지 못하므로 토큰 수는 근사치(UTF-8 4바이트당 1토큰)로 계산됩니다.
+정확한 토큰 수가 필요하면 네트워크가 있는 곳에서 한 번 실행하여 tiktoken 캐시(TIKTOKEN_CACHE_DIR)를 채워 두세요.
+
+실행 (프로젝트 루트에서):
+    python -m benchmarks.pipeline_benchmark
+    python -m benchmarks.pipeline_benchmark --scenario 6x20 6x50 --scrap-modes async thread
+    python -m benchmarks.pipeline_benchmark --naver-latency 0.2 --naver-error-rate 0.05
+    python -m benchmarks.pipeline_benchmark --naver-stall-rate 0.02 --naver-stall-seconds 8 --no-hedge
+    python -m benchmarks.pipeline_benchmark --llm-latency 1.0 --server-tpm 20000 --rate-limit-rate 0.05
+    python -m benchmarks.pipeline_benchmark --input-tokens 1500
+    python -m benchmarks.pipeline_benchmark --output benchmark.json
+"""
+import argparse
+import json
+import time
+
+from langchain_openai import ChatOpenAI
+
+from benchmarks.stub_servers import NaverStub, FakeOpenAI
+from src.gpt.article_compressor import ArticleCompressor
+from src.gpt.news_summarizer import NewsSummarizer
+from src.gpt.rate_limiter import RateLimiter
+from src.scrap.scrap import Scrap
+from src.scrap.fetcher import Fetcher
+from src.util.metrics import metrics
+
+SCRAP_MODES = ["async", "thread", "process"]
+LLM_MODES = ["async", "thread", "batch"]
+MODEL = "gpt-3.5-turbo"
+
+
+def parse_scenario(value):
+    """'6x20' 형식의 시나리오를 (섹션 수, 섹션당 기사 수)로 변환"""
+    try:
+        sections, articles = (int(number) for number in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"시나리오는 NxM 형식이어야 합니다: {value}")
+    return sections, articles
+
+
+def latency_summary(name, **labels):
+    histogram = metrics.histogram(name, **labels)
+    return {"p50_ms": round(histogram.quantile(0.5) * 1000, 1), "p95_ms": round(histogram.quantile(0.95) * 1000, 1)}
+
+
+def bench_scrape(naver, sections, mode, workers, hedge=True):
+    """한 가지 스크래핑 모드로 모든 기사를 수집하고 (기사 DataFrame, 결과)를 반환"""
+    categories = {f"섹션{code}": str(code) for code in range(100, 100 + sections)}
+    scraper = Scrap(categories, None, section_url=naver.section_url, article_prefix=naver.article_prefix,
+                    fetcher=Fetcher(hedge=hedge))
+
+    metrics.reset()
+    start_time = time.perf_counter()
+    art_df = scraper.scrap(max_workers=workers, mode=mode)
+    elapsed_time = time.perf_counter() - start_time
+
+    return art_df, {
+        "stage": "scrape",
+        "mode": mode,
+        "articles": len(art_df),
+        "seconds": round(elapsed_time, 3),
+        "articles_per_sec": round(len(art_df) / elapsed_time, 1),
+        **latency_summary("http_request_duration_seconds", target="article"),
+        "hedges": metrics.counter("http_hedges_total", target="article"),
+        "stall_retries": metrics.counter("http_stall_retries_total", target="article"),
+        "retries": sum(value for (name, labels), value in metrics.counters.items() if name == "http_retries_total"),
+    }
+
+
+def bench_summarize(fake, art_df, mode, args):
+    """한 가지 요약 모드로 모든 기사를 요약하고 결과를 반환 (요약 캐시는 사용하지 않음)"""
+    # 시나리오마다 요청 제한기를 새로 만들어 이전 실행의 쿨다운이 이어지지 않도록 함
+    summarizer = NewsSummarizer(api_key="sk-benchmark", rate_limiter=RateLimiter(args.rpm, args.tpm),
+                                max_workers=args.llm_workers,
+                                compressor=ArticleCompressor(args.input_tokens) if args.input_tokens else None)
+    summarizer.llm = ChatOpenAI(api_key="sk-benchmark", base_url=f"{fake.base_url}/v1", model=MODEL,
+                                temperature=0, max_retries=0)
+    calls_before, rate_limited_before = fake.calls, fake.rate_limited
+
+    metrics.reset()
+    start_time = time.perf_counter()
+    with metrics.stage("summarize"):
+        summary_df = summarizer.summarize_df(
+            art_df,
+            batch_token_budget=args.batch_tokens if mode == "batch" else None,
+            async_mode=mode == "async",
+            concurrency=args.llm_workers,
+        )
+    elapsed_time = time.perf_counter() - start_time
+
+    calls = fake.calls - calls_before
+    return {
+        "stage": "summarize",
+        "mode": mode,
+        "articles": len(summary_df),
+        "seconds": round(elapsed_time, 3),
+        "articles_per_sec": round(len(summary_df) / elapsed_time, 1),
+        **latency_summary("llm_request_duration_seconds", stage="summarize", model=MODEL),
+        "llm_calls_per_article": round(calls / max(len(art_df), 1), 2),
+        "rate_limited": fake.rate_limited - rate_limited_before,
+        "prompt_tokens_per_article": round(
+            metrics.counter("llm_tokens_total", stage="summarize", kind="prompt") / max(len(art_df), 1), 1),
+    }
+
+
+def print_result(result):
+    line = (f"  [{result['stage']:9} {result['mode']:7}] {result['articles']:4}건 {result['seconds']:7.2f}초 "
+            f"{result['articles_per_sec']:7.1f} articles/sec  p50 {result['p50_ms']:7.1f}ms  p95 {result['p95_ms']:7.1f}ms")
+    if result["stage"] == "scrape":
+        line += f"  헤지 {result['hedges']}회  멈춘 요청 재요청 {result['stall_retries']}회  재시도 {result['retries']}회"
+    if result["stage"] == "summarize":
+        line += (f"  LLM 호출/기사 {result['llm_calls_per_article']:.2f}  429 {result['rate_limited']}회"
+                 f"  입력 토큰/기사 {result['prompt_tokens_per_article']:.0f}")
+    print(f"\033[92m{line}\033[0m")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스크래핑/요약 오프라인 벤치마크")
+    parser.add_argument("--scenario", nargs="+", type=parse_scenario, default=[(6, 20)], metavar="NxM",
+                        help="섹션 수 x 섹션당 기사 수 (기본: 6x20)")
+    parser.add_argument("--scrap-modes", nargs="+", choices=SCRAP_MODES, default=SCRAP_MODES)
+    parser.add_argument("--llm-modes", nargs="+", choices=LLM_MODES, default=LLM_MODES)
+    parser.add_argument("--workers", type=int, default=10, help="스크래핑 동시 연결 수")
+    parser.add_argument("--naver-latency", type=float, default=0.05, help="네이버 대역 서버의 평균 응답 지연(초)")
+    parser.add_argument("--naver-error-rate", type=float, default=0.0, help="네이버 대역 서버의 503 응답 비율")
+    parser.add_argument("--naver-stall-rate", type=float, default=0.0, help="네이버 대역 서버가 응답을 멈출 확률")
+    parser.add_argument("--naver-stall-seconds", type=float, default=5.0, help="멈춘 응답의 지연 시간(초)")
+    parser.add_argument("--no-hedge", action="store_true", help="느린 요청에 헤지 요청(thread/process 모드는 멈춘 요청 재요청)을 보내지 않음")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="가짜 OpenAI의 평균 응답 지연(초)")
+    parser.add_argument("--server-tpm", type=int, default=None, help="가짜 OpenAI의 분당 토큰 한도 (초과 시 429)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="가짜 OpenAI가 429를 임의로 보낼 확률")
+    parser.add_argument("--rpm", type=int, default=500, help="클라이언트 요청 제한기의 분당 요청 수")
+    parser.add_argument("--tpm", type=int, default=200000, help="클라이언트 요청 제한기의 분당 토큰 수")
+    parser.add_argument("--llm-workers", type=int, default=16, help="요약 동시 요청 수")
+    parser.add_argument("--batch-tokens", type=int, default=6000, help="batch 모드에서 한 요청에 묶을 입력 토큰 수")
+    parser.add_argument("--input-tokens", type=int, default=None,
+                        help="요약 전에 본문을 이 토큰 수 이내로 압축 (생략하면 원문 그대로 요청)")
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    results = []
+    for sections, articles in args.scenario:
+        print(f"\033[95m[시나리오 {sections}x{articles}] 섹션 {sections}개 x 기사 {articles}개\033[0m")
+        art_df = None
+        with NaverStub(articles, args.naver_latency, args.naver_error_rate, args.naver_stall_rate,
+                       args.naver_stall_seconds) as naver:
+            for mode in args.scrap_modes:
+                art_df, result = bench_scrape(naver, sections, mode, args.workers, not args.no_hedge)
+                results.append({"scenario": f"{sections}x{articles}", **result})
+                print_result(result)
+
+        if art_df is None or art_df.empty:
+            continue
+        with FakeOpenAI(args.llm_latency, args.server_tpm, args.rate_limit_rate) as fake:
+            for mode in args.llm_modes:
+                result = bench_summarize(fake, art_df, mode, args)
+                results.append({"scenario": f"{sections}x{articles}", **result})
+                print_result(result)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"벤치마크 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+벤치마크용 로컬 HTTP 서버 (실제 네이버와 OpenAI에 요청하지 않음).
+
+- NaverStub: benchmarks/fixtures의 섹션/기사 HTML 픽스처(기본은 네이버 구조를 흉내 낸 합성 HTML)를 N개 섹션 x M개 기사로 늘려서 제공
+- FakeOpenAI: ChatOpenAI가 호출하는 /v1/chat/completions와 호환되는 가짜 엔드포인트
+
+두 서버 모두 응답 지연 시간과 오류 비율을 설정할 수 있습니다.
+"""
+import glob
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.scrap.html_extract import ARTICLE_PREFIX
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_fixtures(pattern):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, pattern))):
+        with open(path, encoding='utf-8') as f:
+            pages.append(f.read())
+    return pages
+
+
+def jittered(latency):
+    """평균 latency(초)를 중심으로 ±50% 흔들린 지연 시간"""
+    return random.uniform(0.5, 1.5) * latency if latency else 0
+
+
+class QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # 타임아웃이나 헤지 요청으로 클라이언트가 먼저 끊은 연결은 무시
+        pass
+
+
+class StubServer:
+    """백그라운드 스레드에서 실행되는 로컬 HTTP 서버 (with 문으로 시작/종료)"""
+
+    def __init__(self, handler):
+        self.httpd = QuietHTTPServer(("127.0.0.1", 0), handler)
+        self.httpd.stub = self
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # 커넥션 재사용(keep-alive)을 실제 서버처럼 지원
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def send_body(self, status, body, content_type="text/html; charset=utf-8", headers=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class NaverHandler(StubHandler):
+    def do_GET(self):
+        stub = self.server.stub
+        # 일부 요청은 stall_seconds 동안 멈춘 뒤 응답 (느린 요청 재현)
+        time.sleep(stub.stall_seconds if random.random() < stub.stall_rate else jittered(stub.latency))
+        if random.random() < stub.error_rate:
+            stub.count("errors")
+            self.send_body(503, "<html><body>Service Unavailable</body></html>")
+            return
+
+        section_match = re.search(r"sid1=(\d+)", self.path)
+        article_match = re.search(r"/mnews/article/(\d+)/(\d+)", self.path)
+        if section_match:
+            stub.count("sections")
+            self.send_body(200, stub.section_page(section_match.group(1)))
+        elif article_match:
+            stub.count("articles")
+            self.send_body(200, stub.article_page(*article_match.groups()))
+        else:
+            self.send_body(404, "<html><body>Not Found</body></html>")
+
+
+class NaverStub(StubServer):
+    """
+    HTML 픽스처로 네이버 뉴스를 흉내 내는 서버.
+    기본 픽스처는 실제 페이지가 아니라 네이버의 선택자와 페이지 구조를 흉내 낸 합성 HTML입니다.
+    (parse_benchmark.py --record로 저장한 실제 페이지가 있으면 함께 사용)
+    섹션 페이지는 섹션 픽스처의 기사 링크를 이 서버의 기사 M개로 바꾼 것이고,
+    기사 페이지는 기사 픽스처를 돌아가며 사용하되 제목에 기사 ID를 붙여 서로 다른 기사로 만듭니다.
+    """
+
+    def __init__(self, articles_per_section=20, latency=0.05, error_rate=0.0, stall_rate=0.0, stall_seconds=5.0):
+        """
+        :param articles_per_section: 섹션 페이지마다 제공할 기사 링크 수
+        :param latency: 응답 지연 시간의 평균(초)
+        :param error_rate: 503 응답을 보낼 확률
+        :param stall_rate: 응답을 stall_seconds만큼 늦출 확률
+        :param stall_seconds: 느린 요청의 지연 시간(초)
+        """
+        super().__init__(NaverHandler)
+        self.articles_per_section = articles_per_section
+        self.latency = latency
+        self.error_rate = error_rate
+        self.stall_rate = stall_rate
+        self.stall_seconds = stall_seconds
+        self.section_url = self.base_url + "/main/main.naver?mode=LSD&mid=shm&sid1={sid}"
+        self.article_prefix = self.base_url + "/mnews/article/"
+        self.requests = {"sections": 0, "articles": 0, "errors": 0}
+
+        section_pages = load_fixtures("*section_*.html")
+        self.article_pages = load_fixtures("*article_*.html")
+        if not section_pages or not self.article_pages:
+            raise FileNotFoundError(f"{FIXTURE_DIR}에 *section_*.html, *article_*.html 픽스처가 필요합니다.")
+        # 픽스처에 들어 있는 기사 링크는 수집 대상이 되지 않도록 다른 경로로 바꾸고, 이 서버의 링크를 넣을 자리를 표시
+        self.section_template = section_pages[0].replace(ARTICLE_PREFIX, "https://n.news.naver.com/fixture/")
+        self.section_template = self.section_template.replace("<body>", "<body>{links}", 1)
+
+    def count(self, key):
+        with self.lock:
+            self.requests[key] += 1
+
+    def section_page(self, sid):
+        links = "".join(f'<a href="{self.article_prefix}{sid}/{i:010d}">기사 {i}</a>'
+                        f'<a href="{self.article_prefix}comment/{sid}/{i:010d}">댓글</a>'
+                        for i in range(self.articles_per_section))
+        return self.section_template.replace("{links}", links, 1)
+
+    def article_page(self, oid, aid):
+        page = self.article_pages[int(aid) % len(self.article_pages)]
+        return re.sub(r'(class="media_end_head_headline"[^>]*>)', rf"\g<1>[{oid}-{aid}] ", page, count=1)
+
+
+class OpenAIHandler(StubHandler):
+    def do_POST(self):
+        stub = self.server.stub
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self.path.endswith("/chat/completions"):
+            self.send_body(404, json.dumps({"error": {"message": "Not Found"}}), "application/json")
+            return
+
+        prompt = "\n".join(str(message.get("content", "")) for message in body.get("messages", []))
+        prompt_tokens = stub.count_tokens(prompt)
+        content = stub.respond(prompt)
+        completion_tokens = stub.count_tokens(content)
+
+        retry_after = stub.admit(prompt_tokens + completion_tokens)
+        if retry_after is not None:
+            error = {"message": "Rate limit reached (fake endpoint)", "type": "tokens", "code": "rate_limit_exceeded"}
+            self.send_body(429, json.dumps({"error": error}), "application/json",
+                           {"retry-after-ms": str(int(retry_after * 1000))})
+            return
+
+        time.sleep(jittered(stub.latency))
+        response = {
+            "id": f"chatcmpl-fake-{stub.calls}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-3.5-turbo"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }
+        self.send_body(200, json.dumps(response, ensure_ascii=False), "application/json")
+
+
+class FakeOpenAI(StubServer):
+    """
+    ChatOpenAI(base_url=...)로 호출할 수 있는 가짜 Chat Completions 엔드포인트.
+
+    - 분당 토큰 한도(TPM)를 넘으면 retry-after-ms 헤더와 함께 429를 반환
+    - rate_limit_rate 확률로 429를 임의로 주입
+    - 여러 기사를 묶은 요약 요청([기사 N] 형식)에는 번호별 JSON으로, 기사 선별 요청에는 번호 배열로 응답
+
+    토큰 수는 tiktoken 없이 글자 수로 대략 계산합니다. (한글 기준 약 2글자 = 1토큰)
+    """
+
+    def __init__(self, latency=0.5, tokens_per_minute=None, rate_limit_rate=0.0):
+        """
+        :param latency: 응답 지연 시간의 평균(초)
+        :param tokens_per_minute: 분당 토큰 한도 (None이면 제한 없음)
+        :param rate_limit_rate: 한도와 무관하게 429를 보낼 확률
+        """
+        super().__init__(OpenAIHandler)
+        self.latency = latency
+        self.tokens_per_minute = tokens_per_minute
+        self.rate_limit_rate = rate_limit_rate
+        self.window = []  # 최근 1분간 (시각, 토큰 수)
+        self.calls = 0
+        self.rate_limited = 0
+        self.tokens = 0
+
+    @staticmethod
+    def count_tokens(text):
+        return max(1, len(text) // 2)
+
+    @staticmethod
+    def respond(prompt):
+        numbers = re.findall(r"\[기사 (\d+)\]", prompt)
+        if numbers:
+            return json.dumps({number: f"{number}번 기사의 가짜 요약입니다. 벤치마크용 응답입니다." for number in numbers},
+                              ensure_ascii=False)
+        if "기사 번호의 JSON 배열" in prompt:
+            return "[1, 2, 3]"
+        return "가짜 요약입니다. 벤치마크용 응답입니다."
+
+    def admit(self, tokens):
+        """요청을 받을 수 있으면 기록하고 None을, 아니면 다시 시도할 때까지의 시간(초)을 반환"""
+        with self.lock:
+            now = time.monotonic()
+            if random.random() < self.rate_limit_rate:
+                self.rate_limited += 1
+                return 1.0
+            self.window = [(at, used) for at, used in self.window if now - at < 60]
+            if self.tokens_per_minute and sum(used for _, used in self.window) + tokens > self.tokens_per_minute:
+                self.rate_limited += 1
+                return 60 - (now - self.window[0][0]) if self.window else 1.0
+            self.window.append((now, tokens))
+            self.calls += 1
+            self.tokens += tokens
+            return None
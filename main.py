@@ -1,14 +1,15 @@
 import os
-from src.scrap.scrap import Scrap
-from src.gpt.news_summarizer import NewsSummarizer
-from src.gpt.news_filter import NewsFilter
-from src.gpt.news_review import NewsReview
-from src.wordcloud.wordcloud_generator import WordCloudGenerator
-from src.slack.slack_notifier import SlackNotifier
-from datetime import datetime
-import pandas as pd
+import argparse
+from contextlib import nullcontext
+from src.pipeline.editions import load_editions, union_categories
+from src.store.run_store import RunStore
+from src.util.import_timer import ImportTimer
+from src.util.metrics import metrics
+from datetime import datetime, timedelta
 import pytz
 
+# 무거운 모듈(langchain, konlpy, wordcloud 등)은 해당 단계를 실행할 때만 불러옵니다.
+
 # 한국 시간(KST) 타임존 설정
 kst = pytz.timezone('Asia/Seoul')
 
@@ -16,6 +17,20 @@ kst = pytz.timezone('Asia/Seoul')
 API_KEY = os.getenv("OPENAI_API_KEY")
 WEBHOOK_URL = os.getenv("WEBHOOK_URL")
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../output')
+# 실행 간에 유지되는 캐시 폴더 (GitHub Actions에서는 actions/cache로 복원)
+CACHE_DIR = os.getenv("NEWS_CLIP_CACHE_DIR", os.path.join(OUTPUT_DIR, 'cache'))
+# "batch"이면 단계별로 순서대로 실행, "stream"이면 스크래핑/요약/선별을 겹쳐서 실행
+PIPELINE_MODE = os.getenv("PIPELINE_MODE", "batch")
+# 실행별 링크/기사/요약/순위를 기록하는 저장소 (이전 실행 결과도 run_id로 조회 가능)
+RUN_STORE_DB = os.path.join(CACHE_DIR, 'runs.sqlite3')
+# "1"이면 단계별 결과를 CSV 스냅샷으로도 저장
+CSV_SNAPSHOTS = os.getenv("CSV_SNAPSHOTS", "0") == "1"
+# 실행 ID (지정하지 않으면 현재 시각). 같은 ID로 다시 실행하면 끝난 작업은 건너뜁니다.
+RUN_ID = os.getenv("NEWS_CLIP_RUN_ID")
+# 단계별 소요 시간, 요청 지연 시간, 토큰 사용량 등의 측정 보고서 (textfile은 node_exporter로 수집 가능)
+METRICS_JSON = os.path.join(OUTPUT_DIR, 'metrics.json')
+METRICS_TEXTFILE = os.getenv("NEWS_CLIP_METRICS_TEXTFILE", os.path.join(OUTPUT_DIR, 'news_clip.prom'))
+PROFILE_DIR = os.path.join(OUTPUT_DIR, 'profile')
 
 # Scrape
 CATEGORIES = {
@@ -27,90 +42,216 @@ CATEGORIES = {
     "IT/과학": "105"
 }
 ARTICLE_CSV = os.path.join(OUTPUT_DIR, 'article_df.csv')
+SCRAP_MODE = os.getenv("SCRAP_MODE", "async")  # "async", "thread" 또는 "process"
+ARTICLES_PER_SECTION = 20  # 너무 많은 AI 호출을 줄이기 위해 섹션별로 수집할 기사 수
+ARTICLE_CACHE_DB = os.path.join(CACHE_DIR, 'article_cache.sqlite3')
+
+# Pre-rank
+SHORTLIST_CSV = os.path.join(OUTPUT_DIR, 'shortlisted_articles.csv')
+PRE_RANK_TOP_K = 8  # 사전 점수로 섹션별 상위 K개만 요약 및 선별
 
 # Word cloud
 OUTPUT_IMAGE = os.path.join(OUTPUT_DIR, 'wordcloud.png')
 FONT_PATH = os.path.join('font', 'NanumBarunGothic.ttf')
+NOUN_CACHE_DB = os.path.join(CACHE_DIR, 'noun_cache.sqlite3')
 
 # AI Summary
 SUMMARIZED_CSV = os.path.join(OUTPUT_DIR, 'summarized_articles.csv')
 TOP_ARTICLES_CSV = os.path.join(OUTPUT_DIR, 'top_articles.csv')
+SUMMARY_CACHE_DB = os.path.join(CACHE_DIR, 'summary_cache.sqlite3')
+SUMMARY_BATCH_TOKENS = 6000  # 한 번의 요약 요청에 묶을 기사들의 최대 입력 토큰 수
+# 요약 요청 전에 본문의 상용구를 지우고 핵심 문장만 이 토큰 수 이내로 남김 (0이면 원문 그대로 요청)
+SUMMARY_INPUT_TOKENS = int(os.getenv("SUMMARY_INPUT_TOKENS", "1500"))
+LLM_ASYNC = os.getenv("LLM_MODE", "async") == "async"  # "async"이면 ainvoke, 아니면 스레드 풀로 요청
+SUMMARY_DEADLINE = 900  # async 모드에서 이 시간(초)이 지나도 끝나지 않은 요약은 취소
 TOP_N = 3
 
-def reduce_articles_by_section(input_csv, output_csv, n):
-    """
-    해당 메서드는 너무 많은 AI 호출을 줄이기 위해 csv 전처리 용으로 사용하는 테스트 메서드입니다.
-    article_df.csv를 불러와서 각 섹션별로 n개의 아이템만 추출한 후, output_csv 파일로 저장합니다.
+# Watch (--watch HH:MM로 발송 시각 전까지 새 기사를 미리 수집하고 요약)
+WATCH_INTERVAL = int(os.getenv("WATCH_INTERVAL", "600"))  # 섹션 페이지 확인 주기(초)
+WATCH_WINDOW_HOURS = 12  # 이 시간 안에 작성된 기사만 후보군에 포함
 
-    :param input_csv: 원본 CSV 파일 경로
-    :param output_csv: 축소된 데이터를 저장할 CSV 파일 경로
-    :param n: 각 섹션별로 남길 아이템의 수
-    """
-    # CSV 파일 읽기
-    df = pd.read_csv(input_csv)
+# Editions (팀별로 섹션, 기사 수, 한줄 평 말투, 웹훅이 다른 다이제스트)
+# 설정 파일이 없으면 CATEGORIES 전체를 TOP_N개씩 WEBHOOK_URL로 보내는 에디션 하나만 실행합니다.
+EDITIONS_CONFIG = os.getenv("NEWS_CLIP_EDITIONS", os.path.join(os.path.dirname(os.path.abspath(__file__)), 'editions.json'))
+# 설정 파일은 import 시점이 아니라 실행할 때 configure_editions에서 읽습니다. (설정 오류가 -h 등을 막지 않도록)
+EDITIONS = None
+# 스크래핑, 요약, 선별은 모든 에디션의 섹션을 합쳐 한 번만 실행 (선별은 가장 큰 top_n으로 하고 에디션별로 앞에서부터 사용)
+SECTIONS = None
+RANK_TOP_N = None
 
-    # 각 섹션별로 n개의 아이템만 남기기
-    reduced_df = df.groupby('section').head(n)
 
-    # 결과를 CSV 파일로 저장
-    reduced_df.to_csv(output_csv, index=False, encoding='utf-8-sig')
-    print(f"축소된 데이터가 {output_csv}에 저장되었습니다.")
+def configure_editions(config_path=EDITIONS_CONFIG):
+    """에디션 설정 파일을 읽어 EDITIONS, SECTIONS, RANK_TOP_N을 설정하는 함수 (설정이 잘못되면 예외 발생)"""
+    global EDITIONS, SECTIONS, RANK_TOP_N
+    EDITIONS = load_editions(config_path, CATEGORIES, TOP_N, WEBHOOK_URL)
+    SECTIONS = union_categories(EDITIONS, CATEGORIES)
+    RANK_TOP_N = max(edition.top_n for edition in EDITIONS)
 
 
-if __name__ == "__main__":
-    # Output 폴더가 없으면 만들고 시작
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+def snapshot(csv_file):
+    """CSV 스냅샷을 저장하도록 설정된 경우에만 경로를 반환하는 함수"""
+    return csv_file if CSV_SNAPSHOTS else None
+
 
+STAGES = ["scrape", "summarize", "filter", "wordcloud", "review", "notify"]
+
+
+def article_compressor():
+    """요약 전 본문 압축기 (SUMMARY_INPUT_TOKENS가 0이면 None)"""
+    from src.gpt.article_compressor import ArticleCompressor
+
+    return ArticleCompressor(SUMMARY_INPUT_TOKENS) if SUMMARY_INPUT_TOKENS > 0 else None
+
+
+def run_stream(run_store):
     """
-    뉴스 스크래핑
+    스트리밍 파이프라인 - 파싱된 기사는 바로 요약하고, 요약이 끝난 섹션부터 기사를 선별합니다.
     """
-    # Scrap 클래스 인스턴스 생성 및 스크래핑 시작
-    scraper = Scrap(CATEGORIES, ARTICLE_CSV)
-    scraper.scrap(max_workers=10)
+    from src.scrap.scrap import Scrap
+    from src.scrap.article_cache import ArticleCache
+    from src.gpt.news_summarizer import NewsSummarizer
+    from src.gpt.summary_cache import SummaryCache
+    from src.gpt.news_filter import NewsFilter
+    from src.rank.pre_ranker import PreRanker
+    from src.pipeline.streaming_pipeline import StreamingPipeline
+
+    article_cache = ArticleCache(ARTICLE_CACHE_DB)
+    summary_cache = SummaryCache(SUMMARY_CACHE_DB)
+    scraper = Scrap(SECTIONS, snapshot(ARTICLE_CSV), per_section_limit=ARTICLES_PER_SECTION,
+                    cache=article_cache, run_store=run_store)
+    summarizer = NewsSummarizer(api_key=API_KEY, cache=summary_cache, compressor=article_compressor())
+    news_filter = NewsFilter(api_key=API_KEY)
+    pipeline = StreamingPipeline(scraper, summarizer, news_filter, top_n=RANK_TOP_N, pre_ranker=PreRanker(),
+                                 pre_rank_top_k=PRE_RANK_TOP_K, run_store=run_store)
+    pipeline.run(snapshot(ARTICLE_CSV), snapshot(SUMMARIZED_CSV), snapshot(TOP_ARTICLES_CSV))
+    article_cache.close()
+    summary_cache.close()
 
+    print(f"\033[95m뉴스 요약 및 중요 기사 선별 완료.\033[0m")
+
+
+def run_watch(run_store, until):
+    """
+    감시 모드 - until까지 주기적으로 새 기사만 수집하고, 섹션별 후보군에 들어온 기사를 미리 요약합니다.
+    이후 단계에서는 기사 선별과 한줄 평 생성, 전송만 남습니다.
+    """
+    from src.scrap.scrap import Scrap
+    from src.scrap.article_cache import ArticleCache
+    from src.gpt.news_summarizer import NewsSummarizer
+    from src.gpt.summary_cache import SummaryCache
+    from src.pipeline.watch_pipeline import WatchPipeline
+
+    article_cache = ArticleCache(ARTICLE_CACHE_DB)
+    summary_cache = SummaryCache(SUMMARY_CACHE_DB)
+    scraper = Scrap(SECTIONS, None, cache=article_cache, run_store=run_store)
+    summarizer = NewsSummarizer(api_key=API_KEY, cache=summary_cache, compressor=article_compressor())
+    watcher = WatchPipeline(scraper, summarizer, run_store, pool_size=PRE_RANK_TOP_K, window_hours=WATCH_WINDOW_HOURS,
+                            per_poll_limit=ARTICLES_PER_SECTION,
+                            summarize_options={"batch_token_budget": SUMMARY_BATCH_TOKENS, "async_mode": LLM_ASYNC,
+                                               "deadline": SUMMARY_DEADLINE})
+    watcher.run(until, interval=WATCH_INTERVAL)
+    article_cache.close()
+    summary_cache.close()
+
+
+def run_scrape(run_store):
     """
-    스크래핑 결과 전처리 - 섹션별로 20개의 기사만 추출합니다.
+    뉴스 스크래핑 및 요약 대상 선정
     """
-    reduce_articles_by_section(ARTICLE_CSV, ARTICLE_CSV, 20)
+    from src.scrap.scrap import Scrap
+    from src.scrap.article_cache import ArticleCache
+    from src.rank.pre_ranker import PreRanker
+    from src.rank.story_clusterer import StoryClusterer
+
+    # Scrap 클래스 인스턴스 생성 및 스크래핑 시작
+    # 섹션별로 ARTICLES_PER_SECTION개의 기사만 수집합니다.
+    # 이어서 진행하는 경우에는 저장된 기사를 사용합니다.
+    if run_store.count("articles") == 0:
+        article_cache = ArticleCache(ARTICLE_CACHE_DB)
+        scraper = Scrap(SECTIONS, snapshot(ARTICLE_CSV), per_section_limit=ARTICLES_PER_SECTION,
+                        cache=article_cache, run_store=run_store)
+        article_df = scraper.scrap(max_workers=10, mode=SCRAP_MODE)
+        article_cache.close()
+    elif run_store.count("articles", shortlisted=1) == 0:
+        article_df = run_store.load_articles(["url", "section", "section_name", "sections", "title", "date", "main"])
+    else:
+        print("이미 요약 대상이 선정된 실행입니다.")
+        return
+
+    # 중복 기사 묶음 - 같은 사건을 다룬 여러 언론사의 기사는 대표 기사 한 건만 남깁니다. (cluster_size 컬럼 추가)
+    story_df = StoryClusterer().deduplicate(article_df)
+
+    # 사전 점수 기반 후보 선정 - LLM 호출 없이 섹션별 상위 K개만 남깁니다.
+    shortlisted_df = PreRanker().shortlist(story_df, PRE_RANK_TOP_K)
+    run_store.mark_shortlisted(shortlisted_df['url'])
+    if CSV_SNAPSHOTS:
+        shortlisted_df.to_csv(SHORTLIST_CSV, index=False, encoding='utf-8-sig')
 
-    # """
-    # 워드 클라우드 이미지 생성
-    # """
-    # # WordCloudGenerator 클래스 인스턴스 생성
-    # wc_generator = WordCloudGenerator(csv_file=ARTICLE_CSV, output_image=OUTPUT_IMAGE, font_path=FONT_PATH)
-    #
-    # # 워드 클라우드 생성 및 출력
-    # wc_generator.generate_wordcloud()
 
+def run_summarize(run_store):
     """
     뉴스 요약 작업
     """
+    from src.gpt.news_summarizer import NewsSummarizer
+    from src.gpt.summary_cache import SummaryCache
+
     # NewsSummarizer 인스턴스 생성
-    summarizer = NewsSummarizer(api_key=API_KEY)
-    summarizer.summarize_articles(ARTICLE_CSV, SUMMARIZED_CSV)
+    summary_cache = SummaryCache(SUMMARY_CACHE_DB)
+    summarizer = NewsSummarizer(api_key=API_KEY, cache=summary_cache, compressor=article_compressor())
+    summarizer.summarize_run(run_store, snapshot(SUMMARIZED_CSV), batch_token_budget=SUMMARY_BATCH_TOKENS,
+                             async_mode=LLM_ASYNC, deadline=SUMMARY_DEADLINE)
+    summary_cache.close()
+
 
+def run_filter(run_store):
     """
     주요 뉴스 필터링
     """
+    from src.gpt.news_filter import NewsFilter
+
     # NewsFilter 인스턴스 생성
     news_filter = NewsFilter(api_key=API_KEY)
-    news_filter.filter_top_articles(SUMMARIZED_CSV, TOP_ARTICLES_CSV, top_n=TOP_N)
+    news_filter.filter_run(run_store, top_n=RANK_TOP_N, output_csv=snapshot(TOP_ARTICLES_CSV))
 
     print(f"\033[95m뉴스 요약 및 중요 기사 선별 완료.\033[0m")
 
+
+def run_wordcloud(run_store):
     """
-    병합된 summary 내용 출력 및 한줄 평 생성
+    워드 클라우드 이미지 생성
+    워드 클라우드는 슬랙 메세지에 필요하지 않으므로, 형태소 분석기(JVM)나 폰트 문제로 실패해도 다음 단계를 진행합니다.
     """
-    merged_content = news_filter.print_merged_content(TOP_ARTICLES_CSV)
-    news_review = NewsReview(api_key=API_KEY)
-    one_line_review = news_review.generate_one_line_review(merged_content)
+    try:
+        from src.wordcloud.wordcloud_generator import WordCloudGenerator
+        from src.wordcloud.noun_cache import NounCache
+
+        # 기사별 명사 빈도는 캐시되므로 새로 수집된 기사만 형태소 분석합니다.
+        noun_cache = NounCache(NOUN_CACHE_DB)
+        try:
+            wc_generator = WordCloudGenerator(output_image=OUTPUT_IMAGE, font_path=FONT_PATH, cache=noun_cache)
+            wc_generator.generate_wordcloud(run_store.load_articles(["main"])['main'].tolist())
+        finally:
+            noun_cache.close()
+    except Exception as e:
+        print(f"\033[91m워드 클라우드 생성 실패: {type(e).__name__}: {e}\033[0m")
+        run_store.record_failures("wordcloud", [run_store.run_id], e)
 
+
+def run_review(run_store):
     """
-    슬랙 메세지 전송
+    에디션별로 병합된 summary 내용으로 한줄 평을 동시에 생성
     """
-    # SlackNotifier 인스턴스 생성
-    notifier = SlackNotifier(WEBHOOK_URL)
+    from src.gpt.news_review import NewsReview
+
+    news_review = NewsReview(api_key=API_KEY)
+    news_review.review_many(run_store, [
+        (edition.output_name("review"), edition.merged_content(run_store), edition.review_style)
+        for edition in EDITIONS
+    ])
+
 
+def build_message(merged_content, one_line_review):
+    """슬랙으로 보낼 메세지를 만드는 함수"""
     # 오늘의 날짜를 동적으로 생성
     today_date = datetime.now(kst).strftime("%m월 %d일")
 
@@ -118,10 +259,140 @@ if __name__ == "__main__":
     message = f"*:hatched_chick:  [깐추리가 알려주는 {today_date} 간추린 아침뉴스]*\n\n"
 
     # 합칠 내용들 가져오기 (예: merged_content 및 one_line_review)
-    one_line_review_formatted = f"*:baby_chick: [깐추리의 뉴스 요약!]*\n\n*_{one_line_review}_*"
-    final_message = message + merged_content + "\n\n\n" + one_line_review_formatted
+    final_message = message + merged_content
+    if one_line_review is not None:
+        one_line_review_formatted = f"*:baby_chick: [깐추리의 뉴스 요약!]*\n\n*_{one_line_review}_*"
+        final_message += "\n\n\n" + one_line_review_formatted
+    return final_message
 
-    # 메시지와 함께 이미지 전송
-    notifier.send_message(final_message)
-    print("\033[92m뉴스 요약 작업 완료\033[0m")
 
+def run_notify(run_store):
+    """
+    에디션별 슬랙 메세지를 모든 웹훅에 동시에 전송
+    """
+    import requests
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from src.slack.slack_notifier import SlackNotifier
+
+    # 이어서 진행하는 경우 이미 전송한 에디션은 다시 보내지 않음
+    pending = [edition for edition in EDITIONS if run_store.get_output(edition.output_name("notified_at")) is None]
+    if not pending:
+        print("이미 슬랙 메세지를 전송한 실행입니다.")
+        return
+
+    def deliver(edition, session):
+        if not edition.webhook_url:
+            raise ValueError(f"No webhook URL for edition {edition.name}")
+        message = build_message(edition.merged_content(run_store), run_store.get_output(edition.output_name("review")))
+        SlackNotifier(edition.webhook_url, session=session).send_message(message)
+        run_store.put_output(edition.output_name("notified_at"), datetime.now(kst).isoformat())
+
+    # 웹훅들은 대부분 같은 슬랙 호스트이므로 하나의 세션에서 커넥션을 재사용
+    errors = []
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=len(pending)) as executor:
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=len(pending))
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        futures = {executor.submit(deliver, edition, session): edition for edition in pending}
+        for future in as_completed(futures):
+            edition = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                print(f"\033[91m슬랙 메세지 전송 실패: {edition.name} - {e}\033[0m")
+                run_store.record_failures("notify", [edition.name], e)
+                errors.append(e)
+    # 실패한 에디션만 같은 실행을 이어서 진행할 때 다시 전송
+    if errors:
+        raise errors[0]
+
+
+STAGE_RUNNERS = {
+    "scrape": run_scrape,
+    "summarize": run_summarize,
+    "filter": run_filter,
+    "wordcloud": run_wordcloud,
+    "review": run_review,
+    "notify": run_notify,
+}
+
+
+def next_kst_time(value):
+    """'HH:MM'을 다음에 돌아오는 그 시각(한국 시간)으로 변환하는 함수"""
+    try:
+        hour, minute = (int(part) for part in value.split(":"))
+        now = datetime.now(kst)
+        target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"시각은 HH:MM 형식이어야 합니다: {value}")
+    return target if target > now else target + timedelta(days=1)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="네이버 뉴스 요약 및 슬랙 전송",
+        epilog="예: python main.py summarize filter --resume (scrape 없이 실행하면 가장 최근 실행을 이어서 진행)"
+    )
+    parser.add_argument("stages", nargs="*", choices=STAGES, metavar="stage",
+                        help=f"실행할 단계 ({', '.join(STAGES)}). 생략하면 모든 단계를 실행")
+    parser.add_argument("--resume", action="store_true",
+                        help="중단된 실행을 이어서 진행 (--run-id가 없으면 가장 최근 실행)")
+    parser.add_argument("--run-id", default=RUN_ID, help="실행 ID")
+    parser.add_argument("--import-report", action="store_true", help="단계별 import 시간 보고서 출력")
+    parser.add_argument("--watch", type=next_kst_time, metavar="HH:MM",
+                        help="이 시각(한국 시간)까지 새 기사를 미리 수집/요약한 뒤 나머지 단계를 실행")
+    parser.add_argument("--profile", action="store_true", help=f"단계별 cProfile 결과를 {PROFILE_DIR}에 저장")
+    args = parser.parse_args()
+
+    try:
+        configure_editions()
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        parser.error(f"에디션 설정 파일({EDITIONS_CONFIG})이 올바르지 않습니다: {type(e).__name__}: {e}")
+    return args
+
+
+if __name__ == "__main__":
+    # Output 폴더가 없으면 만들고 시작
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+
+    args = parse_args()
+    stages = [stage for stage in STAGES if stage in (args.stages or STAGES)]
+
+    # 모든 단계의 결과는 완료되는 즉시 실행 저장소에 기록되며, 같은 실행을 다시 진행하면 끝난 작업은 건너뜁니다.
+    # scrape 없이 일부 단계만 실행하면 가장 최근 실행의 결과를 사용합니다.
+    run_store = RunStore(RUN_STORE_DB, run_id=args.run_id, resume=args.resume or "scrape" not in stages)
+    resuming = run_store.count("articles") > 0
+    if resuming:
+        print(f"\033[95m실행 {run_store.run_id}을 이어서 진행합니다.\033[0m")
+
+    # 스크래핑, 요약, 선별을 모두 새로 실행하는 경우에만 스트리밍 파이프라인 사용
+    stream = (PIPELINE_MODE == "stream" and not resuming and not args.watch
+              and {"scrape", "summarize", "filter"} <= set(stages))
+    import_timer = ImportTimer() if args.import_report else None
+    if args.profile:
+        metrics.enable_profiling(PROFILE_DIR)
+
+    try:
+        # 감시 모드에서는 수집과 요약이 미리 끝나므로, 이어지는 scrape/summarize 단계는 남은 작업만 처리
+        if args.watch:
+            with import_timer.stage("watch") if import_timer else nullcontext(), metrics.stage("watch"):
+                run_watch(run_store, args.watch)
+
+        for stage in stages:
+            if stream and stage in ("summarize", "filter"):
+                continue
+            if stream and stage == "scrape":
+                stage, runner = "stream", run_stream
+            else:
+                runner = STAGE_RUNNERS[stage]
+            with import_timer.stage(stage) if import_timer else nullcontext(), metrics.stage(stage):
+                runner(run_store)
+    finally:
+        # 실패한 실행도 어느 단계에서 시간이 걸렸는지 알 수 있도록 측정 보고서는 항상 저장
+        print(metrics.summary_message())
+        metrics.write_reports(METRICS_JSON, METRICS_TEXTFILE, run_id=run_store.run_id, stages_requested=stages)
+        run_store.close()
+    if import_timer:
+        print(import_timer.report())
+    print("\033[92m뉴스 요약 작업 완료\033[0m")
@@ -0,0 +1,156 @@
+import re
+import threading
+import numpy as np
+from src.gpt.rate_limiter import estimate_tokens
+from src.util.metrics import metrics
+
+# 네이버 기사 본문(#dic_area)에 섞여 있는 상용구. 패턴은 모듈 로드 시 한 번만 컴파일합니다.
+PHOTO_AGENCIES = "연합뉴스TV|연합뉴스|뉴스1|뉴시스|게티이미지뱅크|게티이미지|셔터스톡|AP|AFP|EPA|로이터|신화"
+# 사진 출처: "연합뉴스", "로이터 연합뉴스", "뉴스1 제공", "서울시 제공"
+PHOTO_CREDIT = (rf"(?:(?:{PHOTO_AGENCIES})(?:\s(?:{PHOTO_AGENCIES}))?(?:\s?제공)?"
+                r"|[가-힣A-Za-z]{1,10}\s?제공)")
+BOILERPLATE_PATTERNS = [
+    # 사진 설명: "사진은 기사와 관련 없음 / 연합뉴스", "[사진=뉴스1]", "(그래픽=홍길동 기자)"
+    # "사진은 기사와 관련 없음" 안내는 추출 시 뒤 문장과 붙어 있어도 지움
+    re.compile(r"(?:^|(?<=[.!?]))\s*(?:이\s?)?사진은\s?기사(?:\s?내용)?[와과]\s?(?:직접\s?)?관련\s?없(?:음|습니다)\.?"
+               rf"(?:\s?/\s?(?:{PHOTO_AGENCIES})(?:\s(?:{PHOTO_AGENCIES}))?)?"),
+    # 그 밖의 "설명 / 출처"는 본문 첫머리나 문장이 끝난 직후, 또는 괄호 안에 있을 때만 지움 ("웹/API", "경주/APEC"은 남김)
+    re.compile(rf"(?:^|(?<=[.!?]))[^.!?/\[\]()]{{1,80}}?\s?/\s?{PHOTO_CREDIT}(?![A-Za-z가-힣0-9])"),
+    re.compile(rf"[\[\(][^\[\]()/]{{1,80}}?\s?/\s?{PHOTO_CREDIT}\s?[\]\)]"),
+    re.compile(r"[\[\(<](?:사진|그래픽|자료|영상|제공)\s?=?[^\]\)>]{0,40}[\]\)>]"),
+    # 기사 첫머리의 발신지와 기자: "(서울=연합뉴스) 홍길동 기자 = "
+    re.compile(r"^\s*[\[\(][가-힣\s]{1,10}=[^\]\)]{1,20}[\]\)]\s?(?:[가-힣]{2,4}\s?(?:기자|특파원)\s?=\s?)?"),
+    # 기자 이름과 이메일: "홍길동 기자 (hong@yna.co.kr)"
+    re.compile(r"(?:[가-힣]{2,4}\s?(?:기자|특파원|인턴기자|선임기자)\s?)?[\(\[<]?[\w.+-]+@[\w-]+(?:\.[\w-]+)+[\)\]>]?"),
+    # 저작권 문구: "ⓒ 연합뉴스, 무단 전재-재배포, AI 학습 및 활용 금지", "<저작권자 ⓒ ... 무단전재 및 재배포 금지>"
+    re.compile(r"[<\[]?(?:저작권자\s?)?(?:ⓒ|©|Copyright)[^>\]]{0,80}?(?:금지|reserved)\.?[>\]]?", re.IGNORECASE),
+    re.compile(r"무단\s?전재[^.]{0,40}?금지\.?"),
+    # 관련 기사/제보 안내: "▶ 관련 기사 보기", "☞ 제보하기"
+    re.compile(r"[▶☞]\s?[^▶☞.!?]{0,80}"),
+]
+# 소수점(3.5%)은 나누지 않고, 마침표 뒤에 글자가 바로 붙어도(…했습니다.다음 문장) 문장을 나눔
+SENTENCE_PATTERN = re.compile(r".+?(?:[.!?](?=\s|[^\d\s.,]|$)[\"'”’)\]]*|$)", re.DOTALL)
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class ArticleCompressor:
+    """
+    요약 요청 전에 기사 본문을 로컬에서 줄이는 추출 요약기 (LLM 호출 없음).
+
+    1. 사진 설명, 발신지, 기자 이메일, 저작권 문구 등 네이버 본문의 상용구를 지웁니다.
+    2. 남은 본문이 token_budget을 넘으면 문장마다 점수를 매깁니다.
+       - 리드 점수: 기사 앞쪽 문장일수록 높음 (역피라미드 구조)
+       - 중심성 점수: 문자 바이그램 TF-IDF 벡터와 문서 전체 평균 벡터의 코사인 유사도
+    3. 점수가 높은 문장부터 예산 안에서 고르되, 이미 고른 문장과 거의 같은 문장은 건너뛰고 원래 순서대로 이어 붙입니다.
+
+    원문과 압축 후의 토큰 수를 누적하여 stats_message()로 실행별 감소량을 보여줍니다.
+    """
+
+    def __init__(self, token_budget=1500, lead_weight=0.4, redundancy_threshold=0.8, model="gpt-3.5-turbo"):
+        """
+        :param token_budget: 압축한 본문의 최대 토큰 수
+        :param lead_weight: 문장 점수에서 리드 점수의 비중 (나머지는 중심성 점수)
+        :param redundancy_threshold: 이미 고른 문장과의 코사인 유사도가 이 값 이상이면 건너뜀
+        :param model: 토큰 수를 계산할 모델 이름
+        """
+        self.token_budget = token_budget
+        self.lead_weight = lead_weight
+        self.redundancy_threshold = redundancy_threshold
+        self.model = model
+        self.lock = threading.Lock()
+        self.articles = 0
+        self.shortened = 0
+        self.original_tokens = 0
+        self.compressed_tokens = 0
+
+    @staticmethod
+    def strip_boilerplate(text):
+        """네이버 기사 본문의 상용구를 지운 텍스트를 반환하는 함수"""
+        for pattern in BOILERPLATE_PATTERNS:
+            text = pattern.sub(" ", text)
+        return WHITESPACE_PATTERN.sub(" ", text).strip()
+
+    @staticmethod
+    def split_sentences(text):
+        sentences = (match.group(0).strip() for match in SENTENCE_PATTERN.finditer(text))
+        return [sentence for sentence in sentences if sentence]
+
+    @staticmethod
+    def sentence_vectors(sentences):
+        """문장별 문자 바이그램 TF-IDF 벡터 (행마다 L2 정규화, 형태소 분석기 없이 한국어에 사용)"""
+        vocabulary = {}
+        rows, columns = [], []
+        for row, sentence in enumerate(sentences):
+            compact = WHITESPACE_PATTERN.sub("", sentence)
+            for i in range(len(compact) - 1):
+                rows.append(row)
+                columns.append(vocabulary.setdefault(compact[i:i + 2], len(vocabulary)))
+
+        counts = np.zeros((len(sentences), max(len(vocabulary), 1)), dtype=np.float32)
+        np.add.at(counts, (np.array(rows, dtype=np.intp), np.array(columns, dtype=np.intp)), 1)
+        # 거의 모든 문장에 나오는 바이그램(~습니다 등)은 가중치를 낮춤
+        document_frequency = np.count_nonzero(counts, axis=0)
+        idf = np.log((1 + len(sentences)) / (1 + document_frequency)) + 1
+        vectors = np.log1p(counts) * idf
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-9)
+
+    def sentence_scores(self, vectors):
+        """리드 점수와 중심성 점수를 섞은 문장별 점수"""
+        lead = 1 / np.sqrt(np.arange(1, len(vectors) + 1))
+        centroid = vectors.mean(axis=0)
+        centrality = vectors @ (centroid / max(np.linalg.norm(centroid), 1e-9))
+        return self.lead_weight * lead + (1 - self.lead_weight) * centrality
+
+    def select_sentences(self, sentences):
+        """점수가 높은 문장부터 토큰 예산 안에서 고른 뒤 원래 순서로 반환하는 함수"""
+        vectors = self.sentence_vectors(sentences)
+        scores = self.sentence_scores(vectors)
+        similarity = vectors @ vectors.T
+        tokens = [estimate_tokens(sentence, self.model) for sentence in sentences]
+
+        selected, remaining = [], self.token_budget
+        for i in np.argsort(-scores, kind="stable"):
+            if tokens[i] > remaining:
+                continue
+            if selected and similarity[i, selected].max() >= self.redundancy_threshold:
+                continue
+            selected.append(i)
+            remaining -= tokens[i]
+        return [sentences[i] for i in sorted(selected)]
+
+    def compress(self, text):
+        """
+        기사 본문을 압축하는 함수 (통계에는 기록하지 않음, 기록은 record로)
+        :return: (압축한 본문, 원문 토큰 수, 압축 후 토큰 수)
+        """
+        original_tokens = estimate_tokens(text, self.model)
+        stripped = self.strip_boilerplate(text)
+        if not stripped:
+            return text, original_tokens, original_tokens
+
+        stripped_tokens = estimate_tokens(stripped, self.model)
+        if stripped_tokens <= self.token_budget:
+            return stripped, original_tokens, stripped_tokens
+
+        sentences = self.select_sentences(self.split_sentences(stripped))
+        # 한 문장이 예산보다 긴 경우 등 고른 문장이 없으면 상용구만 지운 본문을 사용
+        if not sentences:
+            return stripped, original_tokens, stripped_tokens
+        compressed = " ".join(sentences)
+        return compressed, original_tokens, estimate_tokens(compressed, self.model)
+
+    def record(self, original_tokens, compressed_tokens):
+        """실제로 요약을 요청한 기사의 토큰 수를 통계와 측정값에 기록하는 함수"""
+        with self.lock:
+            self.articles += 1
+            self.shortened += compressed_tokens < original_tokens
+            self.original_tokens += original_tokens
+            self.compressed_tokens += compressed_tokens
+        metrics.inc("summary_input_tokens_total", original_tokens, kind="original")
+        metrics.inc("summary_input_tokens_total", compressed_tokens, kind="compressed")
+
+    def stats_message(self):
+        reduction = 1 - self.compressed_tokens / self.original_tokens if self.original_tokens else 0
+        return (f"본문 압축 - 기사: {self.articles}, 축약: {self.shortened}, "
+                f"입력 토큰: {self.original_tokens} → {self.compressed_tokens} ({reduction:.1%} 감소)")
@@ -1,95 +1,214 @@
+import asyncio
+import hashlib
+import json
+import re
 import pandas as pd
 from src.util.utils import print_progress_bar
 import threading
 from langchain_openai import ChatOpenAI
+from src.gpt.rate_limiter import shared_rate_limiter
+from src.util.metrics import metrics
 import time
 
-class NewsFilter:
-    def __init__(self, api_key):
-        self.llm = ChatOpenAI(api_key=api_key, model="gpt-3.5-turbo", temperature=0)
-        self.filter_completed_pages = 0
-        self.lock = threading.Lock()
-
-    def compare_importance(self, article1, article2):
-        prompt = f"""
-        다음 두 기사를 비교하여 더 중요한 기사를 선택해 주세요:
-
-        기사 1: {article1['summary']}
-
-        기사 2: {article2['summary']}
-
+IMPORTANCE_CRITERIA = """
         중요성을 판단할 기준은 다음과 같습니다:
         1. 사회적 영향력: 얼마나 많은 사람들에게 영향을 미칠 가능성이 있는가?
         2. 시의성: 현재의 시점에서 얼마나 중요한가?
         3. 심각성: 다루는 이슈가 얼마나 심각한가?
         4. 독창성: 독창적이고 새로운 정보를 제공하는가?
         5. 관련성: 특정 분야나 주제에 얼마나 관련성이 있는가?
+"""
+
+# JSON 배열이 아닌 응답에서 기사 번호로 인정하는 표시: "[3]", "[기사 3]", "3번"
+RANKING_MARKER_PATTERN = re.compile(r"\[(?:기사\s?)?(\d+)\]|(?<!\d)(\d+)\s?번")
+
+
+def summary_hash(article):
+    """기사 요약 내용의 해시 (판정 결과 메모이제이션 키)"""
+    return hashlib.sha256(str(article['summary']).encode("utf-8")).hexdigest()
 
-        위의 기준을 바탕으로 더 중요한 기사를 선택해 주세요.
-        답변 형식: "기사 1" 또는 "기사 2"
+
+class NewsFilter:
+    def __init__(self, api_key, rate_limiter=None, group_size=15):
+        """
+        :param api_key: OpenAI API 키
+        :param rate_limiter: 요청 제한기 (None이면 모든 LLM 호출이 공유하는 제한기 사용)
+        :param group_size: 한 번의 listwise 호출로 순위를 매길 최대 기사 수.
+                           섹션의 기사가 이보다 많으면 그룹별 예선을 동시에 진행한 뒤 결선을 치릅니다.
+        """
+        self.llm = ChatOpenAI(api_key=api_key, model="gpt-3.5-turbo", temperature=0, max_retries=0)
+        self.rate_limiter = rate_limiter or shared_rate_limiter
+        self.group_size = group_size
+        self.filter_completed_pages = 0
+        self.lock = threading.Lock()
+        # 요약 해시 기반 판정 메모 (같은 후보 조합은 다시 묻지 않음)
+        self.listwise_verdicts = {}
+
+    @staticmethod
+    def ranking_prompt(section_name, articles, top_n):
+        candidates = "\n".join(f"        [{number}] {article['summary']}" for number, article in enumerate(articles, start=1))
+        return f"""
+        다음은 [{section_name}] 섹션의 기사 요약 {len(articles)}개입니다.
+        이 중 가장 중요한 기사 {top_n}개를 중요한 순서대로 골라 주세요.
+
+{candidates}
+{IMPORTANCE_CRITERIA}
+        위의 기준을 바탕으로 가장 중요한 기사 {top_n}개를 선택해 주세요.
+        답변 형식: 기사 번호의 JSON 배열 (예: [3, 1, 7])
         """
-        response = self.llm.invoke(prompt).content
-        return article1 if "기사 1" in response else article2
 
-    def filter_top_articles(self, summarized_csv, output_csv, top_n=3):
-        start_time = time.time()
-        summaries_df = pd.read_csv(summarized_csv)
+    @staticmethod
+    def parse_ranking(content, count, top_n):
+        """
+        listwise 응답에서 기사 번호(0부터 시작하는 인덱스)를 순서대로 추출하는 함수.
+        응답이 JSON 배열이 아니면 기록을 남기고, 후보 표시와 같은 형식("[3]", "[기사 3]", "3번")의 번호만 사용합니다.
+        (본문의 날짜나 수치는 번호로 보지 않음) 부족한 순위는 원래 순서대로 채웁니다.
+        """
+        match = re.search(r"\[[\d,\s]*\]", content)
+        try:
+            numbers = json.loads(match.group(0)) if match else []
+        except json.JSONDecodeError:
+            numbers = []
+        if not numbers:
+            metrics.inc("llm_invalid_responses_total", stage=metrics.stage_label, kind="ranking")
+            print(f"\033[91m기사 선별 응답이 JSON 배열이 아니어서 기사 번호 표시만 사용합니다: {content[:100]!r}\033[0m")
+            numbers = [int(match.group(1) or match.group(2)) for match in RANKING_MARKER_PATTERN.finditer(content)]
+
+        ranking = []
+        for number in numbers:
+            if 1 <= number <= count and number - 1 not in ranking:
+                ranking.append(number - 1)
+        for index in range(count):
+            if len(ranking) >= top_n:
+                break
+            if index not in ranking:
+                ranking.append(index)
+        return ranking[:top_n]
+
+    async def arank_group(self, section_name, articles, top_n):
+        """한 번의 listwise 호출로 articles 중 상위 top_n개를 중요도 순으로 반환하는 함수"""
+        hashes = [summary_hash(article) for article in articles]
+        key = (tuple(sorted(hashes)), top_n)
+        if key not in self.listwise_verdicts:
+            prompt = self.ranking_prompt(section_name, articles, top_n)
+            response = (await self.rate_limiter.ainvoke(self.llm, prompt)).content
+            ranking = self.parse_ranking(response, len(articles), top_n)
+            self.listwise_verdicts[key] = [hashes[index] for index in ranking]
+
+        by_hash = dict(zip(hashes, articles))
+        return [by_hash[h] for h in self.listwise_verdicts[key]]
+
+    async def arank(self, section_name, articles, top_n):
+        """
+        섹션의 모든 후보 중 상위 top_n개를 중요도 순으로 반환하는 함수.
+        후보가 group_size보다 많으면 그룹별 listwise 예선을 동시에 진행하고, 통과한 기사들로 다음 라운드를 진행합니다.
+        """
+        # 요약이 같은 기사는 한 번만 후보로 올림
+        unique_articles = {}
+        for article in articles:
+            unique_articles.setdefault(summary_hash(article), article)
+        articles = list(unique_articles.values())
+        if len(articles) <= top_n:
+            return articles
+        group_size = max(self.group_size, top_n + 1)
+        if len(articles) <= group_size:
+            return await self.arank_group(section_name, articles, top_n)
+
+        groups = [articles[i:i + group_size] for i in range(0, len(articles), group_size)]
+        winners = await asyncio.gather(*(self.arank_group(section_name, group, top_n) for group in groups))
+        return await self.arank(section_name, [article for group in winners for article in group], top_n)
+
+    def update_progress(self, count, total_items):
+        with self.lock:
+            self.filter_completed_pages += count
+            print_progress_bar("기사 선별", self.filter_completed_pages, total_items)
+
+    async def aselect_section(self, group, top_n, total_items):
+        section_name = group['section_name'].iloc[0]  # 그룹의 첫 번째 행에서 section_name 가져오기
+        print(f"[{section_name}] 섹션의 중요한 기사 선택 중...")
+
+        selected_articles = await self.arank(section_name, group.to_dict('records'), top_n)
+        self.update_progress(len(selected_articles), total_items)
+        return selected_articles
+
+    async def aselect_all_sections(self, grouped_df, top_n, total_items, on_selected=None, on_failed=None):
+        """
+        모든 섹션의 기사 선별을 동시에 진행하는 함수.
+        한 섹션의 선별이 실패해도 다른 섹션은 계속 진행하며, 실패한 섹션은 결과에서 제외됩니다.
+
+        :param on_selected: 섹션 선별이 끝날 때마다 호출할 함수 on_selected(섹션 코드, 선택된 기사 리스트)
+        :param on_failed: 섹션 선별에 실패하면 호출할 함수 on_failed(섹션 코드, 예외)
+        """
+        async def select(section_code, group):
+            try:
+                selected_articles = await self.aselect_section(group, top_n, total_items)
+            except Exception as e:
+                print(f"\033[91m[{group['section_name'].iloc[0]}] 섹션의 기사 선별 실패: {type(e).__name__}: {e}\033[0m")
+                if on_failed is not None:
+                    on_failed(section_code, e)
+                return []
+            if on_selected is not None:
+                on_selected(section_code, selected_articles)
+            return selected_articles
+
+        selections = await asyncio.gather(*(select(section_code, group) for section_code, group in grouped_df))
+        return [article for selected_articles in selections for article in selected_articles]
+
+    def select_top_articles(self, summaries_df, top_n=3, on_selected=None, on_failed=None):
+        """
+        섹션별로 모든 후보 기사를 listwise 방식으로 비교하여 상위 top_n개를 선택하는 함수.
+        모든 섹션은 asyncio로 동시에 처리됩니다.
+
+        :param summaries_df: section_code, section_name, summary 컬럼을 가진 요약 DataFrame
+        :param top_n: 섹션별로 선택할 기사 수
+        :param on_selected: 섹션 선별이 끝날 때마다 호출할 함수 on_selected(섹션 코드, 선택된 기사 리스트)
+        :param on_failed: 섹션 선별에 실패하면 호출할 함수 on_failed(섹션 코드, 예외)
+        :return: 선택된 기사 DataFrame
+        """
         total_sections = summaries_df['section_code'].nunique()
         total_items = total_sections * top_n
         print(f"총 {total_sections}개의 섹션에서 {total_items}개의 기사를 선별할 예정입니다.")
 
-        top_articles = []
         grouped_df = summaries_df.groupby('section_code')
 
-        for section, group in grouped_df:
-            section_name = group['section_name'].iloc[0]  # 그룹의 첫 번째 행에서 section_name 가져오기
-            print(f"[{section_name}] 섹션의 중요한 기사 선택 중...")
+        top_articles = asyncio.run(self.aselect_all_sections(grouped_df, top_n, total_items, on_selected, on_failed))
+        return pd.DataFrame(top_articles)
+
+    def filter_run(self, run_store, top_n=3, output_csv=None):
+        """
+        실행 저장소의 요약을 읽어 섹션별 상위 top_n개를 선택하고, 순위를 저장소에 기록하는 함수.
+        섹션 선별이 끝날 때마다 바로 기록하므로, 같은 실행을 다시 진행하면 이미 선별된 섹션은 건너뜁니다.
+        기사 본문은 조회하지 않습니다.
 
-            articles = group.to_dict('records')
-            selected_articles = []
+        :param run_store: RunStore 인스턴스
+        :param top_n: 섹션별로 선택할 기사 수
+        :param output_csv: 선택된 기사 스냅샷을 저장할 CSV 파일 경로 (None이면 저장하지 않음)
+        """
+        start_time = time.time()
+        # 요약 대상에서 제외된 기사(감시 모드에서 후보군 밖으로 밀려난 기사 등)의 요약은 선별하지 않음
+        summaries_df = run_store.load_shortlisted_summaries(["article_id", "title", "date", "section_code",
+                                                             "section_name", "summary"])
+        finished = set(run_store.load("rankings", ["section_code"])['section_code'])
+        if finished:
+            print(f"이미 선별된 {len(finished)}개의 섹션을 건너뜁니다.")
+            summaries_df = summaries_df[~summaries_df['section_code'].isin(finished)]
 
-            for _ in range(top_n):
-                if len(articles) > 1:
-                    top_article = self.compare_importance(articles[0], articles[1])
-                    selected_articles.append(top_article)
-                    articles.remove(top_article)
-                elif articles:
-                    selected_articles.append(articles[0])
-                    break
+        def on_selected(section_code, selected_articles):
+            run_store.append_rankings(section_code, [article['article_id'] for article in selected_articles])
 
-                with self.lock:
-                    self.filter_completed_pages += 1
-                    print_progress_bar("기사 선별", self.filter_completed_pages, total_items)
+        def on_failed(section_code, error):
+            run_store.record_failures("filter", [section_code], error)
 
-            top_articles.extend(selected_articles)
+        if not summaries_df.empty:
+            self.select_top_articles(summaries_df, top_n, on_selected, on_failed)
+        top_articles_df = run_store.load_top_articles()
+        print(f"\033[95m최종 선택된 기사를 실행 저장소({run_store.run_id})에 기록했습니다.\033[0m")
 
-        top_articles_df = pd.DataFrame(top_articles)
-        top_articles_df.to_csv(output_csv, index=False, encoding='utf-8-sig')
-        print(f"\033[95m최종 선택된 기사가 {output_csv}에 저장되었습니다.\033[0m")
+        if output_csv is not None:
+            top_articles_df.to_csv(output_csv, index=False, encoding='utf-8-sig')
+            print(f"CSV 파일 저장 완료: {output_csv}")
 
         elapsed_time = time.time() - start_time
         print(f"\033[95m기사 선별 작업이 완료되었습니다. 총 소요 시간: {elapsed_time:.2f}초\033[0m")
 
         return top_articles_df
-
-    def print_merged_content(self, top_articles_csv):
-        """
-        top_articles.csv 파일의 summary 열을 가져와서 섹션별로 문자열로 병합한 후 반환합니다.
-        :param top_articles_csv: 최종 선택된 기사가 저장된 CSV 파일 경로
-        :return: 섹션별로 병합된 summary 내용 (문자열)
-        """
-        top_articles_df = pd.read_csv(top_articles_csv)
-
-        # 섹션별로 그룹화하여 섹션 이름과 함께 summary를 병합
-        sections = top_articles_df['section_name'].unique()  # 'section_name'으로 그룹화
-
-        merged_content = []
-        for section in sections:
-            merged_content.append(f"*[{section}]*")  # 섹션 이름 추가
-            section_articles = top_articles_df[top_articles_df['section_name'] == section]['summary'].tolist()
-            merged_content.extend([f"● {summary}" for summary in section_articles])
-
-        # 전체를 "\n\n"으로 구분하여 하나의 문자열로 병합
-        final_content = "\n\n".join(merged_content)
-
-        return final_content
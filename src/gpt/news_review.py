@@ -1,11 +1,101 @@
+import asyncio
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
+from src.gpt.rate_limiter import shared_rate_limiter
+
+# 한줄 평의 기본 말투 (에디션별 review_style로 바꿀 수 있음)
+DEFAULT_REVIEW_STYLE = """
+                    - 문장의 어미는 반드시 친근하고 캐주얼한 말투(~군, ~야, ~겠어, ~바래)를 사용해야 합니다.
+                    - 각 문장은 격식 없는 대화체로 작성해야 합니다.
+                    - 뉴스를 기반으로 예상한 전망에 대한 내용을 포함해야 합니다.
+
+                예시 1. 태풍 때문에 사건 사고가 많은 날이군. 대신 태풍으로 인해 날씨가 제법 선선해질듯해
+                예시 2. 전쟁 위험이 점점 심각해지고 있어서 걱정이야. 전쟁이 일어난다면 경제가 침체되고 주가가 폭락할것으로 예상돼
+                예시 3. 올림픽으로 인해 국위 선양에 대한 내용이 많아. 금메달을 꽤 많이 획득해서 한국의 브랜드 가치가 높아질 전망이야 
+                예시 4. 오늘은 IT 와 관련된 호재가 많군. 반도체 관련 주식이 많이 오를듯한데 매수해보는건 어떨까?  
+"""
+
 
 class NewsReview:
-    def __init__(self, api_key):
-        self.llm = ChatOpenAI(api_key=api_key, model="gpt-3.5-turbo", temperature=0.2)
+    def __init__(self, api_key, rate_limiter=None):
+        self.llm = ChatOpenAI(api_key=api_key, model="gpt-3.5-turbo", temperature=0.2, max_retries=0)
+        self.rate_limiter = rate_limiter or shared_rate_limiter
+
+    def generate_one_line_review(self, merged_content, style=None):
+        prompt = self.review_prompt(merged_content, style)
+        summary = self.rate_limiter.invoke(self.llm, prompt).content
+        print(f"\033[95m뉴스 한줄평 생성 완료\033[0m")
+        return summary
+
+    def review_run(self, run_store, merged_content, style=None, output_name="review"):
+        """
+        한줄 평을 생성하여 실행 저장소에 기록하는 함수.
+        같은 실행에서 이미 생성된 한줄 평이 있으면 LLM을 호출하지 않고 반환합니다.
+        실패하면 failures 테이블에 기록한 뒤 예외를 다시 발생시킵니다.
+
+        :param style: 한줄 평의 말투와 관점 (None이면 DEFAULT_REVIEW_STYLE)
+        :param output_name: 한줄 평을 기록할 outputs 이름
+        """
+        review = run_store.get_output(output_name)
+        if review is not None:
+            print("이미 생성된 한줄평을 사용합니다.")
+            return review
+
+        try:
+            review = self.generate_one_line_review(merged_content, style)
+        except Exception as e:
+            run_store.record_failures("review", [output_name], e)
+            raise
+        run_store.put_output(output_name, review)
+        return review
+
+    async def agenerate_one_line_review(self, merged_content, style=None):
+        prompt = self.review_prompt(merged_content, style)
+        summary = (await self.rate_limiter.ainvoke(self.llm, prompt)).content
+        print(f"\033[95m뉴스 한줄평 생성 완료\033[0m")
+        return summary
+
+    async def areview_run(self, run_store, merged_content, style=None, output_name="review"):
+        """review_run의 비동기 버전"""
+        review = run_store.get_output(output_name)
+        if review is not None:
+            print(f"이미 생성된 한줄평을 사용합니다. ({output_name})")
+            return review
+
+        try:
+            review = await self.agenerate_one_line_review(merged_content, style)
+        except Exception as e:
+            run_store.record_failures("review", [output_name], e)
+            raise
+        run_store.put_output(output_name, review)
+        return review
+
+    def review_many(self, run_store, requests):
+        """
+        여러 한줄 평(에디션별 한줄 평 등)을 동시에 생성하여 실행 저장소에 기록하는 함수.
+        하나가 실패해도 나머지는 끝까지 생성하여 기록하고, 마지막에 첫 번째 예외를 다시 발생시킵니다.
 
-    def generate_one_line_review(self, merged_content):
+        :param requests: (outputs 이름, 병합된 요약, 말투) 튜플 리스트
+        :return: {outputs 이름: 한줄 평}
+        """
+        async def review_all():
+            return await asyncio.gather(
+                *(self.areview_run(run_store, merged_content, style, output_name)
+                  for output_name, merged_content, style in requests),
+                return_exceptions=True
+            )
+
+        results = asyncio.run(review_all())
+        errors = [result for result in results if isinstance(result, Exception)]
+        for (output_name, _, _), result in zip(requests, results):
+            if isinstance(result, Exception):
+                print(f"\033[91m한줄평 생성 실패: {output_name} - {result}\033[0m")
+        if errors:
+            raise errors[0]
+        return {output_name: result for (output_name, _, _), result in zip(requests, results)}
+
+    @staticmethod
+    def review_prompt(merged_content, style=None):
         daily_summary_system_message = (
             """"
                 요구사항:
@@ -13,14 +103,7 @@ class NewsReview:
                     - 모든 뉴스를 언급할 필요는 없습니다. 주요한 뉴스에 대한 평만 남겨도 됩니다.    
                     - 결과값은 한 문단이어야 합니다.
                     - 100자를 넘지 않아야 합니다.
-                    - 문장의 어미는 반드시 친근하고 캐주얼한 말투(~군, ~야, ~겠어, ~바래)를 사용해야 합니다.
-                    - 각 문장은 격식 없는 대화체로 작성해야 합니다.
-                    - 뉴스를 기반으로 예상한 전망에 대한 내용을 포함해야 합니다.
-
-                예시 1. 태풍 때문에 사건 사고가 많은 날이군. 대신 태풍으로 인해 날씨가 제법 선선해질듯해
-                예시 2. 전쟁 위험이 점점 심각해지고 있어서 걱정이야. 전쟁이 일어난다면 경제가 침체되고 주가가 폭락할것으로 예상돼
-                예시 3. 올림픽으로 인해 국위 선양에 대한 내용이 많아. 금메달을 꽤 많이 획득해서 한국의 브랜드 가치가 높아질 전망이야 
-                예시 4. 오늘은 IT 와 관련된 호재가 많군. 반도체 관련 주식이 많이 오를듯한데 매수해보는건 어떨까?  
+                {style}
             """
         )
         daily_summary_prompt_template = """
@@ -30,7 +113,5 @@ class NewsReview:
             ("system", daily_summary_system_message),
             ("human", daily_summary_prompt_template)
         ])
-        prompt = prompt_set.format(text=merged_content)
-        summary = self.llm.invoke(prompt).content
-        print(f"\033[95m뉴스 한줄평 생성 완료\033[0m")
-        return summary
+        # 말투는 설정 파일에서 오므로 중괄호가 있어도 템플릿으로 해석되지 않도록 변수로 전달
+        return prompt_set.format(text=merged_content, style=style or DEFAULT_REVIEW_STYLE)
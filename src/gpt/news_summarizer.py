@@ -1,16 +1,32 @@
+import asyncio
 import threading
 import time
+import json
+import re
 import pandas as pd
 from src.util.utils import print_progress_bar
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 from langchain.text_splitter import CharacterTextSplitter
-from openai import RateLimitError
+from src.gpt.summary_cache import content_key
+from src.gpt.rate_limiter import shared_rate_limiter, estimate_tokens
 
 class NewsSummarizer:
-    def __init__(self, api_key):
-        self.llm = ChatOpenAI(api_key=api_key, model="gpt-3.5-turbo", temperature=0)
+    def __init__(self, api_key, cache=None, rate_limiter=None, max_workers=16, compressor=None):
+        """
+        :param api_key: OpenAI API 키
+        :param cache: 요약 캐시 (SummaryCache 인스턴스, None이면 캐시 사용 안 함)
+        :param rate_limiter: 요청 제한기 (None이면 모든 LLM 호출이 공유하는 제한기 사용)
+        :param max_workers: 동시에 요청하는 스레드 수 (실제 처리 속도는 요청 제한기가 조절)
+        :param compressor: 요약 요청 전에 본문을 줄이는 압축기 (ArticleCompressor 인스턴스, None이면 원문 그대로 요청)
+        """
+        self.cache = cache
+        self.compressor = compressor
+        self.rate_limiter = rate_limiter or shared_rate_limiter
+        self.max_workers = max_workers
+        # 재시도는 요청 제한기가 담당하므로 OpenAI 클라이언트 자체 재시도는 끕니다.
+        self.llm = ChatOpenAI(api_key=api_key, model="gpt-3.5-turbo", temperature=0, max_retries=0)
         self.system_message = (
             """"
                 요구사항:
@@ -38,64 +54,446 @@ class NewsSummarizer:
             ("system", self.system_message),
             ("human", self.prompt_template)
         ])
+        self.batch_prompt_template = """
+        아래에 번호가 붙은 {count}개의 뉴스 기사가 있습니다. 각 기사를 위의 요구사항에 맞게 따로 요약해주세요.
+        답변은 기사 번호를 키로, 요약을 값으로 하는 JSON 객체 하나만 작성해야 합니다.
+        답변 형식: {{"1": "요약", "2": "요약"}}
+
+        {articles}
+        """
+        self.batch_prompt = ChatPromptTemplate.from_messages([
+            ("system", self.system_message),
+            ("human", self.batch_prompt_template)
+        ])
         self.summary_completed_pages = 0
         self.lock = threading.Lock()
 
+    def cache_key(self, text, batched=False):
+        """
+        요약 캐시 키 (요약을 만든 프롬프트로 계산).
+        묶음 요청의 요약은 batched=True로 기사별 요청의 요약과 다른 키에 저장하므로, 묶음 프롬프트를 고치면 해당 요약만 무효화됩니다.
+        """
+        template = self.batch_prompt_template if batched else self.prompt_template
+        return content_key(text, self.llm.model_name, self.system_message + template)
+
+    def cached_summary(self, text, batched=False):
+        """
+        캐시된 요약을 반환하는 함수 (없으면 None).
+        묶음 모드에서도 단독 요청이나 응답에서 빠진 기사는 기사별 프롬프트로 요약하므로, 기사별 요약도 함께 찾습니다.
+        """
+        if self.cache is None:
+            return None
+        if batched:
+            return self.cache.get(self.cache_key(text, batched=True), fallback_key=self.cache_key(text))
+        return self.cache.get(self.cache_key(text))
+
+    def prepare(self, text):
+        """
+        요약 요청에 보낼 본문을 반환하는 함수.
+        압축기가 있으면 상용구를 지우고 토큰 예산 안의 핵심 문장만 남깁니다. (캐시 키도 압축한 본문으로 계산)
+        :return: (본문, 압축기가 있으면 (원문 토큰 수, 압축 후 토큰 수) 아니면 None)
+        """
+        if self.compressor is None:
+            return text, None
+        compressed, original_tokens, compressed_tokens = self.compressor.compress(text)
+        return compressed, (original_tokens, compressed_tokens)
+
+    def record_compression(self, tokens):
+        """캐시에 없어 실제로 요청하는 기사의 압축 결과만 통계에 기록"""
+        if tokens is not None:
+            self.compressor.record(*tokens)
+
     def summarize_content(self, text):
+        text, tokens = self.prepare(text)
+        if self.cache is None:
+            self.record_compression(tokens)
+            return self.summarize_uncached(text)
+
+        # 같은 본문, 모델, 프롬프트로 만든 요약이 있으면 LLM을 호출하지 않음
+        summary = self.cache.get(self.cache_key(text))
+        if summary is None:
+            self.record_compression(tokens)
+            summary = self.summarize_and_store(text)
+        return summary
+
+    def summarize_and_store(self, text):
+        """캐시를 조회하지 않고 요약한 뒤, 결과를 캐시에 저장하는 함수"""
+        summary = self.summarize_uncached(text)
+        if self.cache is not None:
+            self.cache.put(self.cache_key(text), self.llm.model_name, summary)
+        return summary
+
+    def invoke_with_retry(self, formatted_prompt):
+        return self.rate_limiter.invoke(self.llm, formatted_prompt).content
+
+    def summarize_uncached(self, text):
         text_splitter = CharacterTextSplitter(separator='', chunk_size=10000, chunk_overlap=500)
         split_texts = text_splitter.split_text(text)
         summaries = []
 
         for split_text in split_texts:
             formatted_prompt = self.prompt.format(text=split_text)
+            summaries.append(self.invoke_with_retry(formatted_prompt))
+
+        return "\n".join(summaries)
+
+    async def asummarize_content(self, text):
+        """summarize_content의 비동기 버전"""
+        text, tokens = self.prepare(text)
+        if self.cache is not None:
+            summary = self.cache.get(self.cache_key(text))
+            if summary is not None:
+                return summary
+        self.record_compression(tokens)
+        return await self.asummarize_and_store(text)
+
+    async def asummarize_uncached(self, text):
+        """summarize_uncached의 비동기 버전 (청크들을 동시에 요청)"""
+        text_splitter = CharacterTextSplitter(separator='', chunk_size=10000, chunk_overlap=500)
+        split_texts = text_splitter.split_text(text)
+        responses = await asyncio.gather(
+            *(self.rate_limiter.ainvoke(self.llm, self.prompt.format(text=split_text)) for split_text in split_texts)
+        )
+        return "\n".join(response.content for response in responses)
+
+    async def asummarize_and_store(self, text):
+        """summarize_and_store의 비동기 버전"""
+        summary = await self.asummarize_uncached(text)
+        if self.cache is not None:
+            self.cache.put(self.cache_key(text), self.llm.model_name, summary)
+        return summary
+
+    def count_tokens(self, text):
+        return estimate_tokens(text, self.llm.model_name)
+
+    def build_batches(self, items, token_budget, max_batch_size=10):
+        """
+        (행 번호, 본문) 리스트를 입력 토큰 예산 안에서 여러 기사씩 묶는 함수.
+        예산을 넘거나 청크 크기(10,000자)를 넘는 기사는 단독으로 요청합니다.
+        """
+        batches = []
+        current, current_tokens = [], 0
+        for i, text in items:
+            tokens = self.count_tokens(text)
+            if tokens > token_budget or len(text) > 10000:
+                batches.append([(i, text)])
+                continue
+            if current and (current_tokens + tokens > token_budget or len(current) >= max_batch_size):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append((i, text))
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    @staticmethod
+    def parse_batch_response(content, count):
+        """
+        배치 요약 응답(JSON)을 {기사 번호(1부터): 요약} 딕셔너리로 변환하는 함수.
+        형식이 맞지 않으면 빈 딕셔너리를 반환합니다.
+        """
+        match = re.search(r"\{.*\}", content, re.DOTALL)
+        if not match:
+            return {}
+        try:
+            parsed = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            return {}
+        if not isinstance(parsed, dict):
+            return {}
+
+        summaries = {}
+        for number in range(1, count + 1):
+            summary = parsed.get(str(number))
+            if isinstance(summary, str) and summary.strip():
+                summaries[number] = summary.strip()
+        return summaries
+
+    def summarize_batch(self, batch):
+        """
+        여러 기사를 한 번의 요청으로 요약하는 함수.
+        응답에서 빠졌거나 파싱에 실패한 기사는 기사별 요청으로 다시 요약합니다.
+        :return: {행 번호: 요약}
+        """
+        if len(batch) == 1:
+            i, text = batch[0]
+            return {i: self.summarize_and_store(text)}
+
+        try:
+            content = self.invoke_with_retry(self.format_batch_prompt(batch))
+        except Exception as e:
+            # 재시도를 모두 실패했거나 묶음 요청 자체가 거부된 경우(컨텍스트 길이 초과 등) 기사별 요청으로 대체
+            print(f"\033[91m{len(batch)}개 기사의 묶음 요약 실패, 기사별로 요약합니다: {type(e).__name__}: {e}\033[0m")
+            content = None
+
+        results, missing = self.apply_batch_response(batch, content)
+        for i, text in missing:
+            results[i] = self.summarize_and_store(text)
+        return results
+
+    async def asummarize_batch(self, batch):
+        """summarize_batch의 비동기 버전"""
+        if len(batch) == 1:
+            i, text = batch[0]
+            return {i: await self.asummarize_and_store(text)}
+
+        try:
+            content = (await self.rate_limiter.ainvoke(self.llm, self.format_batch_prompt(batch))).content
+        except Exception as e:
+            # 재시도를 모두 실패했거나 묶음 요청 자체가 거부된 경우(컨텍스트 길이 초과 등) 기사별 요청으로 대체
+            print(f"\033[91m{len(batch)}개 기사의 묶음 요약 실패, 기사별로 요약합니다: {type(e).__name__}: {e}\033[0m")
+            content = None
+
+        results, missing = self.apply_batch_response(batch, content)
+        summaries = await asyncio.gather(*(self.asummarize_and_store(text) for _, text in missing))
+        results.update(zip([i for i, _ in missing], summaries))
+        return results
+
+    def format_batch_prompt(self, batch):
+        articles = "\n\n".join(f"[기사 {number}]\n{text}" for number, (_, text) in enumerate(batch, start=1))
+        return self.batch_prompt.format(count=len(batch), articles=articles)
+
+    def apply_batch_response(self, batch, content):
+        """
+        배치 응답을 행 번호별 요약으로 매핑하고 캐시에 저장하는 함수
+        :return: ({행 번호: 요약}, 응답에서 빠진 (행 번호, 본문) 리스트)
+        """
+        parsed = self.parse_batch_response(content, len(batch)) if content else {}
 
-            retry_attempts = 0
-            max_attempts = 5
-            while retry_attempts < max_attempts:
-                try:
-                    summary = self.llm.invoke(formatted_prompt).content
-                    summaries.append(summary)
-                    break  # 성공하면 반복 종료
-                except RateLimitError:
-                    retry_attempts += 1
-                    wait_time = min(2 ** retry_attempts, 60)  # 지수적 백오프
-                    print(f"Rate limit exceeded, retrying in {wait_time} seconds... (Attempt {retry_attempts}/{max_attempts})")
-                    time.sleep(wait_time)
+        results, missing = {}, []
+        for number, (i, text) in enumerate(batch, start=1):
+            if number in parsed:
+                results[i] = parsed[number]
+                if self.cache is not None:
+                    self.cache.put(self.cache_key(text, batched=True), self.llm.model_name, parsed[number])
             else:
-                raise RuntimeError(f"Failed to summarize content after {max_attempts} attempts due to rate limits.")
+                missing.append((i, text))
+        return results, missing
 
-        return "\n".join(summaries)
+    def update_progress(self, count, total_articles):
+        with self.lock:
+            self.summary_completed_pages += count
+            print_progress_bar("요약", self.summary_completed_pages, total_articles)
 
-    def summarize_articles(self, csv_file, summarized_csv):
-        start_time = time.time()
-        df = pd.read_csv(csv_file)
-        total_articles = len(df)
-        print(f"총 {total_articles}개의 기사가 발견되었습니다.")
+    def collect_results(self, results, indices, outcome, total_articles, on_done=None, on_failed=None):
+        """
+        한 요청(기사 1건 또는 배치)의 결과를 모으는 함수.
+        요청이 실패해도 단계 전체를 중단하지 않고 해당 기사들을 실패로 처리합니다.
 
-        summaries = []
+        :param indices: 요청에 포함된 행 번호 리스트
+        :param outcome: {행 번호: 요약}을 반환하는 함수 (실패하면 예외 발생)
+        :param on_done: 요약이 끝날 때마다 호출할 함수 on_done({행 번호: 요약})
+        :param on_failed: 요약에 실패하면 호출할 함수 on_failed(행 번호 리스트, 예외)
+        """
+        try:
+            partial = outcome()
+        except Exception as e:
+            print(f"\033[91m{len(indices)}개 기사의 요약 실패: {type(e).__name__}: {e}\033[0m")
+            if on_failed is not None:
+                on_failed(indices, e)
+        else:
+            results.update(partial)
+            if on_done is not None:
+                on_done(partial)
+        self.update_progress(len(indices), total_articles)
 
-        with ThreadPoolExecutor(max_workers=7) as executor:
-            futures = {executor.submit(self.summarize_content, row['main']): i for i, row in df.iterrows()}
+    def summarize_rows(self, df, on_done=None, on_failed=None):
+        """기사마다 요약을 요청하는 함수 :return: {행 번호: 요약}"""
+        results, pending = self.split_cached(df, on_done)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.summarize_and_store, text): i for i, text in pending}
 
             for future in as_completed(futures):
                 i = futures[future]
-                summary = future.result()
+                self.collect_results(results, [i], lambda: {i: future.result()}, len(df), on_done, on_failed)
+        return results
+
+    def split_cached(self, df, on_done=None, batched=False):
+        """
+        캐시에 요약이 있는 기사와 없는 기사를 나누는 함수
+        :param batched: True이면 묶음 요청으로 만든 요약도 찾음
+        :return: ({행 번호: 캐시된 요약}, 요약이 필요한 (행 번호, 요청할 본문) 리스트)
+        """
+        results = {}
+        pending = []
+        for i, row in df.iterrows():
+            text, tokens = self.prepare(row['main'])
+            summary = self.cached_summary(text, batched)
+            if summary is None:
+                pending.append((i, text))
+                self.record_compression(tokens)
+            else:
+                results[i] = summary
+                self.update_progress(1, len(df))
+        if results and on_done is not None:
+            on_done(dict(results))
+        return results, pending
+
+    def summarize_rows_batched(self, df, token_budget, on_done=None, on_failed=None):
+        """
+        캐시에 없는 기사들을 토큰 예산 안에서 묶어 한 번의 요청으로 요약하는 함수
+        :return: {행 번호: 요약}
+        """
+        results, pending = self.split_cached(df, on_done, batched=True)
+        batches = self.build_batches(pending, token_budget)
+        print(f"{len(pending)}개의 기사를 {len(batches)}개의 요청으로 묶어 요약합니다.")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.summarize_batch, batch): batch for batch in batches}
+
+            for future in as_completed(futures):
+                indices = [i for i, _ in futures[future]]
+                self.collect_results(results, indices, future.result, len(df), on_done, on_failed)
+        return results
+
+    async def asummarize_rows(self, df, token_budget=None, concurrency=32, deadline=None, on_done=None,
+                              on_failed=None):
+        """
+        ChatOpenAI.ainvoke로 기사들을 동시에 요약하는 함수.
+        동시 요청 수는 세마포어로 제한하고, 마감 시간이 지나도 끝나지 않은 요청은 취소합니다.
 
-                with self.lock:
-                    self.summary_completed_pages += 1
-                    print_progress_bar("요약", self.summary_completed_pages, total_articles)
+        :param token_budget: 설정하면 이 입력 토큰 수 안에서 여러 기사를 한 번에 요약
+        :param concurrency: 최대 동시 요청 수
+        :param deadline: 마감 시간(초, None이면 제한 없음). 취소된 기사는 결과에서 제외되고 실패로 처리됩니다.
+        :return: {행 번호: 요약}
+        """
+        results, pending = self.split_cached(df, on_done, batched=bool(token_budget))
+        if token_budget:
+            batches = self.build_batches(pending, token_budget)
+            print(f"{len(pending)}개의 기사를 {len(batches)}개의 요청으로 묶어 요약합니다.")
+        else:
+            batches = [[item] for item in pending]
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(batch):
+            async with semaphore:
+                return await self.asummarize_batch(batch)
 
-                summaries.append({
-                    "title": df.loc[i, 'title'],
-                    "date": df.loc[i, 'date'],
-                    "section_code": df.loc[i, 'section'],
-                    "section_name": df.loc[i, 'section_name'],
-                    "summary": summary
-                })
+        tasks = {asyncio.create_task(run(batch)): batch for batch in batches}
+        remaining = set(tasks)
+        ends_at = None if deadline is None else time.monotonic() + deadline
+        while remaining:
+            timeout = None if ends_at is None else max(0.0, ends_at - time.monotonic())
+            done, remaining = await asyncio.wait(remaining, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                indices = [i for i, _ in tasks[task]]
+                self.collect_results(results, indices, task.result, len(df), on_done, on_failed)
+
+        if remaining:
+            for task in remaining:
+                task.cancel()
+            await asyncio.gather(*remaining, return_exceptions=True)
+            cancelled = [i for task in remaining for i, _ in tasks[task]]
+            print(f"\033[91m마감 시간({deadline}초)이 지나 {len(cancelled)}개 기사의 요약을 취소했습니다.\033[0m")
+            if on_failed is not None:
+                on_failed(cancelled, TimeoutError(f"deadline of {deadline}s exceeded"))
+        return results
+
+    def summarize_df(self, df, batch_token_budget=None, async_mode=False, concurrency=32, deadline=None,
+                     on_done=None, on_failed=None):
+        """
+        DataFrame의 기사들을 요약하여 요약 DataFrame을 반환하는 함수.
+        df에 article_id 컬럼이 있으면 결과에도 포함합니다. 요약에 실패한 기사는 결과에서 제외됩니다.
+
+        :param df: title, date, section, section_name, main 컬럼을 가진 기사 DataFrame
+        :param batch_token_budget: 설정하면 이 입력 토큰 수 안에서 여러 기사를 한 번에 요약 (None이면 기사별 요청)
+        :param async_mode: True이면 스레드 풀 대신 asyncio(ainvoke)로 요청
+        :param concurrency: async 모드의 최대 동시 요청 수
+        :param deadline: async 모드의 마감 시간(초)
+        :param on_done: 요약이 끝날 때마다 호출할 함수 on_done({행 번호: 요약})
+        :param on_failed: 요약에 실패하면 호출할 함수 on_failed(행 번호 리스트, 예외)
+        """
+        print(f"총 {len(df)}개의 기사가 발견되었습니다.")
+
+        if async_mode:
+            results = asyncio.run(self.asummarize_rows(df, batch_token_budget, concurrency, deadline,
+                                                       on_done, on_failed))
+        elif batch_token_budget:
+            results = self.summarize_rows_batched(df, batch_token_budget, on_done, on_failed)
+        else:
+            results = self.summarize_rows(df, on_done, on_failed)
+
+        summaries = [self.summary_row(df, i, summary) for i, summary in results.items()]
+
+        if self.cache is not None:
+            print(f"\033[92m{self.cache.stats_message()}\033[0m")
+        if self.compressor is not None:
+            print(f"\033[92m{self.compressor.stats_message()}\033[0m")
+        return pd.DataFrame(summaries)
+
+    @staticmethod
+    def summary_row(df, i, summary):
+        """요약 결과 한 행을 만드는 함수"""
+        row = {
+            "title": df.loc[i, 'title'],
+            "date": df.loc[i, 'date'],
+            "section_code": df.loc[i, 'section'],
+            "section_name": df.loc[i, 'section_name'],
+            "summary": summary
+        }
+        if 'article_id' in df.columns:
+            row["article_id"] = df.loc[i, 'article_id']
+        return row
+
+    def summarize_articles(self, csv_file, summarized_csv, batch_token_budget=None, async_mode=False,
+                           concurrency=32, deadline=None):
+        """
+        :param csv_file: 스크래핑 결과 CSV 파일 경로
+        :param summarized_csv: 요약 결과를 저장할 CSV 파일 경로
+        :param batch_token_budget: 설정하면 이 입력 토큰 수 안에서 여러 기사를 한 번에 요약 (None이면 기사별 요청)
+        :param async_mode: True이면 스레드 풀 대신 asyncio(ainvoke)로 요청
+        :param concurrency: async 모드의 최대 동시 요청 수
+        :param deadline: async 모드의 마감 시간(초)
+        """
+        start_time = time.time()
+        df = pd.read_csv(csv_file)
+        summaries_df = self.summarize_df(df, batch_token_budget, async_mode, concurrency, deadline)
 
-        summaries_df = pd.DataFrame(summaries)
         summaries_df.to_csv(summarized_csv, index=False, encoding='utf-8-sig')
         print(f"\033[95m기사 요약이 완료되었습니다. 요약본이 {summarized_csv}에 저장되었습니다.\033[0m")
 
         elapsed_time = time.time() - start_time
         print(f"\033[92m요약 작업이 완료되었습니다. 총 소요 시간: {elapsed_time:.2f}초\033[0m")
+
+    def summarize_run(self, run_store, summarized_csv=None, batch_token_budget=None, async_mode=False,
+                      concurrency=32, deadline=None):
+        """
+        실행 저장소에서 요약 대상으로 선정된 기사를 읽어 요약하고, 결과를 저장소에 기록하는 함수.
+        요약이 끝날 때마다 바로 기록하므로 중간에 중단되어도 완료된 요약은 남아 있으며,
+        같은 실행을 다시 진행하면 이미 요약된 기사는 건너뜁니다. 실패한 기사는 failures 테이블에 기록됩니다.
+
+        :param run_store: RunStore 인스턴스
+        :param summarized_csv: 요약 결과 스냅샷을 저장할 CSV 파일 경로 (None이면 저장하지 않음)
+        """
+        start_time = time.time()
+        df = run_store.load_articles(["article_id", "title", "date", "section", "section_name", "main"],
+                                     shortlisted=1)
+        finished = set(run_store.load_summaries(["article_id"])['article_id'])
+        if finished:
+            print(f"이미 요약된 {len(finished)}개의 기사를 건너뜁니다.")
+            df = df[~df['article_id'].isin(finished)]
+
+        def on_done(partial):
+            run_store.append_summaries([self.summary_row(df, i, summary) for i, summary in partial.items()])
+
+        def on_failed(indices, error):
+            run_store.record_failures("summarize", df.loc[indices, 'article_id'], error)
+
+        self.summarize_df(df, batch_token_budget, async_mode, concurrency, deadline, on_done, on_failed)
+        summaries_df = run_store.load_summaries()
+        failed = len(df) - (len(summaries_df) - len(finished))
+        print(f"\033[95m기사 요약이 완료되었습니다. 요약본을 실행 저장소({run_store.run_id})에 기록했습니다.\033[0m")
+        if failed:
+            print(f"\033[91m{failed}개 기사의 요약에 실패했습니다. --resume으로 다시 시도할 수 있습니다.\033[0m")
+
+        if summarized_csv is not None:
+            summaries_df.to_csv(summarized_csv, index=False, encoding='utf-8-sig')
+            print(f"CSV 파일 저장 완료: {summarized_csv}")
+
+        elapsed_time = time.time() - start_time
+        print(f"\033[92m요약 작업이 완료되었습니다. 총 소요 시간: {elapsed_time:.2f}초\033[0m")
+        return summaries_df
@@ -0,0 +1,240 @@
+import os
+import asyncio
+import random
+import threading
+import time
+import tiktoken
+from openai import RateLimitError, APIConnectionError, InternalServerError
+from src.util.metrics import metrics
+
+
+# 불러온 인코딩 {모델: 인코딩}과 실패한 모델 {모델: 실패 시각} (실패는 ENCODING_RETRY_SECONDS 후 다시 시도)
+ENCODING_RETRY_SECONDS = 300
+encodings = {}
+encoding_failures = {}
+encoding_lock = threading.Lock()
+
+
+def load_encoding(model):
+    """
+    모델의 tiktoken 인코딩을 반환하는 함수 (불러올 수 없으면 None).
+    tiktoken은 처음 사용할 때 인코딩 파일을 내려받으므로, 네트워크가 없으면 근사치를 사용합니다.
+    성공한 인코딩만 캐시하고, 실패하면 ENCODING_RETRY_SECONDS 동안은 다시 내려받지 않다가 그 뒤에 다시 시도합니다.
+    (오래 실행되는 감시 모드가 일시적인 네트워크 오류 한 번으로 계속 근사치를 쓰지 않도록)
+    """
+    encoding = encodings.get(model)
+    if encoding is not None:
+        return encoding
+    with encoding_lock:
+        if model in encodings:
+            return encodings[model]
+        failed_at = encoding_failures.get(model)
+        if failed_at is not None and time.monotonic() - failed_at < ENCODING_RETRY_SECONDS:
+            return None
+        try:
+            try:
+                encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            if failed_at is None:
+                print(f"\033[91mtiktoken 인코딩을 불러오지 못해 토큰 수를 근사치로 계산합니다: {type(e).__name__}: {e}\033[0m")
+            encoding_failures[model] = time.monotonic()
+            return None
+        encodings[model] = encoding
+        encoding_failures.pop(model, None)
+        return encoding
+
+
+def estimate_tokens(text, model="gpt-3.5-turbo"):
+    """요청 전에 프롬프트의 토큰 수를 추정하는 함수"""
+    text = str(text)
+    encoding = load_encoding(model)
+    if encoding is None:
+        # UTF-8 4바이트당 1토큰 (영문 약 4글자, 한글 약 1.3글자당 1토큰)
+        return max(1, len(text.encode("utf-8")) // 4)
+    return len(encoding.encode(text))
+
+
+def retry_after_seconds(error):
+    """429 응답의 Retry-After(retry-after-ms) 헤더 값을 초 단위로 반환하는 함수 (없으면 None)"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        return None
+    return None
+
+
+class TokenBucket:
+    """분당 허용량을 일정한 속도로 채우는 토큰 버킷"""
+
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.tokens = per_minute
+        self.updated_at = time.monotonic()
+
+    def refill(self, now, scale):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.capacity * scale / 60)
+        self.updated_at = now
+
+    def wait_time(self, amount, scale):
+        """amount만큼 사용하려면 기다려야 하는 시간(초)"""
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) * 60 / (self.capacity * scale)
+
+
+class RateLimiter:
+    """
+    src/gpt의 모든 ChatOpenAI 호출이 공유하는 적응형 요청 제한기.
+
+    - 분당 요청 수(RPM)와 분당 토큰 수(TPM)를 토큰 버킷으로 제한하고, 토큰 수는 요청 전에 추정합니다.
+    - 429 응답을 받으면 Retry-After 동안 모든 호출을 멈추고 처리 속도를 줄인 뒤, 성공할 때마다 조금씩 회복합니다.
+    - 타임아웃, 연결 오류, 5xx 오류는 지터를 더한 지수 백오프로 재시도합니다.
+    """
+
+    def __init__(self, requests_per_minute=500, tokens_per_minute=200000, max_attempts=6,
+                 completion_tokens=300, max_backoff=60):
+        """
+        :param requests_per_minute: 분당 최대 요청 수
+        :param tokens_per_minute: 분당 최대 토큰 수
+        :param max_attempts: 요청당 최대 시도 횟수
+        :param completion_tokens: 응답 토큰 수 추정치 (TPM 계산에 포함)
+        :param max_backoff: 재시도 대기 시간의 상한(초)
+        """
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_attempts = max_attempts
+        self.completion_tokens = completion_tokens
+        self.max_backoff = max_backoff
+        self.scale = 1.0  # 429를 받으면 줄어드는 처리 속도 비율
+        self.cooldown_until = 0.0
+        self.lock = threading.Lock()
+        self.rate_limited_count = 0
+        self.retry_count = 0
+
+    def reserve(self, estimated_tokens):
+        """
+        요청 1건과 추정 토큰을 사용할 수 있으면 차감하고 0을, 아니면 기다려야 하는 시간(초)을 반환하는 함수
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.request_bucket.refill(now, self.scale)
+            self.token_bucket.refill(now, self.scale)
+            wait = max(
+                self.cooldown_until - now,
+                self.request_bucket.wait_time(1, self.scale),
+                self.token_bucket.wait_time(estimated_tokens, self.scale),
+            )
+            if wait <= 0:
+                self.request_bucket.tokens -= 1
+                self.token_bucket.tokens -= estimated_tokens
+                return 0
+            return wait
+
+    def acquire(self, estimated_tokens):
+        """요청 1건과 추정 토큰을 사용할 수 있을 때까지 대기하는 함수"""
+        while wait := self.reserve(estimated_tokens):
+            time.sleep(wait)
+
+    async def acquire_async(self, estimated_tokens):
+        """acquire의 비동기 버전 (이벤트 루프를 막지 않고 대기)"""
+        while wait := self.reserve(estimated_tokens):
+            await asyncio.sleep(wait)
+
+    def record_usage(self, estimated_tokens, actual_tokens):
+        """실제 사용한 토큰 수로 추정치와의 차이를 보정하는 함수"""
+        with self.lock:
+            self.token_bucket.tokens -= actual_tokens - estimated_tokens
+            # 성공할 때마다 처리 속도를 조금씩 회복
+            self.scale = min(1.0, self.scale + 0.02)
+
+    def on_rate_limited(self, retry_after):
+        """429 응답을 받았을 때 모든 호출을 잠시 멈추고 처리 속도를 줄이는 함수"""
+        with self.lock:
+            self.rate_limited_count += 1
+            self.scale = max(0.1, self.scale * 0.7)
+            self.cooldown_until = max(self.cooldown_until, time.monotonic() + retry_after)
+
+    def backoff(self, attempt):
+        """지터를 더한 지수 백오프 대기 시간(초)"""
+        return random.uniform(0, min(2 ** attempt, self.max_backoff))
+
+    def invoke(self, llm, prompt):
+        """
+        요청 제한을 지키면서 llm.invoke를 호출하고, 일시적인 오류는 재시도하는 함수
+        :return: LLM 응답 메시지
+        """
+        estimated_tokens = estimate_tokens(prompt, llm.model_name) + self.completion_tokens
+
+        for attempt in range(1, self.max_attempts + 1):
+            self.acquire(estimated_tokens)
+            try:
+                with metrics.timer("llm_request_duration_seconds", stage=metrics.stage_label, model=llm.model_name):
+                    response = llm.invoke(prompt)
+            except (RateLimitError, APIConnectionError, InternalServerError) as e:
+                time.sleep(self.handle_error(e, attempt))
+            else:
+                self.record_response(estimated_tokens, response)
+                return response
+
+        raise RuntimeError(f"Failed to call the LLM after {self.max_attempts} attempts.")
+
+    async def ainvoke(self, llm, prompt):
+        """invoke의 비동기 버전 (llm.ainvoke 사용)"""
+        estimated_tokens = estimate_tokens(prompt, llm.model_name) + self.completion_tokens
+
+        for attempt in range(1, self.max_attempts + 1):
+            await self.acquire_async(estimated_tokens)
+            try:
+                with metrics.timer("llm_request_duration_seconds", stage=metrics.stage_label, model=llm.model_name):
+                    response = await llm.ainvoke(prompt)
+            except (RateLimitError, APIConnectionError, InternalServerError) as e:
+                await asyncio.sleep(self.handle_error(e, attempt))
+            else:
+                self.record_response(estimated_tokens, response)
+                return response
+
+        raise RuntimeError(f"Failed to call the LLM after {self.max_attempts} attempts.")
+
+    def handle_error(self, error, attempt):
+        """
+        재시도 가능한 오류를 기록하고, 호출한 쪽이 직접 기다려야 하는 시간(초)을 반환하는 함수.
+        429는 공유 쿨다운으로 모든 호출을 멈추므로 0을 반환합니다.
+        """
+        if isinstance(error, RateLimitError):
+            wait_time = retry_after_seconds(error) or self.backoff(attempt)
+            self.on_rate_limited(wait_time)
+            metrics.inc("llm_retries_total", stage=metrics.stage_label, reason="rate_limited")
+            print(f"Rate limit exceeded, retrying in {wait_time:.1f} seconds... (Attempt {attempt}/{self.max_attempts})")
+            return 0
+
+        # APITimeoutError는 APIConnectionError의 하위 클래스
+        wait_time = self.backoff(attempt)
+        with self.lock:
+            self.retry_count += 1
+        metrics.inc("llm_retries_total", stage=metrics.stage_label, reason=type(error).__name__)
+        print(f"{type(error).__name__}, retrying in {wait_time:.1f} seconds... (Attempt {attempt}/{self.max_attempts})")
+        return wait_time
+
+    def record_response(self, estimated_tokens, response):
+        usage = getattr(response, "usage_metadata", None) or {}
+        # 응답에 실제 사용량이 있으면 단계별 프롬프트/응답 토큰 수를 기록
+        for kind, key in (("prompt", "input_tokens"), ("completion", "output_tokens")):
+            if key in usage:
+                metrics.inc("llm_tokens_total", usage[key], stage=metrics.stage_label, kind=kind)
+        self.record_usage(estimated_tokens, usage.get("total_tokens", estimated_tokens))
+
+
+shared_rate_limiter = RateLimiter(
+    requests_per_minute=int(os.getenv("OPENAI_RPM", "500")),
+    tokens_per_minute=int(os.getenv("OPENAI_TPM", "200000")),
+)
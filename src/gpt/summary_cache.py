@@ -0,0 +1,105 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+
+
+def content_key(text, model, prompt):
+    """
+    정규화한 기사 본문, 모델 이름, 프롬프트(시스템 메시지 포함)로 캐시 키를 만드는 함수.
+    공백만 다른 같은 본문(여러 언론사에 실린 통신사 기사 등)은 같은 키를 가집니다.
+    """
+    normalized = re.sub(r"\s+", " ", str(text)).strip()
+    digest = hashlib.sha256()
+    for part in (model, prompt, normalized):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class SummaryCache:
+    """
+    본문 내용 해시를 키로 요약 결과를 저장하는 SQLite 기반 디스크 캐시.
+    적중하면 LLM 호출 없이 저장된 요약을 반환합니다.
+    """
+
+    def __init__(self, db_path, max_age=30 * 24 * 3600, max_entries=20000):
+        """
+        :param db_path: SQLite 파일 경로
+        :param max_age: 이 시간(초)보다 오래된 요약은 삭제
+        :param max_entries: 최대 보관 항목 수 (초과 시 오래 사용되지 않은 항목부터 삭제)
+        """
+        self.db_path = db_path
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS summaries (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                summary TEXT,
+                created_at REAL,
+                accessed_at REAL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_summaries_accessed_at ON summaries (accessed_at)")
+        self.conn.commit()
+
+    def get(self, key, fallback_key=None):
+        """
+        저장된 요약을 반환하는 함수 (없으면 None)
+        :param fallback_key: key에 요약이 없으면 찾아볼 키 (적중/미스는 한 번의 조회로 셈)
+        """
+        with self.lock:
+            row = self.conn.execute("SELECT summary FROM summaries WHERE key = ?", (key,)).fetchone()
+            if row is None and fallback_key is not None:
+                key = fallback_key
+                row = self.conn.execute("SELECT summary FROM summaries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.conn.execute("UPDATE summaries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+        return row[0]
+
+    def put(self, key, model, summary):
+        """요약 결과를 저장하는 함수"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, model, summary, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, model, summary, now, now)
+            )
+            self.conn.commit()
+
+    def evict(self):
+        """max_age보다 오래된 항목과 max_entries를 넘는 항목을 삭제하는 함수"""
+        with self.lock:
+            self.conn.execute("DELETE FROM summaries WHERE created_at < ?", (time.time() - self.max_age,))
+            self.conn.execute(
+                """
+                DELETE FROM summaries WHERE key IN (
+                    SELECT key FROM summaries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            )
+            self.conn.commit()
+
+    def close(self):
+        """캐시를 정리하고 연결을 닫는 함수"""
+        self.evict()
+        self.conn.close()
+
+    def stats_message(self):
+        return f"요약 캐시 - 적중: {self.hits}, 미스: {self.misses}"
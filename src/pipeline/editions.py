@@ -0,0 +1,90 @@
+import json
+import os
+from src.util.utils import merge_summaries
+
+# 설정 파일이 없을 때 사용하는 에디션 (결과 이름이 에디션 도입 전과 같음)
+DEFAULT_EDITION = "default"
+
+
+class Edition:
+    """
+    한 팀에 보내는 다이제스트 설정 (섹션, 섹션별 기사 수, 한줄 평 말투, 슬랙 웹훅).
+
+    스크래핑, 요약, 기사 선별은 모든 에디션의 섹션을 합쳐 한 번만 실행하고,
+    각 에디션은 자신의 섹션에서 상위 top_n개의 선별 결과만 가져다 한줄 평을 만들고 전송합니다.
+    """
+
+    def __init__(self, name, categories, top_n=3, review_style=None, webhook_url=None):
+        """
+        :param name: 에디션 이름 (실행 저장소의 결과 이름에 사용)
+        :param categories: {섹션 이름: 섹션 코드}
+        :param top_n: 섹션별로 보낼 기사 수
+        :param review_style: 한줄 평의 말투와 관점 (None이면 기본 말투)
+        :param webhook_url: 슬랙 웹훅 URL
+        """
+        self.name = name
+        self.categories = categories
+        self.top_n = top_n
+        self.review_style = review_style
+        self.webhook_url = webhook_url
+
+    def output_name(self, name):
+        """에디션별 결과(review, notified_at)의 outputs 이름 (기본 에디션은 기존 이름을 그대로 사용)"""
+        return name if self.name == DEFAULT_EDITION else f"{name}:{self.name}"
+
+    def merged_content(self, run_store):
+        """이 에디션의 섹션에서 상위 top_n개 기사의 요약을 섹션별로 병합하여 반환하는 함수"""
+        top_articles_df = run_store.load_top_articles(["section_name", "summary"],
+                                                      section_codes=self.categories.values(), max_rank=self.top_n)
+        return merge_summaries(top_articles_df)
+
+
+def load_editions(config_path, categories, top_n=3, webhook_url=None):
+    """
+    에디션 설정 파일을 읽어 Edition 리스트를 반환하는 함수.
+    파일이 없으면 모든 섹션을 기본 말투로 webhook_url에 보내는 기본 에디션 하나를 반환합니다.
+
+    설정 파일은 에디션 객체의 JSON 배열이며, 생략한 항목은 기본값을 사용합니다.
+        [{"name": "economy", "categories": ["경제", "IT/과학"], "top_n": 5,
+          "review_style": "- 투자자 관점에서 ...", "webhook_env": "ECONOMY_WEBHOOK_URL"}]
+    웹훅 URL은 webhook_env(환경 변수 이름) 또는 webhook(URL)으로 지정합니다.
+
+    :param config_path: 설정 파일 경로
+    :param categories: 선택할 수 있는 섹션 {섹션 이름: 섹션 코드}
+    :param top_n: 기본 섹션별 기사 수
+    :param webhook_url: 기본 슬랙 웹훅 URL
+    """
+    if not config_path or not os.path.exists(config_path):
+        return [Edition(DEFAULT_EDITION, dict(categories), top_n, None, webhook_url)]
+
+    with open(config_path, encoding="utf-8") as f:
+        config = json.load(f)
+
+    editions = []
+    for entry in config:
+        names = entry.get("categories", list(categories))
+        unknown = [name for name in names if name not in categories]
+        if unknown:
+            raise ValueError(f"Unknown categories in edition {entry.get('name')}: {unknown}")
+        if "webhook_env" in entry:
+            edition_webhook = os.getenv(entry["webhook_env"])
+        else:
+            edition_webhook = entry.get("webhook", webhook_url)
+        editions.append(Edition(
+            entry["name"],
+            {name: code for name, code in categories.items() if name in names},
+            entry.get("top_n", top_n),
+            entry.get("review_style"),
+            edition_webhook,
+        ))
+
+    names = [edition.name for edition in editions]
+    if not editions or len(set(names)) != len(names):
+        raise ValueError(f"Edition names must be non-empty and unique: {names}")
+    return editions
+
+
+def union_categories(editions, categories):
+    """모든 에디션의 섹션을 합친 {섹션 이름: 섹션 코드} (categories의 순서 유지)"""
+    return {name: code for name, code in categories.items()
+            if any(name in edition.categories for edition in editions)}
@@ -0,0 +1,213 @@
+import asyncio
+import time
+import pandas as pd
+from src.rank.pre_ranker import PreRanker
+from src.rank.story_clusterer import StoryClusterer
+from src.scrap.article_cache import normalize_article_id
+
+
+class StreamingPipeline:
+    """
+    스크래핑, 요약, 기사 선별을 겹쳐서 실행하는 스트리밍 파이프라인.
+
+    - 섹션의 수집이 끝나면 중복 기사를 묶고 사전 점수(PreRanker) 상위 K개만 바로 요약 대기열로 보냅니다. (CSV를 거치지 않음)
+    - 섹션의 요약이 모두 끝나면 해당 섹션의 기사 선별을 바로 시작합니다.
+    - 단계 사이는 크기가 제한된 asyncio.Queue로 연결되어, 뒤 단계가 밀리면 앞 단계가 기다립니다.
+
+    전체 소요 시간은 모든 단계의 합이 아니라 가장 느린 단계에 가까워집니다.
+    요약 대상은 배치 모드(scrape 단계)와 같은 방식으로 섹션별로 선정하므로 요약 요청 수와 결과가 같습니다.
+    """
+
+    def __init__(self, scraper, summarizer, news_filter, top_n=3, clusterer=None, pre_ranker=None,
+                 pre_rank_top_k=None, summary_workers=16, queue_size=32, max_connections=10, per_host_limit=10,
+                 run_store=None):
+        """
+        :param scraper: Scrap 인스턴스
+        :param summarizer: NewsSummarizer 인스턴스
+        :param news_filter: NewsFilter 인스턴스
+        :param top_n: 섹션별로 선택할 기사 수
+        :param clusterer: 중복 기사 묶음에 사용할 StoryClusterer (None이면 새로 생성)
+        :param pre_ranker: 요약 대상 선정에 사용할 PreRanker (None이면 새로 생성)
+        :param pre_rank_top_k: 섹션별로 요약할 최대 기사 수 (None이면 중복을 제외한 모든 기사를 요약)
+        :param summary_workers: 동시에 요약을 요청하는 작업자 수
+        :param queue_size: 단계 사이 대기열의 최대 크기
+        :param max_connections: 스크래핑 전체 동시 연결 수
+        :param per_host_limit: 스크래핑 호스트별 동시 연결 수
+        :param run_store: 기사, 요약, 순위를 기록할 실행 저장소 (RunStore 인스턴스, None이면 기록 안 함)
+        """
+        self.scraper = scraper
+        self.summarizer = summarizer
+        self.news_filter = news_filter
+        self.top_n = top_n
+        self.clusterer = clusterer or StoryClusterer()
+        self.pre_ranker = pre_ranker or PreRanker()
+        self.pre_rank_top_k = pre_rank_top_k
+        self.summary_workers = summary_workers
+        self.queue_size = queue_size
+        self.max_connections = max_connections
+        self.per_host_limit = per_host_limit
+        self.run_store = run_store
+
+    async def arun(self):
+        """
+        파이프라인을 실행하고 (수집한 기사 리스트, 요약 리스트, 선택된 기사 리스트)를 반환하는 함수
+        """
+        start_time = time.time()
+        article_queue = asyncio.Queue(maxsize=self.queue_size)
+        summary_queue = asyncio.Queue(maxsize=self.queue_size)
+
+        articles = []
+        summaries = {}  # {섹션 코드: 요약 리스트}
+        pending = {}  # {섹션 코드: 요약이 끝나지 않은 기사 수}
+        section_keys = {}  # {섹션 코드: 수집한 기사의 articles 인덱스 리스트}
+        scraped_sections = set()
+        ranking_tasks = {}
+        total_items = len(self.scraper.categories) * self.top_n
+        stage_times = {}
+
+        def maybe_rank(section):
+            """섹션 수집과 요약이 모두 끝났으면 해당 섹션의 기사 선별을 시작"""
+            if section not in scraped_sections or pending.get(section, 0) or section in ranking_tasks:
+                return
+            if not summaries.get(section):
+                return
+            group = pd.DataFrame(summaries[section])
+            ranking_tasks[section] = asyncio.create_task(
+                self.news_filter.aselect_section(group, self.top_n, total_items)
+            )
+
+        async def on_article(art_dic):
+            await article_queue.put(("article", art_dic))
+
+        async def on_section_done(section):
+            await article_queue.put(("section_done", section))
+
+        async def scrape():
+            await self.scraper.collect_articles_async(self.max_connections, self.per_host_limit,
+                                                      on_article=on_article, on_section_done=on_section_done)
+            stage_times["스크래핑"] = time.time() - start_time
+            await article_queue.put(None)
+
+        def shortlist(section):
+            """섹션의 중복 기사를 묶고 사전 점수 상위 pre_rank_top_k개의 대표 기사를 반환 (scrape 단계와 같은 기준)"""
+            keys = section_keys.pop(section, [])
+            roots = pd.Series([self.clusterer.find(key) for key in keys], index=keys, dtype=object)
+            representatives = [key for key in keys if roots[key] == key]
+            section_df = pd.DataFrame([articles[key] for key in representatives], index=representatives)
+            if section_df.empty:
+                return section_df, len(keys)
+            section_df["cluster_size"] = roots.value_counts().reindex(representatives).to_numpy()
+            if self.pre_rank_top_k is not None:
+                section_df = self.pre_ranker.shortlist(section_df, self.pre_rank_top_k)
+            return section_df, len(keys) - len(representatives)
+
+        async def route():
+            """섹션의 수집이 끝나면 같은 사건의 기사는 대표 기사 한 건만, 사전 점수 상위 기사만 요약 대기열로 보냄"""
+            duplicates = 0
+            while (item := await article_queue.get()) is not None:
+                kind, value = item
+                if kind == "article":
+                    key = len(articles)
+                    articles.append(value)
+                    if self.run_store is not None:
+                        self.run_store.append_article(value)
+                    self.clusterer.add(key, value["main"], value["section"])
+                    section_keys.setdefault(value["section"], []).append(key)
+                    continue
+
+                section_df, section_duplicates = shortlist(value)
+                duplicates += section_duplicates
+                selected = [articles[key] for key in section_df.index]
+                if self.run_store is not None and selected:
+                    self.run_store.mark_shortlisted([art_dic["url"] for art_dic in selected])
+                # 작업자가 대기 중인 기사 수를 줄이기 전에 먼저 설정
+                pending[value] = pending.get(value, 0) + len(selected)
+                scraped_sections.add(value)
+                maybe_rank(value)
+                for art_dic in selected:
+                    await summary_queue.put(art_dic)
+
+            print(f"중복 기사 묶음: {len(articles)}개의 기사 중 {duplicates}개를 중복으로 제외했습니다.")
+            for _ in range(self.summary_workers):
+                await summary_queue.put(None)
+
+        async def summarize():
+            while (art_dic := await summary_queue.get()) is not None:
+                section = art_dic["section"]
+                try:
+                    summary = await self.summarizer.asummarize_content(art_dic["main"])
+                    row = {
+                        "title": art_dic["title"],
+                        "date": art_dic["date"],
+                        "section_code": section,
+                        "section_name": art_dic["section_name"],
+                        "summary": summary,
+                        "article_id": normalize_article_id(art_dic["url"])
+                    }
+                    summaries.setdefault(section, []).append(row)
+                    if self.run_store is not None:
+                        self.run_store.append_summary(row)
+                except Exception as e:
+                    print(f"\033[91m요약 실패: {art_dic['url']} - {e}\033[0m")
+                finally:
+                    pending[section] -= 1
+                    maybe_rank(section)
+
+        workers = [asyncio.create_task(summarize()) for _ in range(self.summary_workers)]
+        await asyncio.gather(scrape(), route())
+        await asyncio.gather(*workers)
+        stage_times["요약"] = time.time() - start_time
+
+        # 한 섹션의 선별이 실패해도 다른 섹션의 결과는 유지하고, 실패한 섹션은 요약 순서대로 top_n개를 사용
+        # (실패한 섹션의 순위는 기록하지 않으므로 filter 단계를 이어서 실행하면 다시 선별)
+        selections = {}
+        for section, task in ranking_tasks.items():
+            try:
+                selections[section] = await task
+            except Exception as e:
+                print(f"\033[91m[{summaries[section][0]['section_name']}] 섹션의 기사 선별 실패: "
+                      f"{type(e).__name__}: {e}\033[0m")
+                if self.run_store is not None:
+                    self.run_store.record_failures("filter", [section], e)
+                selections[section] = summaries[section][:self.top_n]
+                continue
+            if self.run_store is not None:
+                self.run_store.append_rankings(section, [article["article_id"] for article in selections[section]])
+        stage_times["기사 선별"] = time.time() - start_time
+
+        for stage, elapsed in stage_times.items():
+            print(f"\033[92m[스트리밍] {stage} 단계 완료: 시작 후 {elapsed:.2f}초\033[0m")
+
+        summary_rows = [row for section in sorted(summaries) for row in summaries[section]]
+        top_articles = [article for section in sorted(selections) for article in selections[section]]
+        return articles, summary_rows, top_articles
+
+    def run(self, article_csv=None, summarized_csv=None, top_articles_csv=None):
+        """
+        파이프라인을 실행하고 선택된 기사 DataFrame을 반환하는 함수.
+        CSV 경로를 주면 각 단계의 결과를 스냅샷으로 저장합니다.
+
+        :param article_csv: 수집한 기사를 저장할 CSV 파일 경로 (None이면 저장하지 않음)
+        :param summarized_csv: 요약 결과를 저장할 CSV 파일 경로 (None이면 저장하지 않음)
+        :param top_articles_csv: 선택된 기사를 저장할 CSV 파일 경로 (None이면 저장하지 않음)
+        """
+        start_time = time.time()
+        articles, summary_rows, top_articles = asyncio.run(self.arun())
+
+        if self.scraper.cache is not None:
+            print(f"\033[92m{self.scraper.cache.stats_message()}\033[0m")
+        print(self.scraper.fetcher.report())
+        if self.summarizer.cache is not None:
+            print(f"\033[92m{self.summarizer.cache.stats_message()}\033[0m")
+        if self.summarizer.compressor is not None:
+            print(f"\033[92m{self.summarizer.compressor.stats_message()}\033[0m")
+
+        snapshots = ((article_csv, articles), (summarized_csv, summary_rows), (top_articles_csv, top_articles))
+        for csv_file, rows in snapshots:
+            if csv_file is not None:
+                pd.DataFrame(rows).to_csv(csv_file, index=False, encoding='utf-8-sig')
+                print(f"CSV 파일 저장 완료: {csv_file}")
+
+        elapsed_time = time.time() - start_time
+        print(f"\033[95m스트리밍 파이프라인이 완료되었습니다. 총 소요 시간: {elapsed_time:.2f}초\033[0m")
+        return pd.DataFrame(top_articles)
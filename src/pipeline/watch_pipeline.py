@@ -0,0 +1,127 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import pytz
+from src.scrap.scrap import is_valid_article
+from src.scrap.article_cache import normalize_article_id
+from src.rank.pre_ranker import PreRanker, parse_naver_dates
+from src.rank.story_clusterer import StoryClusterer
+
+kst = pytz.timezone('Asia/Seoul')
+
+
+class WatchPipeline:
+    """
+    밤사이 섹션 페이지를 주기적으로 확인하며 새 기사만 미리 수집하고 요약하는 감시 모드.
+
+    - 이미 가져온 기사 ID(실행 저장소의 articles 테이블)는 다시 요청하지 않습니다.
+    - 확인할 때마다 최근 window_hours 안에 작성된 기사로 섹션별 후보군을 다시 계산합니다.
+      (중복 기사 묶음 후 사전 점수 상위 pool_size개, 최신성 점수는 recency_half_life_hours마다 절반으로 감소)
+    - 후보군에 새로 들어온 기사만 요약하므로, 발송 시각에는 기사 선별과 한줄 평만 남습니다.
+
+    모든 결과는 실행 저장소에 기록되므로 중단된 감시도 같은 run_id로 이어서 진행할 수 있습니다.
+    """
+
+    def __init__(self, scraper, summarizer, run_store, pool_size=8, window_hours=12, recency_half_life_hours=6,
+                 per_poll_limit=20, max_workers=10, summarize_options=None):
+        """
+        :param scraper: Scrap 인스턴스
+        :param summarizer: NewsSummarizer 인스턴스
+        :param run_store: 실행 저장소 (RunStore 인스턴스)
+        :param pool_size: 섹션별 후보군 크기 (요약 대상 수)
+        :param window_hours: 이 시간보다 오래전에 작성된 기사는 후보군에서 제외
+        :param recency_half_life_hours: 후보군 점수의 최신성 점수가 절반이 되는 시간
+        :param per_poll_limit: 한 번 확인할 때 섹션별로 새로 가져올 최대 기사 수 (나머지는 다음 확인 때 수집)
+        :param max_workers: 기사 요청 스레드 수
+        :param summarize_options: NewsSummarizer.summarize_run에 넘길 추가 인자 (batch_token_budget, async_mode 등)
+        """
+        self.scraper = scraper
+        self.summarizer = summarizer
+        self.run_store = run_store
+        self.pool_size = pool_size
+        self.window_hours = window_hours
+        self.pre_ranker = PreRanker(recency_half_life_hours=recency_half_life_hours)
+        self.per_poll_limit = per_poll_limit
+        self.max_workers = max_workers
+        self.summarize_options = summarize_options or {}
+        # 이어서 진행하는 경우 이미 가져온 기사는 다시 요청하지 않음
+        # (links에는 per_poll_limit을 넘어 아직 가져오지 않은 링크와 실패한 링크도 있으므로 articles 기준)
+        self.seen = set(run_store.load_articles(["article_id"])['article_id'])
+
+    def fetch_new_articles(self):
+        """모든 섹션 페이지를 확인하고, 처음 보는 기사만 가져와 저장소에 기록하는 함수"""
+        new_links = []
+        for category, code in self.scraper.categories.items():
+            try:
+                urls = self.scraper.re_tag(code)
+            except Exception as e:
+                print(f"\033[91m섹션 페이지 요청 실패: {category} - {e}\033[0m")
+                continue
+            self.run_store.append_links(int(code), category, urls)
+            fresh = [url for url in urls if normalize_article_id(url) not in self.seen][:self.per_poll_limit]
+            self.seen.update(normalize_article_id(url) for url in fresh)
+            new_links.extend((url, int(code), category) for url in fresh)
+
+        def crawl(link):
+            url, section, section_name = link
+            try:
+                art_dic = self.scraper.art_crawl(url)
+            except Exception as e:
+                self.scraper.record_failure(url, e)
+                # 다음 확인 때 다시 시도
+                self.seen.discard(normalize_article_id(url))
+                return None
+            return {**art_dic, "section": section, "section_name": section_name}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            artdic_lst = [art_dic for art_dic in executor.map(crawl, new_links)
+                          if art_dic is not None and is_valid_article(art_dic)]
+        self.run_store.append_articles(artdic_lst)
+        return artdic_lst
+
+    def update_pool(self):
+        """최근 window_hours 안의 기사로 섹션별 후보군을 다시 계산하고 요약 대상으로 표시하는 함수"""
+        article_df = self.run_store.load_articles(["url", "section", "section_name", "title", "date", "main"])
+        # 네이버 기사 시각은 한국 시간 기준 (작성 시각을 알 수 없는 기사는 남겨 둠)
+        published = parse_naver_dates(article_df["date"])
+        cutoff = datetime.now(kst).replace(tzinfo=None) - timedelta(hours=self.window_hours)
+        article_df = article_df[published.isna() | (published >= cutoff)]
+        if article_df.empty:
+            self.run_store.replace_shortlist([])
+            return article_df
+
+        story_df = StoryClusterer().deduplicate(article_df)
+        pool_df = self.pre_ranker.shortlist(story_df, self.pool_size)
+        self.run_store.replace_shortlist(pool_df['url'])
+        return pool_df
+
+    def poll(self):
+        """섹션을 한 번 확인하여 새 기사 수집, 후보군 갱신, 새 후보 요약을 진행하는 함수"""
+        start_time = time.time()
+        artdic_lst = self.fetch_new_articles()
+        pool_df = self.update_pool()
+        # 후보군에 들어왔지만 아직 요약되지 않은 기사(새 기사, 이전에 실패한 기사)만 요약
+        summarized = set(self.run_store.load_summaries(["article_id"])['article_id'])
+        if set(pool_df['url'].map(normalize_article_id)) - summarized:
+            self.summarizer.summarize_run(self.run_store, **self.summarize_options)
+        elapsed_time = time.time() - start_time
+        print(f"\033[92m[감시] 새 기사 {len(artdic_lst)}개, 후보군 {len(pool_df)}개, "
+              f"요약 {self.run_store.count('summaries')}개 (소요 시간 {elapsed_time:.2f}초)\033[0m")
+
+    def run(self, until, interval=600):
+        """
+        until(한국 시간 datetime)까지 interval초마다 섹션을 확인하는 함수.
+        남은 시간이 interval보다 짧으면 until에 마지막으로 한 번 더 확인한 뒤 종료합니다.
+        """
+        print(f"\033[95m{until.strftime('%H:%M')}까지 {interval}초마다 새 기사를 확인합니다. "
+              f"(실행 {self.run_store.run_id})\033[0m")
+        # 감시하는 동안 커넥션 풀을 재사용하고, 끝나면 닫음
+        with self.scraper.fetcher:
+            while True:
+                next_poll = time.time() + interval
+                self.poll()
+                remaining = (until - datetime.now(kst)).total_seconds()
+                if remaining <= 0:
+                    break
+                time.sleep(max(0.0, min(next_poll - time.time(), remaining)))
+        print(f"\033[95m감시를 마쳤습니다. 요약 대상 {self.run_store.count('articles', shortlisted=1)}개\033[0m")
@@ -0,0 +1,109 @@
+import re
+import numpy as np
+import pandas as pd
+
+DATE_PATTERN = r"(\d{4})\.(\d{2})\.(\d{2})\.\s*(오전|오후)\s*(\d{1,2}):(\d{2})"
+OUTLET_PATTERN = r"/article/(\d+)/"
+TERM_PATTERN = re.compile(r"[가-힣A-Za-z0-9]{2,}")
+
+
+def parse_naver_dates(dates):
+    """'2024.08.17. 오후 3:05' 형식의 날짜 Series를 datetime Series로 변환하는 함수 (실패하면 NaT)"""
+    parts = dates.astype(str).str.extract(DATE_PATTERN)
+    hour = pd.to_numeric(parts[4], errors="coerce") % 12 + np.where(parts[3] == "오후", 12, 0)
+    return pd.to_datetime(
+        pd.DataFrame({
+            "year": pd.to_numeric(parts[0], errors="coerce"),
+            "month": pd.to_numeric(parts[1], errors="coerce"),
+            "day": pd.to_numeric(parts[2], errors="coerce"),
+            "hour": hour,
+            "minute": pd.to_numeric(parts[5], errors="coerce"),
+        }),
+        errors="coerce"
+    )
+
+
+def title_term_matrix(titles):
+    """제목들을 (기사 수 x 어휘 수) 0/1 행렬로 변환하는 함수"""
+    term_lists = [set(TERM_PATTERN.findall(str(title))) for title in titles]
+    vocabulary = {term: j for j, term in enumerate(sorted(set().union(*term_lists)))}
+    matrix = np.zeros((len(term_lists), len(vocabulary)), dtype=np.float32)
+    for i, terms in enumerate(term_lists):
+        matrix[i, [vocabulary[term] for term in terms]] = 1.0
+    return matrix
+
+
+class PreRanker:
+    """
+    요약 전에 스크래핑 데이터만으로 기사의 중요도를 추정하는 로컬 점수기.
+    네트워크 호출 없이 NumPy/pandas 벡터 연산으로 계산하며, 섹션별 상위 K개만 요약/선별 단계로 넘깁니다.
+
+    점수 요소 (섹션 내 백분위로 정규화 후 가중합):
+    - length: 본문 길이
+    - term_overlap: 제목 단어가 다른 언론사 제목에도 등장하는 정도
+    - coverage: 같은 사건을 다룬 언론사 수 (cluster_size 컬럼이 있으면 그 값을 사용)
+    - recency: 기사 작성 시각의 최신성
+    """
+
+    DEFAULT_WEIGHTS = {"length": 0.15, "term_overlap": 0.3, "coverage": 0.35, "recency": 0.2}
+
+    def __init__(self, weights=None, min_shared_terms=2, recency_half_life_hours=6):
+        """
+        :param weights: 점수 요소별 가중치 딕셔너리 (None이면 DEFAULT_WEIGHTS)
+        :param min_shared_terms: 같은 사건으로 볼 제목 공통 단어 수
+        :param recency_half_life_hours: 최신성 점수가 절반이 되는 시간
+        """
+        self.weights = weights or self.DEFAULT_WEIGHTS
+        self.min_shared_terms = min_shared_terms
+        self.recency_half_life_hours = recency_half_life_hours
+
+    def features(self, df):
+        """기사별 점수 요소를 계산하여 DataFrame으로 반환하는 함수"""
+        features = pd.DataFrame(index=df.index)
+        features["length"] = np.log1p(df["main"].astype(str).str.len())
+
+        outlets = df["url"].astype(str).str.extract(OUTLET_PATTERN)[0].fillna(df["url"].astype(str))
+        outlet_onehot = pd.get_dummies(outlets).to_numpy(dtype=np.float32)  # (기사 수 x 언론사 수)
+        own_outlet = outlet_onehot.astype(bool)
+
+        terms = title_term_matrix(df["title"])  # (기사 수 x 어휘 수)
+        term_counts = terms.sum(axis=1)
+
+        # 단어별로 그 단어를 제목에 쓴 언론사 수 → 기사 제목 단어들의 평균 (자기 언론사 제외)
+        outlets_per_term = ((terms.T @ outlet_onehot) > 0).sum(axis=1)
+        features["term_overlap"] = np.divide(
+            terms @ np.maximum(outlets_per_term - 1, 0), term_counts,
+            out=np.zeros(len(df)), where=term_counts > 0
+        )
+
+        if "cluster_size" in df.columns:
+            features["coverage"] = df["cluster_size"].to_numpy(dtype=np.float32)
+        else:
+            # 공통 제목 단어가 min_shared_terms개 이상인 기사를 같은 사건으로 보고, 다룬 언론사 수를 셉니다.
+            same_story = (terms @ terms.T) >= self.min_shared_terms
+            story_outlets = (same_story.astype(np.float32) @ outlet_onehot) > 0
+            features["coverage"] = (story_outlets & ~own_outlet).sum(axis=1) + 1
+
+        published = parse_naver_dates(df["date"])
+        age_hours = (published.max() - published).dt.total_seconds() / 3600
+        features["recency"] = np.exp2(-age_hours / self.recency_half_life_hours).fillna(0.0)
+        return features
+
+    def score(self, df):
+        """섹션 내 백분위로 정규화한 점수 요소의 가중합을 'pre_score' 컬럼으로 추가하는 함수"""
+        features = self.features(df)
+        percentiles = features.groupby(df["section"]).rank(pct=True)
+        scored = df.copy()
+        scored["pre_score"] = sum(percentiles[name] * weight for name, weight in self.weights.items())
+        return scored
+
+    def shortlist(self, df, top_k):
+        """섹션별로 pre_score 상위 top_k개의 기사만 남기는 함수"""
+        if df.empty:
+            return df
+        scored = self.score(df)
+        shortlisted = (scored.sort_values("pre_score", ascending=False)
+                       .groupby("section", sort=False).head(top_k)
+                       .sort_values(["section", "pre_score"], ascending=[True, False]))
+        print(f"사전 점수로 {len(df)}개 중 {len(shortlisted)}개의 기사를 요약 대상으로 선정했습니다.")
+        return shortlisted
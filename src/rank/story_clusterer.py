@@ -0,0 +1,115 @@
+import re
+import numpy as np
+import pandas as pd
+
+MINHASH_PRIME = np.uint64(4294967311)  # 2^32보다 큰 소수
+MAX_HASH = np.uint64(0xFFFFFFFF)
+
+
+def shingle_hashes(text, size=5):
+    """
+    공백을 제거한 본문의 문자 size-gram들을 32비트 해시 배열로 변환하는 함수.
+    유니코드 코드포인트에 대한 다항식 롤링 해시를 NumPy로 한 번에 계산합니다.
+    """
+    normalized = re.sub(r"\s+", "", str(text))
+    codepoints = np.frombuffer(normalized.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    if len(codepoints) == 0:
+        return codepoints
+    if len(codepoints) < size:
+        size = len(codepoints)
+
+    hashes = np.zeros(len(codepoints) - size + 1, dtype=np.uint64)
+    for offset in range(size):
+        hashes = (hashes * np.uint64(1000003) + codepoints[offset:len(codepoints) - size + 1 + offset]) & MAX_HASH
+    return np.unique(hashes)
+
+
+class StoryClusterer:
+    """
+    MinHash + LSH 밴딩으로 섹션 내에서 거의 같은 본문(여러 언론사에 실린 같은 사건 기사)을 묶는 클래스.
+    기사 쌍을 모두 비교하지 않고 같은 밴드 버킷에 들어간 후보만 확인하므로 기사 수에 거의 선형으로 동작합니다.
+    기사를 하나씩 추가(add)할 수 있어 스트리밍 처리에도 사용할 수 있습니다.
+    """
+
+    def __init__(self, num_perm=64, bands=16, threshold=0.5, shingle_size=5, seed=7):
+        """
+        :param num_perm: MinHash 서명 길이
+        :param bands: LSH 밴드 수 (num_perm의 약수)
+        :param threshold: 같은 사건으로 볼 추정 Jaccard 유사도
+        :param shingle_size: 문자 shingle 크기
+        :param seed: 해시 함수 생성 시드
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, 2 ** 31, size=(num_perm, 1), dtype=np.uint64)
+        self.b = rng.integers(0, 2 ** 31, size=(num_perm, 1), dtype=np.uint64)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+
+        self.signatures = {}
+        self.buckets = {}
+        self.parent = {}
+
+    def signature(self, text):
+        """본문의 MinHash 서명 (shingle이 없으면 None)"""
+        shingles = shingle_hashes(text, self.shingle_size)
+        if len(shingles) == 0:
+            return None
+        return ((self.a * shingles + self.b) % MINHASH_PRIME & MAX_HASH).min(axis=1)
+
+    def find(self, key):
+        while self.parent[key] != key:
+            self.parent[key] = self.parent[self.parent[key]]
+            key = self.parent[key]
+        return key
+
+    def add(self, key, text, section=None):
+        """
+        기사를 추가하고, 이미 추가된 기사 중 같은 사건으로 묶인 클러스터의 대표 키를 반환하는 함수.
+        :param key: 기사 식별자 (DataFrame 인덱스 등)
+        :param section: 섹션 코드 (같은 섹션 안에서만 묶음)
+        """
+        self.parent[key] = key
+        signature = self.signature(text)
+        if signature is None or str(text) == "N/A":
+            return key
+        self.signatures[key] = signature
+
+        for band in range(self.bands):
+            band_key = (section, band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            candidates = self.buckets.setdefault(band_key, [])
+            for other in candidates:
+                if self.find(other) == self.find(key):
+                    continue
+                similarity = np.mean(self.signatures[other] == signature)
+                if similarity >= self.threshold:
+                    self.parent[self.find(key)] = self.find(other)
+            candidates.append(key)
+        return self.find(key)
+
+    def cluster(self, df):
+        """
+        DataFrame의 모든 기사를 묶어 'cluster_id'(대표 기사 인덱스)와 'cluster_size' 컬럼을 추가하는 함수.
+        대표 기사는 클러스터에서 본문이 가장 긴 기사입니다.
+        """
+        for key, row in df.iterrows():
+            self.add(key, row["main"], row.get("section"))
+
+        clustered = df.copy()
+        roots = pd.Series([self.find(key) for key in df.index], index=df.index)
+        lengths = df["main"].astype(str).str.len()
+        clustered["cluster_id"] = lengths.groupby(roots).transform("idxmax")
+        clustered["cluster_size"] = roots.map(roots.value_counts())
+        return clustered
+
+    def deduplicate(self, df):
+        """클러스터마다 대표 기사 한 건만 남기는 함수 (cluster_size 컬럼 유지)"""
+        if df.empty:
+            return df
+        clustered = self.cluster(df)
+        representatives = clustered[clustered.index == clustered["cluster_id"]]
+        print(f"중복 기사 묶음: {len(df)}개의 기사를 {len(representatives)}개의 사건으로 묶었습니다.")
+        return representatives
@@ -0,0 +1,157 @@
+import re
+import sqlite3
+import threading
+import time
+
+ARTICLE_ID_PATTERN = re.compile(r"/mnews/article/(\d+)/(\d+)")
+
+
+def normalize_article_id(url):
+    """
+    네이버 기사 URL에서 '<oid>/<aid>' 형태의 기사 ID를 추출하는 함수.
+    쿼리스트링이나 경로 변형(/mnews/article/<oid>/<aid>?sid=100 등)과 무관하게 같은 ID를 반환합니다.
+    """
+    match = ARTICLE_ID_PATTERN.search(url)
+    if match:
+        return f"{match.group(1)}/{match.group(2)}"
+    return url.split("?")[0].split("#")[0].rstrip("/")
+
+
+class ArticleCache:
+    """
+    기사 ID를 키로 파싱된 제목, 날짜, 본문을 저장하는 SQLite 기반 디스크 캐시.
+    ttl 이내의 항목은 요청 없이 사용하고, ttl이 지난 항목은 ETag/Last-Modified로 조건부 재검증합니다.
+    """
+
+    def __init__(self, db_path, ttl=6 * 3600, max_age=7 * 24 * 3600, max_entries=20000):
+        """
+        :param db_path: SQLite 파일 경로
+        :param ttl: 재검증 없이 캐시를 그대로 사용하는 시간(초)
+        :param max_age: 이 시간(초)보다 오래 갱신되지 않은 항목은 삭제
+        :param max_entries: 최대 보관 항목 수 (초과 시 오래 사용되지 않은 항목부터 삭제)
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.stale = 0
+        self.revalidated = 0
+        self.misses = 0
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS articles (
+                article_id TEXT PRIMARY KEY,
+                title TEXT,
+                date TEXT,
+                main TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL,
+                accessed_at REAL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_accessed_at ON articles (accessed_at)")
+        self.conn.commit()
+
+    def lookup(self, url):
+        """
+        캐시 항목을 조회하는 함수.
+        :return: 항목 딕셔너리(fresh 여부 포함) 또는 None
+        """
+        article_id = normalize_article_id(url)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT title, date, main, etag, last_modified, fetched_at FROM articles WHERE article_id = ?",
+                (article_id,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            now = time.time()
+            title, date, main, etag, last_modified, fetched_at = row
+            fresh = now - fetched_at < self.ttl
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale += 1
+            self.conn.execute("UPDATE articles SET accessed_at = ? WHERE article_id = ?", (now, article_id))
+            self.conn.commit()
+
+        return {
+            "title": title,
+            "date": date,
+            "main": main,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh": fresh,
+        }
+
+    @staticmethod
+    def conditional_headers(entry):
+        """재검증 요청에 사용할 조건부 헤더를 만드는 함수"""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    @staticmethod
+    def to_article(entry, url):
+        """캐시 항목을 art_crawl과 같은 형태의 딕셔너리로 변환하는 함수"""
+        return {"title": entry["title"], "date": entry["date"], "main": entry["main"], "url": url}
+
+    def store(self, url, art_dic, etag=None, last_modified=None):
+        """파싱된 기사를 캐시에 저장하는 함수"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                """
+                INSERT OR REPLACE INTO articles
+                    (article_id, title, date, main, etag, last_modified, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (normalize_article_id(url), art_dic["title"], art_dic["date"], art_dic["main"],
+                 etag, last_modified, now, now)
+            )
+            self.conn.commit()
+
+    def touch(self, url):
+        """304 Not Modified 응답을 받은 항목의 갱신 시각을 연장하는 함수"""
+        with self.lock:
+            self.revalidated += 1
+            self.conn.execute(
+                "UPDATE articles SET fetched_at = ? WHERE article_id = ?",
+                (time.time(), normalize_article_id(url))
+            )
+            self.conn.commit()
+
+    def evict(self):
+        """max_age보다 오래된 항목과 max_entries를 넘는 항목을 삭제하는 함수"""
+        with self.lock:
+            self.conn.execute("DELETE FROM articles WHERE fetched_at < ?", (time.time() - self.max_age,))
+            self.conn.execute(
+                """
+                DELETE FROM articles WHERE article_id IN (
+                    SELECT article_id FROM articles ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            )
+            self.conn.commit()
+
+    def close(self):
+        """캐시를 정리하고 연결을 닫는 함수"""
+        self.evict()
+        self.conn.close()
+
+    def stats_message(self):
+        return (f"기사 캐시 - 적중: {self.hits}, 만료: {self.stale} (그 중 304 재사용: {self.revalidated}), "
+                f"미스: {self.misses}")
@@ -0,0 +1,263 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+import aiohttp
+import requests
+from src.util.metrics import metrics
+
+
+class RetryableStatus(Exception):
+    """재시도할 5xx 응답"""
+
+    def __init__(self, status, response):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.response = response
+
+
+class Fetcher:
+    """
+    Scrap의 모든 HTTP 요청이 거치는 요청 계층.
+
+    - 연결/읽기 타임아웃: 멈춘 연결 하나가 작업자를 계속 붙잡지 않도록 합니다.
+    - 재시도: 5xx 응답, 연결 오류, 타임아웃은 지터를 더한 지수 백오프로 max_attempts번까지 시도합니다.
+    - hedge=True이면 지금까지 관측된 p95 지연 시간(헤지 대기 시간)을 기준으로 느린 요청을 다시 보냅니다.
+      소수의 느린 요청이 전체 소요 시간을 좌우하는 문제를 줄입니다.
+      - 비동기 요청 (헤지 요청): 원래 요청은 그대로 두고 같은 요청을 추가로 보낸 뒤 먼저 끝난 응답을 사용
+        (http_hedges_total)
+      - 동기 요청 (멈춘 요청 재요청): 두 요청을 경쟁시키지 않습니다. 호출한 스레드에서 요청하되 읽기 타임아웃을
+        헤지 대기 시간으로 줄여, 그동안 응답 바이트가 하나도 오지 않으면 그 연결을 버리고 같은 요청을 다시 보냄
+        (http_stall_retries_total). 바이트가 조금씩이라도 오는 느린 응답은 끊지 않습니다.
+
+    URL별 결과(상태 코드, 시도 횟수, 헤지 여부, 소요 시간, 오류)를 기록하며 report()로 요약합니다.
+    with 문으로 사용하면 끝날 때 커넥션 풀을 닫습니다.
+    """
+
+    def __init__(self, connect_timeout=3.05, read_timeout=10, max_attempts=3, max_backoff=4, hedge=True,
+                 hedge_quantile=0.95, hedge_min_samples=20, min_hedge_delay=0.2, initial_hedge_delay=2.0, pool_size=32):
+        """
+        :param connect_timeout: 연결 타임아웃(초)
+        :param read_timeout: 읽기 타임아웃(초, 응답 바이트 사이의 최대 대기 시간)
+        :param max_attempts: URL당 최대 시도 횟수
+        :param max_backoff: 재시도 대기 시간의 상한(초)
+        :param hedge: 느린 요청에 헤지 요청(동기 요청은 멈춘 요청 재요청)을 보낼지 여부
+        :param hedge_quantile: 이 백분위의 지연 시간을 넘으면 헤지 요청(동기 요청은 재요청)을 보냄
+        :param hedge_min_samples: 헤지 기준을 계산하기 위한 최소 관측 수
+        :param min_hedge_delay: 헤지 요청을 보내기 전 최소 대기 시간(초)
+        :param initial_hedge_delay: 관측 수가 hedge_min_samples보다 적을 때 사용할 헤지 대기 시간(초)
+        :param pool_size: 동기 요청의 커넥션 풀 크기
+        """
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_attempts = max_attempts
+        self.max_backoff = max_backoff
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.min_hedge_delay = min_hedge_delay
+        self.initial_hedge_delay = initial_hedge_delay
+        self.pool_size = pool_size
+        self.lock = threading.Lock()
+        self.latencies = {}  # {대상: 최근 지연 시간들}
+        self.outcomes = {}  # {URL: 결과 딕셔너리}
+        self.session = None
+
+    def backoff(self, attempt):
+        """지터를 더한 지수 백오프 대기 시간(초)"""
+        return random.uniform(0, min(0.5 * 2 ** attempt, self.max_backoff))
+
+    def hedge_delay(self, target):
+        """헤지 요청(동기 요청은 재요청)을 보내기 전까지 기다릴 시간(초), 헤지하지 않으면 None"""
+        if not self.hedge:
+            return None
+        with self.lock:
+            samples = sorted(self.latencies.get(target, ()))
+        # 실행 초반 동시에 시작되는 요청들은 관측값이 쌓이기 전이므로 보수적인 고정 대기 시간을 사용
+        if len(samples) < self.hedge_min_samples:
+            return self.initial_hedge_delay
+        return max(self.min_hedge_delay, samples[int(self.hedge_quantile * (len(samples) - 1))])
+
+    def observe(self, target, elapsed, status=None, size=0):
+        """요청 한 번의 지연 시간, 상태 코드, 내려받은 바이트 수를 기록"""
+        with self.lock:
+            self.latencies.setdefault(target, deque(maxlen=200)).append(elapsed)
+        metrics.observe("http_request_duration_seconds", elapsed, target=target)
+        if status is not None:
+            metrics.inc("http_requests_total", target=target, status=status)
+            metrics.inc("http_bytes_total", size, target=target)
+
+    def record_outcome(self, url, target, start_time, attempts, hedged, status=None, error=None, stall_retried=False):
+        outcome = "ok" if error is None and attempts == 1 else "retried" if error is None else "failed"
+        metrics.inc("http_fetch_outcomes_total", target=target, outcome=outcome)
+        with self.lock:
+            self.outcomes[url] = {
+                "target": target, "outcome": outcome, "status": status, "attempts": attempts, "hedged": hedged,
+                "stall_retried": stall_retried,
+                "seconds": round(time.perf_counter() - start_time, 3),
+                "error": None if error is None else f"{type(error).__name__}: {error}",
+            }
+
+    # 동기 요청 (thread/process 모드)
+
+    def send(self, url, headers, target, read_timeout=None):
+        start_time = time.perf_counter()
+        response = self.session.get(url, headers=headers,
+                                    timeout=(self.connect_timeout, read_timeout or self.read_timeout))
+        self.observe(target, time.perf_counter() - start_time, response.status_code, len(response.content))
+        if response.status_code >= 500:
+            raise RetryableStatus(response.status_code, response)
+        return response
+
+    def send_retrying_stalled(self, url, headers, target):
+        """
+        호출한 스레드에서 요청을 보내되, 헤지 대기 시간 동안 응답 바이트가 오지 않으면 그 요청을 버리고 다시 보내는 함수.
+        헤지 요청과 달리 두 요청이 동시에 진행되지 않습니다.
+        :return: (응답, 재요청 여부)
+        """
+        delay = self.hedge_delay(target)
+        if delay is None or delay >= self.read_timeout:
+            return self.send(url, headers, target), False
+
+        start_time = time.perf_counter()
+        try:
+            return self.send(url, headers, target, read_timeout=delay), False
+        except requests.ReadTimeout:
+            # 버린 요청의 대기 시간도 지연 시간 분포에 반영 (기준이 너무 낮아지지 않도록)
+            self.observe(target, time.perf_counter() - start_time)
+        metrics.inc("http_stall_retries_total", target=target)
+        return self.send(url, headers, target), True
+
+    def get(self, url, headers=None, target="article"):
+        """
+        재시도와 멈춘 요청 재요청을 적용하여 GET 요청을 보내는 함수.
+        재시도 후에도 5xx이면 마지막 응답을 반환하고, 연결 오류나 타임아웃이면 마지막 예외를 발생시킵니다.
+        """
+        self.open()
+        start_time = time.perf_counter()
+        stall_retried = False
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                response, was_stalled = self.send_retrying_stalled(url, headers, target)
+                stall_retried = stall_retried or was_stalled
+            except (requests.ConnectionError, requests.Timeout, RetryableStatus) as e:
+                if attempt == self.max_attempts:
+                    self.record_outcome(url, target, start_time, attempt, False, getattr(e, "status", None), e,
+                                        stall_retried=stall_retried)
+                    if isinstance(e, RetryableStatus):
+                        return e.response
+                    raise
+                metrics.inc("http_retries_total", target=target, reason=type(e).__name__)
+                time.sleep(self.backoff(attempt))
+            else:
+                self.record_outcome(url, target, start_time, attempt, False, response.status_code,
+                                    stall_retried=stall_retried)
+                return response
+
+    def open(self):
+        """커넥션 풀을 처음 사용할 때 생성"""
+        if self.session is not None:
+            return
+        with self.lock:
+            if self.session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self.session = session
+
+    def close(self):
+        """커넥션 풀을 닫는 함수 (다시 요청하면 새로 생성)"""
+        with self.lock:
+            if self.session is not None:
+                self.session.close()
+                self.session = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # 비동기 요청 (async 모드)
+
+    def client_timeout(self):
+        return aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout)
+
+    async def asend(self, session, url, headers, target):
+        start_time = time.perf_counter()
+        async with session.get(url, headers=headers, timeout=self.client_timeout()) as response:
+            content = await response.read()
+        self.observe(target, time.perf_counter() - start_time, response.status, len(content))
+        if response.status >= 500:
+            raise RetryableStatus(response.status, (response, content))
+        return response, content
+
+    async def asend_hedged(self, session, url, headers, target):
+        """
+        요청이 헤지 대기 시간 안에 끝나지 않으면 같은 요청을 하나 더 보내고, 먼저 성공한 응답을 사용하는 함수
+        (나머지 요청은 취소)
+        :return: ((응답 객체, 응답 본문 bytes), 헤지 여부)
+        """
+        delay = self.hedge_delay(target)
+        if delay is None:
+            return await self.asend(session, url, headers, target), False
+
+        tasks = {asyncio.ensure_future(self.asend(session, url, headers, target))}
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        hedged = not done
+        if hedged:
+            metrics.inc("http_hedges_total", target=target)
+            tasks.add(asyncio.ensure_future(self.asend(session, url, headers, target)))
+        error = None
+        try:
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        return task.result(), hedged
+                    except Exception as e:
+                        error = e
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def aget(self, session, url, headers=None, target="article"):
+        """
+        get의 비동기 버전 (aiohttp 세션 사용)
+        :return: (응답 객체, 응답 본문 bytes)
+        """
+        start_time = time.perf_counter()
+        hedged = False
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                (response, content), was_hedged = await self.asend_hedged(session, url, headers, target)
+                hedged = hedged or was_hedged
+            except (aiohttp.ClientError, asyncio.TimeoutError, RetryableStatus) as e:
+                if attempt == self.max_attempts:
+                    self.record_outcome(url, target, start_time, attempt, hedged, getattr(e, "status", None), e)
+                    if isinstance(e, RetryableStatus):
+                        return e.response
+                    raise
+                metrics.inc("http_retries_total", target=target, reason=type(e).__name__)
+                await asyncio.sleep(self.backoff(attempt))
+            else:
+                self.record_outcome(url, target, start_time, attempt, hedged, response.status)
+                return response, content
+
+    def report(self, top=5):
+        """URL별 결과를 요약한 문자열 (결과별 개수, 헤지 수, 멈춘 요청 재요청 수, 가장 느린 URL)"""
+        with self.lock:
+            outcomes = list(self.outcomes.items())
+        counts = {}
+        for _, outcome in outcomes:
+            counts[outcome["outcome"]] = counts.get(outcome["outcome"], 0) + 1
+        hedged = sum(outcome["hedged"] for _, outcome in outcomes)
+        stall_retried = sum(outcome["stall_retried"] for _, outcome in outcomes)
+        lines = [f"요청 결과 - 성공: {counts.get('ok', 0)}, 재시도 후 성공: {counts.get('retried', 0)}, "
+                 f"실패: {counts.get('failed', 0)}, 헤지 요청: {hedged}, 멈춘 요청 재요청: {stall_retried}"]
+        slowest = sorted(outcomes, key=lambda item: item[1]["seconds"], reverse=True)[:top]
+        lines.extend(f"    {outcome['seconds']:6.2f}초  {outcome['outcome']:7}  {url}" for url, outcome in slowest)
+        return "\n".join(lines)
@@ -0,0 +1,81 @@
+import threading
+import time
+from lxml import etree
+from lxml import html as lxml_html
+
+ARTICLE_PREFIX = "https://n.news.naver.com/mnews/article/"
+
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# 셀렉터는 모듈 로드 시 한 번만 컴파일합니다.
+HREF_XPATH = etree.XPath("//a/@href")
+TITLE_XPATH = etree.XPath(f"//h2[{_has_class('media_end_head_headline')}]")
+DATE_XPATH = etree.XPath(f"//*[{_has_class('media_end_head_info_datestamp_time')}]")
+MAIN_XPATH = etree.XPath("//*[@id='dic_area']")
+TEXT_XPATH = etree.XPath(".//text()[not(ancestor::script) and not(ancestor::style)]")
+
+# lxml 파서 객체는 스레드 간에 공유하지 않습니다.
+_local = threading.local()
+
+
+def _parser(encoding):
+    parsers = getattr(_local, "parsers", None)
+    if parsers is None:
+        parsers = _local.parsers = {}
+    if encoding not in parsers:
+        parsers[encoding] = lxml_html.HTMLParser(encoding=encoding)
+    return parsers[encoding]
+
+
+def parse_tree(html_content, encoding="utf-8"):
+    """
+    HTML(str 또는 bytes)을 lxml 트리로 한 번만 파싱하는 함수.
+    빈 문서이면 None을 반환합니다.
+    """
+    if isinstance(html_content, str):
+        html_content = html_content.encode(encoding)
+    if not html_content.strip():
+        return None
+    return lxml_html.document_fromstring(html_content, parser=_parser(encoding))
+
+
+def element_text(element):
+    """BeautifulSoup의 get_text(strip=True)와 같은 방식으로 요소의 텍스트를 추출하는 함수"""
+    return "".join(text.strip() for text in TEXT_XPATH(element))
+
+
+def extract_links(html_content, prefix=ARTICLE_PREFIX, encoding="utf-8"):
+    """섹션 페이지에서 댓글 링크를 제외한 기사 링크들을 리스트로 추출하는 함수"""
+    tree = parse_tree(html_content, encoding)
+    if tree is None:
+        return []
+    return [str(href) for href in HREF_XPATH(tree) if href.startswith(prefix) and "/comment/" not in href]
+
+
+def extract_article(html_content, encoding="utf-8"):
+    """
+    기사 페이지를 한 번 파싱하고 각 셀렉터를 한 번씩만 평가하여 제목, 날짜, 본문을 추출하는 함수.
+    요소가 없으면 'N/A'를 반환합니다.
+    """
+    tree = parse_tree(html_content, encoding)
+    if tree is None:
+        return {"title": "N/A", "date": "N/A", "main": "N/A"}
+
+    fields = {}
+    for field, xpath in (("title", TITLE_XPATH), ("date", DATE_XPATH), ("main", MAIN_XPATH)):
+        elements = xpath(tree)
+        fields[field] = element_text(elements[0]) if elements else 'N/A'
+    return fields
+
+
+def timed_extract_article(html_bytes, encoding="utf-8"):
+    """
+    프로세스 풀 파싱 단계에서 사용하는 함수.
+    원문 bytes에서 기사 필드를 추출하고, 파싱에 걸린 시간(초)을 함께 반환합니다.
+    """
+    start_time = time.perf_counter()
+    fields = extract_article(html_bytes, encoding)
+    return fields, time.perf_counter() - start_time
@@ -1,68 +1,211 @@
 import os
-import requests
-from bs4 import BeautifulSoup
+import time
+import queue
+import asyncio
+import threading
+import aiohttp
+from src.scrap.html_extract import extract_links, extract_article, timed_extract_article, ARTICLE_PREFIX
+from src.scrap.article_cache import normalize_article_id
+from src.scrap.fetcher import Fetcher
+from src.util.metrics import metrics
 import pandas as pd
 from tqdm import tqdm
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+
+class SectionBudget:
+    """
+    섹션별 기사 수집 한도를 관리하는 클래스.
+    한도가 채워지면 더 이상 기사를 요청하지 않고, 실패하거나 N/A인 기사는 남은 링크로 대체합니다.
+    이미 다른 섹션에서 요청한 기사는 건너뛰므로 같은 기사를 두 번 가져오지 않습니다.
+    """
+
+    def __init__(self, urls, limit=None, claimed=None):
+        """
+        :param urls: 섹션의 기사 링크 리스트
+        :param limit: 섹션별 최대 기사 수 (None이면 모든 링크를 수집)
+        :param claimed: 모든 섹션이 공유하는, 이미 요청한 기사 ID 집합
+        """
+        self.claimed = claimed if claimed is not None else set()
+        self.pending = (url for url in urls if self.claim(url))
+        self.limit = limit
+        self.accepted = 0
+
+    def claim(self, url):
+        """아직 어떤 섹션도 요청하지 않은 기사이면 이 섹션이 가져가는 함수"""
+        article_id = normalize_article_id(url)
+        if article_id in self.claimed:
+            return False
+        self.claimed.add(article_id)
+        return True
+
+    def initial_urls(self):
+        """처음에 요청할 링크들을 반환하는 함수"""
+        if self.limit is None:
+            return list(self.pending)
+        return list(islice(self.pending, self.limit))
+
+    def accept(self, art_dic):
+        """크롤링 결과를 섹션에 포함할지 판단하는 함수"""
+        if art_dic is None:
+            return False
+        if self.limit is not None and not is_valid_article(art_dic):
+            return False
+        self.accepted += 1
+        return True
+
+    def replacement_url(self):
+        """실패한 기사를 대체할 다음 링크를 반환하는 함수 (없으면 None)"""
+        if self.limit is None:
+            return None
+        return next(self.pending, None)
+
+
+def index_section_links(url_index, section, section_name, urls):
+    """
+    기사 ID → [(섹션 코드, 섹션 이름), ...] 인덱스에 섹션의 링크들을 추가하는 함수.
+    여러 섹션에 링크된 기사는 모든 섹션이 기록됩니다.
+    """
+    for url in urls:
+        memberships = url_index.setdefault(normalize_article_id(url), [])
+        if (section, section_name) not in memberships:
+            memberships.append((section, section_name))
+
+
+def annotate_sections(artdic_lst, url_index):
+    """기사가 링크된 모든 섹션 코드를 'sections' 컬럼(쉼표로 구분)으로 기록하는 함수"""
+    for art_dic in artdic_lst:
+        memberships = url_index.get(normalize_article_id(art_dic["url"]), [])
+        art_dic["sections"] = ",".join(str(section) for section, _ in memberships)
+    return artdic_lst
+
+
+def is_valid_article(art_dic):
+    """제목과 본문이 모두 추출된 기사인지 확인하는 함수"""
+    return art_dic.get("title", "N/A") != "N/A" and art_dic.get("main", "N/A") != "N/A"
+
+
+class StageStats:
+    """파이프라인 단계별 처리량을 집계하는 클래스"""
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.busy_time = 0.0
+        self.bytes = 0
+        self.started_at = None
+        self.finished_at = None
+        self.lock = threading.Lock()
+
+    def add(self, elapsed, size=0):
+        now = time.perf_counter()
+        with self.lock:
+            if self.started_at is None:
+                self.started_at = now - elapsed
+            self.finished_at = now
+            self.count += 1
+            self.busy_time += elapsed
+            self.bytes += size
+
+    def report(self):
+        if not self.count:
+            return f"[{self.name}] 처리한 페이지 없음"
+        wall_time = max(self.finished_at - self.started_at, 1e-9)
+        return (f"[{self.name}] {self.count} pages, {self.bytes / 1024:.0f} KB, "
+                f"평균 {self.busy_time / self.count * 1000:.1f} ms/page, 처리량 {self.count / wall_time:.1f} pages/sec")
+
 
 class Scrap:
     HEADERS = {"User-Agent": "Mozilla/5.0"}
+    SECTION_URL = "https://news.naver.com/main/main.naver?mode=LSD&mid=shm&sid1={sid}"
 
-    def __init__(self, categories, output_csv):
+    def __init__(self, categories, output_csv, per_section_limit=None, cache=None, run_store=None,
+                 section_url=None, article_prefix=ARTICLE_PREFIX, fetcher=None):
         """
         :param categories: 카테고리와 카테고리 코드를 포함하는 딕셔너리
-        :param output_csv: 결과를 저장할 CSV 파일 경로
+        :param output_csv: 결과를 저장할 CSV 파일 경로 (None이면 저장하지 않음)
+        :param per_section_limit: 섹션별로 수집할 최대 기사 수 (None이면 제한 없음)
+        :param cache: 기사 캐시 (ArticleCache 인스턴스, None이면 캐시 사용 안 함)
+        :param run_store: 링크와 기사를 기록할 실행 저장소 (RunStore 인스턴스, None이면 기록 안 함)
+        :param section_url: {sid} 자리에 섹션 코드가 들어가는 섹션 페이지 URL (None이면 네이버 뉴스, 벤치마크용)
+        :param article_prefix: 섹션 페이지에서 수집할 기사 링크의 접두사
+        :param fetcher: 타임아웃, 재시도, 헤지 요청을 적용하는 요청 계층 (None이면 기본 설정의 Fetcher)
         """
         self.categories = categories
         self.output_csv = output_csv
+        self.per_section_limit = per_section_limit
+        self.cache = cache
+        self.run_store = run_store
+        self.section_url = section_url or self.SECTION_URL
+        self.article_prefix = article_prefix
+        self.fetcher = fetcher or Fetcher()
 
-    def ex_tag(self, html_content):
-        """HTML에서 기사 링크들을 리스트로 추출하는 함수"""
-        soup = BeautifulSoup(html_content, "html.parser")
-        a_tags = soup.find_all("a", href=True)
+    def index_links(self, url_index, section, section_name, urls):
+        """섹션의 링크들을 기사 ID 인덱스에 추가하고, 실행 저장소가 있으면 함께 기록하는 함수"""
+        index_section_links(url_index, section, section_name, urls)
+        if self.run_store is not None:
+            self.run_store.append_links(section, section_name, urls)
 
-        tag_lst = []
-        for a in a_tags:
-            href = a["href"]
-            if href.startswith("https://n.news.naver.com/mnews/article/") and "/comment/" not in href:
-                tag_lst.append(href)
+    def record_failure(self, url, error):
+        """요청이나 파싱에 실패한 기사를 출력하고, 실행 저장소가 있으면 failures 테이블에 기록하는 함수"""
+        print(f"Error scraping article: {url} - {error}")
+        if self.run_store is not None:
+            self.run_store.record_failures("scrape", [normalize_article_id(url)], error)
 
-        return tag_lst
+    def ex_tag(self, html_content):
+        """HTML에서 기사 링크들을 리스트로 추출하는 함수"""
+        return extract_links(html_content, self.article_prefix)
 
     def fetch_category_html(self, sid):
         """주어진 섹션의 HTML 콘텐츠를 가져오는 함수"""
-        url = f"https://news.naver.com/main/main.naver?mode=LSD&mid=shm&sid1={sid}"
-        response = requests.get(url, headers=self.HEADERS)
+        url = self.section_url.format(sid=sid)
+        response = self.fetcher.get(url, headers=self.HEADERS, target="section")
         return response.text
 
     def re_tag(self, sid):
-        """특정 분야의 뉴스 링크를 수집하여 중복 제거한 리스트로 변환하는 함수"""
+        """특정 분야의 뉴스 링크를 수집하여 중복 제거한 리스트로 변환하는 함수 (페이지에 나온 순서 유지)"""
         html_content = self.fetch_category_html(sid)
         re_lst = self.ex_tag(html_content)
-        re_set = set(re_lst)
-        re_lst = list(re_set)
-        return re_lst
+        return list(dict.fromkeys(re_lst))
 
     def art_crawl(self, url):
         """기사를 크롤링하여 제목, 날짜, 본문을 추출하는 함수"""
-        art_dic = {}
+        cached, html = self.fetch_article(url)
+        if cached is not None:
+            return cached
 
-        title_selector = "h2.media_end_head_headline"
-        date_selector = ".media_end_head_info_datestamp_time"
-        main_selector = "#dic_area"
+        art_dic = self.parse_article(html.text, url)
+        self.store_in_cache(url, art_dic, html.headers)
+        return art_dic
 
-        html = requests.get(url, headers=self.HEADERS)
-        soup = BeautifulSoup(html.text, "html.parser")
+    def fetch_article(self, url):
+        """
+        기사 페이지를 가져오는 함수 (파싱은 하지 않음)
+        :return: (캐시에서 가져온 기사 딕셔너리 또는 None, 응답 객체 또는 None)
+        """
+        entry = self.cache.lookup(url) if self.cache else None
+        if entry and entry["fresh"]:
+            return self.cache.to_article(entry, url), None
 
-        title = soup.select_one(title_selector).get_text(strip=True) if soup.select_one(title_selector) else 'N/A'
-        date = soup.select_one(date_selector).get_text(strip=True) if soup.select_one(date_selector) else 'N/A'
-        main = soup.select_one(main_selector).get_text(strip=True) if soup.select_one(main_selector) else 'N/A'
+        headers = {**self.HEADERS, **self.cache.conditional_headers(entry)} if entry else self.HEADERS
+        html = self.fetcher.get(url, headers=headers, target="article")
+        if entry and html.status_code == 304:
+            self.cache.touch(url)
+            return self.cache.to_article(entry, url), None
+        return None, html
 
-        art_dic["title"] = title
-        art_dic["date"] = date
-        art_dic["main"] = main
-        art_dic["url"] = url
+    def store_in_cache(self, url, art_dic, response_headers):
+        """정상적으로 파싱된 기사를 응답의 ETag/Last-Modified와 함께 캐시에 저장하는 함수"""
+        if self.cache and is_valid_article(art_dic):
+            self.cache.store(url, art_dic, response_headers.get("ETag"), response_headers.get("Last-Modified"))
 
+    def parse_article(self, html_content, url):
+        """기사 HTML에서 제목, 날짜, 본문을 추출하는 함수"""
+        with metrics.timer("parse_duration_seconds"):
+            art_dic = extract_article(html_content)
+        art_dic["url"] = url
         return art_dic
 
     def collect_all_hrefs(self):
@@ -76,27 +219,292 @@ class Scrap:
     def collect_articles(self, all_hrefs, max_workers=5):
         """병렬 처리를 통해 모든 섹션의 기사 데이터를 수집하는 함수"""
         artdic_lst = []
+        section_names = {int(code): category for category, code in self.categories.items()}
+
+        url_index = {}
+        for section, urls in all_hrefs.items():
+            self.index_links(url_index, section, section_names[section], urls)
 
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = []
+            futures = {}
+            budgets = {}
+            claimed = set()
             for section, urls in all_hrefs.items():
                 print(f"Collecting articles for section {section}...")
-                for url in urls:
-                    futures.append(executor.submit(self.art_crawl, url))
+                budgets[section] = SectionBudget(urls, self.per_section_limit, claimed)
+                for url in budgets[section].initial_urls():
+                    futures[executor.submit(self.art_crawl, url)] = (section, url)
+
+            with tqdm(total=len(futures), desc="Scraping Articles") as pbar:
+                while futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        section, url = futures.pop(future)
+                        pbar.update(1)
+                        try:
+                            art_dic = future.result()
+                        except Exception as e:
+                            self.record_failure(url, e)
+                            art_dic = None
+
+                        if budgets[section].accept(art_dic):
+                            art_dic["section"] = section
+                            art_dic["section_name"] = section_names[section]  # 섹션 이름 추가
+                            artdic_lst.append(art_dic)
+                            continue
+
+                        # 실패하거나 N/A인 기사는 남은 링크로 대체
+                        url = budgets[section].replacement_url()
+                        if url is not None:
+                            futures[executor.submit(self.art_crawl, url)] = (section, url)
+                            pbar.total += 1
+                            pbar.refresh()
+
+        return annotate_sections(artdic_lst, url_index)
+
+    def collect_articles_pipelined(self, fetch_workers=10, parse_workers=None, queue_size=32):
+        """
+        네트워크 I/O(fetch 단계, 스레드 풀)와 HTML 파싱(parse 단계, 프로세스 풀)을 분리하여 기사 데이터를 수집하는 함수.
+        두 단계는 원문 bytes를 전달하는 크기 제한 큐로 연결되어, 파싱이 밀리면 fetch 단계도 대기합니다.
+
+        :param fetch_workers: fetch 단계 스레드 수
+        :param parse_workers: parse 단계 프로세스 수 (None이면 CPU 코어 수)
+        :param queue_size: 두 단계 사이 큐의 최대 크기
+        """
+        parse_workers = parse_workers or os.cpu_count() or 1
+        section_names = {int(code): category for category, code in self.categories.items()}
+        fetch_stats = StageStats("fetch")
+        parse_stats = StageStats("parse")
+
+        raw_queue = queue.Queue(maxsize=queue_size)
+        results = queue.Queue()
+        parse_slots = threading.Semaphore(parse_workers * 2)
+
+        def fetch_stage(section, url):
+            start_time = time.perf_counter()
+            try:
+                cached, html = self.fetch_article(url)
+            except Exception as e:
+                results.put((section, url, None, None, e))
+                return
+            if cached is not None:
+                fetch_stats.add(time.perf_counter() - start_time)
+                results.put((section, url, cached, None, None))
+                return
+            fetch_stats.add(time.perf_counter() - start_time, len(html.content))
+            # 큐가 가득 차면 파싱이 따라잡을 때까지 대기 (backpressure)
+            raw_queue.put((section, url, html.content, html.encoding or "utf-8", html.headers))
+
+        def parse_inline(section, url, content, encoding, response_headers):
+            """프로세스 풀을 사용할 수 없을 때 현재 스레드에서 파싱"""
+            try:
+                fields, elapsed = timed_extract_article(content, encoding)
+                parse_stats.add(elapsed)
+                metrics.observe("parse_duration_seconds", elapsed)
+                results.put((section, url, {**fields, "url": url}, response_headers, None))
+            except Exception as e:
+                results.put((section, url, None, None, e))
 
-            for future in tqdm(as_completed(futures), total=len(futures), desc="Scraping Articles"):
+        def on_parsed(future, section, url, content, encoding, response_headers):
+            try:
+                fields, elapsed = future.result()
+                parse_stats.add(elapsed)
+                metrics.observe("parse_duration_seconds", elapsed)
+                results.put((section, url, {**fields, "url": url}, response_headers, None))
+            except BrokenProcessPool:
+                # 워커 프로세스가 죽은 경우(OOM 등) 이 기사는 스레드에서 다시 파싱
+                parse_inline(section, url, content, encoding, response_headers)
+            except Exception as e:
+                results.put((section, url, None, None, e))
+            finally:
+                parse_slots.release()
+
+        def parse_dispatcher(parse_executor):
+            # 모든 항목은 결과 큐에 성공이나 오류로 반드시 전달되어야 수집 루프가 멈추지 않음
+            broken = False
+            while True:
+                item = raw_queue.get()
+                if item is None:
+                    break
+                section, url, content, encoding, response_headers = item
+                if broken:
+                    parse_inline(*item)
+                    continue
+                parse_slots.acquire()
                 try:
-                    art_dic = future.result()
-                    section_code = [section for section, urls in all_hrefs.items() if art_dic["url"] in urls][0]
-                    section_name = [key for key, value in self.categories.items() if int(value) == section_code][0]
-                    art_dic["section"] = section_code
-                    art_dic["section_name"] = section_name  # 섹션 이름 추가
-                    artdic_lst.append(art_dic)
+                    future = parse_executor.submit(timed_extract_article, content, encoding)
+                except Exception as e:
+                    parse_slots.release()
+                    # 프로세스 풀이 깨지면 남은 기사는 모두 스레드에서 파싱
+                    broken = isinstance(e, (BrokenProcessPool, RuntimeError))
+                    print(f"\033[91m파싱 프로세스 풀을 사용할 수 없어 스레드에서 파싱합니다: {type(e).__name__}: {e}\033[0m")
+                    parse_inline(*item)
+                    continue
+                future.add_done_callback(
+                    lambda f, s=section, u=url, c=content, e=encoding, h=response_headers: on_parsed(f, s, u, c, e, h)
+                )
+
+        artdic_lst = []
+        # fork 방식에서는 스레드를 띄우기 전에 워커 프로세스를 먼저 생성합니다.
+        with ProcessPoolExecutor(max_workers=parse_workers) as parse_executor:
+            parse_executor.submit(int).result()
+
+            with ThreadPoolExecutor(max_workers=fetch_workers) as fetch_executor:
+                dispatcher = threading.Thread(target=parse_dispatcher, args=(parse_executor,), daemon=True)
+                dispatcher.start()
+
+                # 섹션 페이지도 fetch 스레드 풀에서 동시에 가져옵니다.
+                codes = [int(code) for code in self.categories.values()]
+                all_hrefs = dict(zip(codes, fetch_executor.map(self.re_tag, codes)))
+
+                url_index = {}
+                for section, urls in all_hrefs.items():
+                    self.index_links(url_index, section, section_names[section], urls)
+
+                budgets = {}
+                claimed = set()
+                outstanding = 0
+                for section, urls in all_hrefs.items():
+                    budgets[section] = SectionBudget(urls, self.per_section_limit, claimed)
+                    for url in budgets[section].initial_urls():
+                        fetch_executor.submit(fetch_stage, section, url)
+                        outstanding += 1
+
+                with tqdm(total=outstanding, desc="Scraping Articles") as pbar:
+                    while outstanding:
+                        section, url, art_dic, response_headers, error = results.get()
+                        outstanding -= 1
+                        pbar.update(1)
+                        if error is not None:
+                            self.record_failure(url, error)
+                        elif response_headers is not None:
+                            self.store_in_cache(url, art_dic, response_headers)
+
+                        if budgets[section].accept(art_dic):
+                            art_dic["section"] = section
+                            art_dic["section_name"] = section_names[section]
+                            artdic_lst.append(art_dic)
+                            continue
+
+                        # 실패하거나 N/A인 기사는 남은 링크로 대체
+                        url = budgets[section].replacement_url()
+                        if url is not None:
+                            fetch_executor.submit(fetch_stage, section, url)
+                            outstanding += 1
+                            pbar.total += 1
+                            pbar.refresh()
+
+                raw_queue.put(None)
+                dispatcher.join()
+
+        print(fetch_stats.report())
+        print(parse_stats.report())
+        return annotate_sections(artdic_lst, url_index)
+
+    async def fetch_text_async(self, session, url):
+        """공유 커넥션 풀(aiohttp 세션)을 통해 HTML을 가져오는 함수"""
+        response, content = await self.fetcher.aget(session, url, headers=self.HEADERS, target="section")
+        return content.decode(response.get_encoding())
+
+    async def art_crawl_async(self, session, url):
+        """비동기로 기사를 가져온 뒤, 파싱은 이벤트 루프를 막지 않도록 스레드에서 처리하는 함수"""
+        entry = self.cache.lookup(url) if self.cache else None
+        if entry and entry["fresh"]:
+            return self.cache.to_article(entry, url)
+
+        headers = {**self.HEADERS, **self.cache.conditional_headers(entry)} if entry else self.HEADERS
+        response, content = await self.fetcher.aget(session, url, headers=headers, target="article")
+        if entry and response.status == 304:
+            self.cache.touch(url)
+            return self.cache.to_article(entry, url)
+        html_content = content.decode(response.get_encoding())
+        response_headers = response.headers
+
+        art_dic = await asyncio.to_thread(self.parse_article, html_content, url)
+        self.store_in_cache(url, art_dic, response_headers)
+        return art_dic
+
+    async def collect_section_async(self, session, category, code, pbar, url_index, claimed, on_article=None):
+        """
+        한 섹션의 링크를 수집하고, 수집되는 즉시 해당 섹션의 기사 요청을 시작하는 함수
+        :param on_article: 기사가 수집될 때마다 호출할 코루틴 함수 (스트리밍 파이프라인용)
+        """
+        print(f"Collecting links for {category}...")
+        html_content = await self.fetch_text_async(session, self.section_url.format(sid=code))
+        urls = list(dict.fromkeys(self.ex_tag(html_content)))
+        self.index_links(url_index, int(code), category, urls)
+
+        budget = SectionBudget(urls, self.per_section_limit, claimed)
+        tasks = {asyncio.create_task(self.art_crawl_async(session, url), name=url) for url in budget.initial_urls()}
+        pbar.total += len(tasks)
+        pbar.refresh()
+
+        artdic_lst = []
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                pbar.update(1)
+                try:
+                    art_dic = task.result()
                 except Exception as e:
-                    print(f"Error scraping article: {e}")
+                    self.record_failure(task.get_name(), e)
+                    art_dic = None
+
+                if budget.accept(art_dic):
+                    art_dic["section"] = int(code)
+                    art_dic["section_name"] = category
+                    artdic_lst.append(art_dic)
+                    if on_article is not None:
+                        await on_article(art_dic)
+                    continue
+
+                # 실패하거나 N/A인 기사는 남은 링크로 대체
+                url = budget.replacement_url()
+                if url is not None:
+                    tasks.add(asyncio.create_task(self.art_crawl_async(session, url), name=url))
+                    pbar.total += 1
+                    pbar.refresh()
 
         return artdic_lst
 
+    async def collect_articles_async(self, max_connections=10, per_host_limit=10, on_article=None,
+                                     on_section_done=None):
+        """
+        asyncio 기반으로 모든 섹션의 기사 데이터를 수집하는 함수.
+        섹션 페이지 요청과 기사 요청이 하나의 keep-alive 커넥션 풀을 공유하며 동시에 진행됩니다.
+
+        :param max_connections: 전체 동시 연결 수
+        :param per_host_limit: 호스트별 동시 연결 수
+        :param on_article: 기사가 수집될 때마다 호출할 코루틴 함수 on_article(art_dic)
+        :param on_section_done: 섹션 수집이 끝나면(실패 포함) 호출할 코루틴 함수 on_section_done(section_code)
+        """
+        url_index = {}
+        claimed = set()
+
+        async def collect_section(session, category, code, pbar):
+            try:
+                return await self.collect_section_async(session, category, code, pbar, url_index, claimed, on_article)
+            finally:
+                if on_section_done is not None:
+                    await on_section_done(int(code))
+
+        connector = aiohttp.TCPConnector(limit=max_connections, limit_per_host=per_host_limit, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            with tqdm(total=0, desc="Scraping Articles") as pbar:
+                sections = [
+                    collect_section(session, category, code, pbar)
+                    for category, code in self.categories.items()
+                ]
+                results = await asyncio.gather(*sections, return_exceptions=True)
+
+        artdic_lst = []
+        for (category, _), result in zip(self.categories.items(), results):
+            if isinstance(result, Exception):
+                print(f"Error collecting section {category}: {result}")
+                continue
+            artdic_lst.extend(result)
+        return annotate_sections(artdic_lst, url_index)
+
     def to_dataframe(self, artdic_lst):
         """기사 데이터를 DataFrame으로 변환하는 함수"""
         return pd.DataFrame(artdic_lst)
@@ -106,16 +514,45 @@ class Scrap:
         art_df.to_csv(self.output_csv, index=False, encoding='utf-8-sig')
         print(f"CSV 파일 저장 완료: {self.output_csv}")
 
-    def scrap(self, max_workers=5):
-        """전체 스크래핑 프로세스를 처리하는 함수"""
-        # 모든 섹션의 링크 수집
-        all_hrefs = self.collect_all_hrefs()
+    def scrap(self, max_workers=5, mode="thread", per_host_limit=10, parse_workers=None):
+        """
+        전체 스크래핑 프로세스를 처리하는 함수
+
+        :param max_workers: 스레드 수 (thread/process 모드) 또는 전체 동시 연결 수 (async 모드)
+        :param mode: "thread" (ThreadPoolExecutor), "async" (asyncio + aiohttp 커넥션 풀)
+                     또는 "process" (fetch 스레드 풀 + parse 프로세스 풀)
+        :param per_host_limit: async 모드에서 호스트별 동시 연결 수
+        :param parse_workers: process 모드에서 파싱 프로세스 수 (None이면 CPU 코어 수)
+        """
+        # 수집이 끝나면 동기 요청의 커넥션 풀을 닫음
+        with self.fetcher:
+            if mode == "async":
+                # 섹션 페이지와 기사를 공유 커넥션 풀로 동시에 수집
+                artdic_lst = asyncio.run(self.collect_articles_async(max_connections=max_workers,
+                                                                     per_host_limit=per_host_limit))
+            elif mode == "process":
+                # 네트워크 I/O와 파싱을 별도의 풀에서 처리
+                artdic_lst = self.collect_articles_pipelined(fetch_workers=max_workers, parse_workers=parse_workers)
+            elif mode == "thread":
+                # 모든 섹션의 링크 수집
+                all_hrefs = self.collect_all_hrefs()
 
-        # 모든 섹션의 데이터 수집 (제목, 날짜, 본문, section, section_name, url)
-        artdic_lst = self.collect_articles(all_hrefs, max_workers=max_workers)
+                # 모든 섹션의 데이터 수집 (제목, 날짜, 본문, section, section_name, url)
+                artdic_lst = self.collect_articles(all_hrefs, max_workers=max_workers)
+            else:
+                raise ValueError(f"Unknown scrap mode: {mode}")
+
+        if self.cache:
+            print(self.cache.stats_message())
+        print(self.fetcher.report())
 
         # DataFrame 생성
         art_df = self.to_dataframe(artdic_lst)
 
+        if self.run_store is not None:
+            self.run_store.append_articles(artdic_lst)
+
         # DataFrame을 CSV 파일로 저장
-        self.save_to_csv(art_df)
+        if self.output_csv is not None:
+            self.save_to_csv(art_df)
+        return art_df
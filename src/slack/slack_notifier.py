@@ -1,24 +1,33 @@
-import os
-from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
-
 import requests
 import json
+from src.util.metrics import metrics
 
 class SlackNotifier:
-    def __init__(self, webhook_url):
+    def __init__(self, webhook_url, timeout=(3.05, 10), session=None):
+        """
+        :param webhook_url: 슬랙 웹훅 URL
+        :param timeout: (연결, 읽기) 타임아웃(초). 중복 전송을 막기 위해 재시도는 하지 않습니다.
+        :param session: 여러 웹훅이 커넥션을 재사용하도록 공유할 requests.Session (None이면 요청마다 새 연결)
+        """
         self.webhook_url = webhook_url
+        self.timeout = timeout
+        self.session = session
 
     def send_message(self, message):
         payload = {
             "text": message,  # 메시지 텍스트
         }
 
-        response = requests.post(
-            self.webhook_url,
-            data=json.dumps(payload),
-            headers={'Content-Type': 'application/json'}
-        )
+        data = json.dumps(payload)
+        with metrics.timer("http_request_duration_seconds", target="slack"):
+            response = (self.session or requests).post(
+                self.webhook_url,
+                data=data,
+                headers={'Content-Type': 'application/json'},
+                timeout=self.timeout
+            )
+        metrics.inc("http_requests_total", target="slack", status=response.status_code)
+        metrics.inc("http_bytes_sent_total", len(data.encode("utf-8")), target="slack")
 
         if response.status_code != 200:
             raise ValueError(
@@ -0,0 +1,318 @@
+import sqlite3
+import threading
+import time
+from src.scrap.article_cache import normalize_article_id
+
+# 테이블별 컬럼 (load 시 columns 인자는 이 목록 안에서만 선택 가능)
+TABLE_COLUMNS = {
+    "links": ["run_id", "article_id", "url", "section", "section_name"],
+    "articles": ["run_id", "article_id", "url", "section", "section_name", "sections", "title", "date", "main",
+                 "shortlisted"],
+    "summaries": ["run_id", "article_id", "section_code", "section_name", "title", "date", "summary"],
+    "rankings": ["run_id", "section_code", "rank", "article_id"],
+    "failures": ["run_id", "stage", "item_id", "error", "attempts", "updated_at"],
+}
+
+
+def dataframe(rows, columns):
+    """조회 결과를 DataFrame으로 변환 (pandas는 main.py -h 등 조회가 없는 실행에서 불러오지 않도록 처음 조회할 때 import)"""
+    import pandas as pd
+
+    return pd.DataFrame(rows, columns=columns)
+
+
+class RunStore:
+    """
+    실행(run)별 중간 결과를 저장하는 SQLite 기반 저장소.
+    단계마다 CSV 전체를 다시 쓰고 읽는 대신, 결과를 행 단위로 추가하고 필요한 컬럼만 조회합니다.
+
+    - links: 섹션 페이지에서 수집한 기사 링크
+    - articles: 수집한 기사 (본문 포함)
+    - summaries: 기사 요약
+    - rankings: 섹션별 선택된 기사 순위
+    - failures: 단계별로 실패한 항목과 오류 (재개 시 다시 시도)
+    - outputs: 한줄 평, 알림 전송 여부 등 실행 단위의 결과
+
+    모든 결과는 완료되는 즉시 기록되므로, 같은 run_id로 다시 실행하면 끝난 작업을 건너뛰고 이어서 진행할 수 있습니다.
+    이전 실행의 결과도 run_id로 조회할 수 있습니다.
+    """
+
+    def __init__(self, db_path, run_id=None, resume=False):
+        """
+        :param db_path: SQLite 파일 경로
+        :param run_id: 실행 ID (None이면 현재 시각으로 생성)
+        :param resume: True이고 run_id가 None이면 가장 최근 실행을 이어서 진행
+        """
+        self.db_path = db_path
+        self.lock = threading.Lock()
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                started_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS links (
+                run_id TEXT,
+                article_id TEXT,
+                url TEXT,
+                section INTEGER,
+                section_name TEXT,
+                PRIMARY KEY (run_id, section, article_id)
+            );
+            CREATE TABLE IF NOT EXISTS articles (
+                run_id TEXT,
+                article_id TEXT,
+                url TEXT,
+                section INTEGER,
+                section_name TEXT,
+                sections TEXT,
+                title TEXT,
+                date TEXT,
+                main TEXT,
+                shortlisted INTEGER DEFAULT 0,
+                PRIMARY KEY (run_id, article_id)
+            );
+            CREATE TABLE IF NOT EXISTS summaries (
+                run_id TEXT,
+                article_id TEXT,
+                section_code INTEGER,
+                section_name TEXT,
+                title TEXT,
+                date TEXT,
+                summary TEXT,
+                PRIMARY KEY (run_id, article_id)
+            );
+            CREATE TABLE IF NOT EXISTS rankings (
+                run_id TEXT,
+                section_code INTEGER,
+                rank INTEGER,
+                article_id TEXT,
+                PRIMARY KEY (run_id, section_code, rank)
+            );
+            CREATE TABLE IF NOT EXISTS failures (
+                run_id TEXT,
+                stage TEXT,
+                item_id TEXT,
+                error TEXT,
+                attempts INTEGER,
+                updated_at REAL,
+                PRIMARY KEY (run_id, stage, item_id)
+            );
+            CREATE TABLE IF NOT EXISTS outputs (
+                run_id TEXT,
+                name TEXT,
+                value TEXT,
+                PRIMARY KEY (run_id, name)
+            );
+            CREATE INDEX IF NOT EXISTS idx_links_article ON links (run_id, article_id);
+            CREATE INDEX IF NOT EXISTS idx_articles_section ON articles (run_id, section);
+            CREATE INDEX IF NOT EXISTS idx_articles_url ON articles (run_id, url);
+            CREATE INDEX IF NOT EXISTS idx_summaries_section ON summaries (run_id, section_code);
+            """
+        )
+        if run_id is None and resume:
+            latest = self.conn.execute("SELECT run_id FROM runs ORDER BY started_at DESC LIMIT 1").fetchone()
+            run_id = latest[0] if latest else None
+        self.run_id = run_id or time.strftime("%Y%m%d-%H%M%S")
+        self.conn.execute("INSERT OR IGNORE INTO runs (run_id, started_at) VALUES (?, ?)", (self.run_id, time.time()))
+        self.conn.commit()
+
+    def execute_many(self, sql, rows):
+        with self.lock:
+            self.conn.executemany(sql, rows)
+            self.conn.commit()
+
+    def append_links(self, section, section_name, urls):
+        """섹션 페이지에서 수집한 기사 링크들을 추가하는 함수"""
+        self.execute_many(
+            "INSERT OR IGNORE INTO links (run_id, article_id, url, section, section_name) VALUES (?, ?, ?, ?, ?)",
+            [(self.run_id, normalize_article_id(url), url, section, section_name) for url in urls]
+        )
+
+    def append_articles(self, artdic_lst):
+        """수집한 기사 딕셔너리들을 추가하는 함수 (같은 기사는 덮어씀)"""
+        self.execute_many(
+            """
+            INSERT OR REPLACE INTO articles (run_id, article_id, url, section, section_name, sections, title, date, main)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (self.run_id, normalize_article_id(art_dic["url"]), art_dic["url"], art_dic["section"],
+                 art_dic["section_name"], art_dic.get("sections", str(art_dic["section"])), art_dic["title"],
+                 art_dic["date"], art_dic["main"])
+                for art_dic in artdic_lst
+            ]
+        )
+
+    def append_article(self, art_dic):
+        """기사 한 건을 추가하는 함수"""
+        self.append_articles([art_dic])
+
+    def mark_shortlisted(self, urls):
+        """요약 대상으로 선정된 기사를 표시하는 함수"""
+        self.execute_many(
+            "UPDATE articles SET shortlisted = 1 WHERE run_id = ? AND article_id = ?",
+            [(self.run_id, normalize_article_id(url)) for url in urls]
+        )
+
+    def replace_shortlist(self, urls):
+        """요약 대상을 주어진 기사들로 바꾸는 함수 (나머지 기사는 요약 대상에서 제외)"""
+        with self.lock:
+            self.conn.execute("UPDATE articles SET shortlisted = 0 WHERE run_id = ?", (self.run_id,))
+            self.conn.executemany("UPDATE articles SET shortlisted = 1 WHERE run_id = ? AND article_id = ?",
+                                  [(self.run_id, normalize_article_id(url)) for url in urls])
+            self.conn.commit()
+
+    def append_summaries(self, summaries):
+        """
+        요약 결과들을 추가하는 함수
+        :param summaries: article_id, section_code, section_name, title, date, summary 키를 가진 딕셔너리 리스트
+        """
+        self.execute_many(
+            """
+            INSERT OR REPLACE INTO summaries (run_id, article_id, section_code, section_name, title, date, summary)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (self.run_id, row["article_id"], int(row["section_code"]), row["section_name"], row["title"],
+                 row["date"], row["summary"])
+                for row in summaries
+            ]
+        )
+
+    def append_summary(self, row):
+        """요약 결과 한 건을 추가하는 함수"""
+        self.append_summaries([row])
+
+    def append_rankings(self, section_code, article_ids):
+        """섹션에서 선택된 기사들을 순위대로 추가하는 함수"""
+        self.execute_many(
+            "INSERT OR REPLACE INTO rankings (run_id, section_code, rank, article_id) VALUES (?, ?, ?, ?)",
+            [(self.run_id, int(section_code), rank, article_id) for rank, article_id in enumerate(article_ids, start=1)]
+        )
+
+    def record_failures(self, stage, item_ids, error):
+        """
+        단계에서 실패한 항목들을 기록하는 함수 (같은 항목이 다시 실패하면 시도 횟수 증가)
+        :param stage: 단계 이름 (summarize, filter, review 등)
+        :param item_ids: 실패한 항목 ID 리스트 (기사 ID, 섹션 코드 등)
+        :param error: 발생한 예외
+        """
+        self.execute_many(
+            """
+            INSERT INTO failures (run_id, stage, item_id, error, attempts, updated_at) VALUES (?, ?, ?, ?, 1, ?)
+            ON CONFLICT (run_id, stage, item_id) DO UPDATE SET
+                error = excluded.error, attempts = attempts + 1, updated_at = excluded.updated_at
+            """,
+            [(self.run_id, stage, str(item_id), f"{type(error).__name__}: {error}", time.time()) for item_id in item_ids]
+        )
+
+    def put_output(self, name, value):
+        """실행 단위의 결과(한줄 평 등)를 기록하는 함수"""
+        self.execute_many("INSERT OR REPLACE INTO outputs (run_id, name, value) VALUES (?, ?, ?)",
+                          [(self.run_id, name, value)])
+
+    def get_output(self, name, run_id=None):
+        """기록된 실행 단위의 결과를 반환하는 함수 (없으면 None)"""
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM outputs WHERE run_id = ? AND name = ?",
+                                    (run_id or self.run_id, name)).fetchone()
+        return row[0] if row else None
+
+    def count(self, table, run_id=None, **filters):
+        """테이블에서 조건에 맞는 행 수를 반환하는 함수"""
+        for column in filters:
+            if column not in TABLE_COLUMNS[table]:
+                raise ValueError(f"Unknown column for {table}: {column}")
+        conditions = " AND ".join(["run_id = ?", *(f"{column} = ?" for column in filters)])
+        with self.lock:
+            row = self.conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {conditions}",
+                                    (run_id or self.run_id, *filters.values())).fetchone()
+        return row[0]
+
+    def load(self, table, columns=None, run_id=None, **filters):
+        """
+        테이블에서 필요한 컬럼만 조회하여 DataFrame으로 반환하는 함수
+        :param table: 테이블 이름 (links, articles, summaries, rankings)
+        :param columns: 조회할 컬럼 리스트 (None이면 run_id를 제외한 모든 컬럼)
+        :param run_id: 조회할 실행 ID (None이면 현재 실행)
+        :param filters: 컬럼 = 값 조건 (예: section=100, url="...")
+        """
+        allowed = TABLE_COLUMNS[table]
+        columns = columns or [column for column in allowed if column != "run_id"]
+        for column in [*columns, *filters]:
+            if column not in allowed:
+                raise ValueError(f"Unknown column for {table}: {column}")
+
+        conditions = " AND ".join(["run_id = ?", *(f"{column} = ?" for column in filters)])
+        sql = f"SELECT {', '.join(columns)} FROM {table} WHERE {conditions}"
+        with self.lock:
+            rows = self.conn.execute(sql, (run_id or self.run_id, *filters.values())).fetchall()
+        return dataframe(rows, columns=columns)
+
+    def load_articles(self, columns=None, run_id=None, **filters):
+        return self.load("articles", columns, run_id, **filters)
+
+    def load_summaries(self, columns=None, run_id=None, **filters):
+        return self.load("summaries", columns, run_id, **filters)
+
+    def load_shortlisted_summaries(self, columns=None, run_id=None):
+        """현재 요약 대상으로 선정된 기사의 요약만 반환하는 함수"""
+        columns = self.summary_columns(columns)
+        sql = f"""
+            SELECT {', '.join(f's.{column}' for column in columns)}
+            FROM summaries s JOIN articles a ON a.run_id = s.run_id AND a.article_id = s.article_id
+            WHERE s.run_id = ? AND a.shortlisted = 1
+        """
+        with self.lock:
+            rows = self.conn.execute(sql, (run_id or self.run_id,)).fetchall()
+        return dataframe(rows, columns=columns)
+
+    @staticmethod
+    def summary_columns(columns):
+        """조회할 summaries 테이블의 컬럼을 검증하여 반환하는 함수 (None이면 run_id를 제외한 모든 컬럼)"""
+        allowed = TABLE_COLUMNS["summaries"]
+        columns = columns or [column for column in allowed if column != "run_id"]
+        for column in columns:
+            if column not in allowed:
+                raise ValueError(f"Unknown column for summaries: {column}")
+        return columns
+
+    def load_top_articles(self, columns=None, run_id=None, section_codes=None, max_rank=None):
+        """
+        섹션별로 선택된 기사의 요약을 섹션 코드, 순위 순으로 반환하는 함수
+        :param columns: 조회할 summaries 테이블의 컬럼 리스트 (None이면 run_id를 제외한 모든 컬럼)
+        :param section_codes: 조회할 섹션 코드 리스트 (None이면 모든 섹션)
+        :param max_rank: 섹션별로 이 순위까지만 조회 (None이면 모든 순위)
+        """
+        columns = self.summary_columns(columns)
+        conditions = ["r.run_id = ?"]
+        params = [run_id or self.run_id]
+        if section_codes is not None:
+            section_codes = [int(code) for code in section_codes]
+            conditions.append(f"r.section_code IN ({', '.join('?' * len(section_codes))})")
+            params.extend(section_codes)
+        if max_rank is not None:
+            conditions.append("r.rank <= ?")
+            params.append(max_rank)
+        sql = f"""
+            SELECT {', '.join(f's.{column}' for column in columns)}
+            FROM rankings r JOIN summaries s ON s.run_id = r.run_id AND s.article_id = r.article_id
+            WHERE {' AND '.join(conditions)}
+            ORDER BY r.section_code, r.rank
+        """
+        with self.lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return dataframe(rows, columns=columns)
+
+    def runs(self):
+        """저장된 실행 목록을 최신순으로 반환하는 함수"""
+        with self.lock:
+            rows = self.conn.execute("SELECT run_id, started_at FROM runs ORDER BY started_at DESC").fetchall()
+        return dataframe(rows, columns=["run_id", "started_at"])
+
+    def close(self):
+        self.conn.close()
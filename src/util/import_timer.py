@@ -0,0 +1,56 @@
+import builtins
+import sys
+import time
+from contextlib import contextmanager
+
+
+class ImportTimer:
+    """
+    단계별로 새로 불러온 모듈과 import에 걸린 시간을 기록하는 클래스 (python -X importtime의 요약판).
+    단계 안에서 직접 import한 모듈 단위로 집계하며, 그 모듈이 불러온 하위 모듈의 시간은 바깥 import에 포함됩니다.
+    """
+
+    def __init__(self, top=5):
+        """
+        :param top: 단계별로 보고할 가장 느린 import 수
+        """
+        self.top = top
+        self.imports = {}  # {단계: [(모듈, 초)]}
+        self.stage_times = {}
+        self.depth = 0
+
+    @contextmanager
+    def stage(self, name):
+        """이 컨텍스트 안에서 일어나는 import의 시간을 name 단계로 기록"""
+        original_import = builtins.__import__
+        records = self.imports.setdefault(name, [])
+
+        def timed_import(module_name, globals=None, locals=None, fromlist=(), level=0):
+            # 이미 불러온 모듈, 상대 import, 다른 import 안에서 일어나는 import는 따로 기록하지 않음
+            if self.depth or level or module_name in sys.modules:
+                return original_import(module_name, globals, locals, fromlist, level)
+            self.depth += 1
+            start_time = time.perf_counter()
+            try:
+                return original_import(module_name, globals, locals, fromlist, level)
+            finally:
+                self.depth -= 1
+                records.append((module_name, time.perf_counter() - start_time))
+
+        builtins.__import__ = timed_import
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            builtins.__import__ = original_import
+            self.stage_times[name] = time.perf_counter() - start_time
+
+    def report(self):
+        """단계별 소요 시간, import 시간, 가장 느린 import 목록을 문자열로 반환하는 함수"""
+        lines = ["[import 시간 보고] (자세한 내용은 python -X importtime main.py ...)"]
+        for name, elapsed in self.stage_times.items():
+            records = sorted(self.imports.get(name, []), key=lambda record: record[1], reverse=True)
+            import_time = sum(seconds for _, seconds in records)
+            lines.append(f"[{name}] 단계 {elapsed:.2f}초 중 import {import_time:.2f}초")
+            lines.extend(f"    {seconds:6.3f}초  {module_name}" for module_name, seconds in records[:self.top])
+        return "\n".join(lines)
@@ -0,0 +1,212 @@
+import cProfile
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# 초 단위 지연 시간 히스토그램의 구간 (Prometheus 기본값에 긴 LLM 호출 구간을 추가)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+METRIC_PREFIX = "news_clip_"
+
+
+def label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def format_labels(key):
+    if not key:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in key) + "}"
+
+
+class Histogram:
+    """관측값의 구간별 누적 개수와 백분위를 계산하는 히스토그램"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.values = []
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.values.append(value)
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+
+    def quantile(self, q):
+        ordered = sorted(self.values)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+    def summary(self):
+        return {
+            "count": len(self.values),
+            "sum": round(self.sum, 6),
+            "p50": round(self.quantile(0.5), 6),
+            "p95": round(self.quantile(0.95), 6),
+            "max": round(max(self.values, default=0.0), 6),
+        }
+
+
+class Metrics:
+    """
+    파이프라인 전체가 공유하는 측정값 저장소.
+
+    - 단계별 소요 시간 (stage)
+    - 요청별 지연 시간 히스토그램: HTTP 요청, HTML 파싱, LLM 호출 (timer, observe)
+    - 재시도/429 횟수, 토큰 사용량, 다운로드 바이트 수 등의 카운터 (inc)
+
+    실행이 끝나면 JSON 보고서와 Prometheus textfile로 저장합니다.
+    LLM 관련 측정값에는 현재 실행 중인 단계가 stage 라벨로 붙습니다.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}  # {(이름, 라벨): 값}
+        self.histograms = {}  # {(이름, 라벨): Histogram}
+        self.stage_times = {}
+        self.current_stage = None
+        self.profile_dir = None
+
+    def inc(self, name, amount=1, **labels):
+        """카운터를 amount만큼 증가"""
+        key = (name, label_key(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        """히스토그램에 관측값(초)을 추가"""
+        key = (name, label_key(labels))
+        with self.lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+            self.histograms[key].observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """컨텍스트 안의 실행 시간을 히스토그램에 기록"""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start_time, **labels)
+
+    def histogram(self, name, **labels):
+        """기록된 히스토그램을 반환 (없으면 빈 히스토그램)"""
+        with self.lock:
+            return self.histograms.get((name, label_key(labels)), Histogram())
+
+    def counter(self, name, **labels):
+        """기록된 카운터 값을 반환 (없으면 0)"""
+        with self.lock:
+            return self.counters.get((name, label_key(labels)), 0)
+
+    def reset(self):
+        """모든 측정값을 지움 (벤치마크에서 시나리오마다 새로 측정할 때 사용)"""
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.stage_times.clear()
+
+    @property
+    def stage_label(self):
+        return self.current_stage or "none"
+
+    def enable_profiling(self, profile_dir):
+        """단계마다 cProfile 결과를 profile_dir/<단계>.prof로 저장하도록 설정"""
+        os.makedirs(profile_dir, exist_ok=True)
+        self.profile_dir = profile_dir
+
+    @contextmanager
+    def stage(self, name):
+        """단계의 소요 시간을 기록하고, 프로파일링이 켜져 있으면 cProfile로 감싸서 실행"""
+        self.current_stage = name
+        profiler = cProfile.Profile() if self.profile_dir else None
+        start_time = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+                profile_path = os.path.join(self.profile_dir, f"{name}.prof")
+                profiler.dump_stats(profile_path)
+                print(f"[{name}] 프로파일 저장: {profile_path} (python -m pstats {profile_path})")
+            self.stage_times[name] = time.perf_counter() - start_time
+            self.current_stage = None
+
+    def report(self, **extra):
+        """모든 측정값을 JSON으로 직렬화할 수 있는 딕셔너리로 반환"""
+        with self.lock:
+            return {
+                **extra,
+                "stages": {name: round(seconds, 3) for name, seconds in self.stage_times.items()},
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self.counters.items())
+                ],
+                "histograms": [
+                    {"name": name, "labels": dict(labels), **histogram.summary()}
+                    for (name, labels), histogram in sorted(self.histograms.items())
+                ],
+            }
+
+    def prometheus_text(self):
+        """Prometheus text exposition 형식으로 변환"""
+        lines = [f"# TYPE {METRIC_PREFIX}stage_duration_seconds gauge"]
+        lines.extend(f'{METRIC_PREFIX}stage_duration_seconds{{stage="{name}"}} {seconds:.6f}'
+                     for name, seconds in self.stage_times.items())
+
+        with self.lock:
+            typed = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {METRIC_PREFIX}{name} counter")
+                    typed.add(name)
+                lines.append(f"{METRIC_PREFIX}{name}{format_labels(labels)} {value}")
+
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {METRIC_PREFIX}{name} histogram")
+                    typed.add(name)
+                for bound, count in zip(histogram.buckets, histogram.bucket_counts):
+                    lines.append(f"{METRIC_PREFIX}{name}_bucket{format_labels(labels + (('le', str(bound)),))} {count}")
+                lines.append(f"{METRIC_PREFIX}{name}_bucket{format_labels(labels + (('le', '+Inf'),))} "
+                             f"{len(histogram.values)}")
+                lines.append(f"{METRIC_PREFIX}{name}_sum{format_labels(labels)} {histogram.sum:.6f}")
+                lines.append(f"{METRIC_PREFIX}{name}_count{format_labels(labels)} {len(histogram.values)}")
+        return "\n".join(lines) + "\n"
+
+    def write_reports(self, json_path=None, prometheus_path=None, **extra):
+        """
+        JSON 보고서와 Prometheus textfile을 저장하는 함수.
+        textfile은 node_exporter가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체합니다.
+        """
+        if json_path:
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(self.report(**extra), f, ensure_ascii=False, indent=2)
+            print(f"측정 보고서 저장: {json_path}")
+        if prometheus_path:
+            tmp_path = f"{prometheus_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self.prometheus_text())
+            os.replace(tmp_path, prometheus_path)
+            print(f"Prometheus textfile 저장: {prometheus_path}")
+
+    def summary_message(self):
+        """단계별 소요 시간과 주요 지연 시간을 한눈에 보여주는 문자열"""
+        lines = ["[측정 요약]"]
+        lines.extend(f"  {name}: {seconds:.2f}초" for name, seconds in self.stage_times.items())
+        with self.lock:
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                summary = histogram.summary()
+                lines.append(f"  {name}{format_labels(labels)}: {summary['count']}건, "
+                             f"p50 {summary['p50'] * 1000:.0f}ms, p95 {summary['p95'] * 1000:.0f}ms")
+        return "\n".join(lines)
+
+
+# 모든 모듈이 공유하는 측정값 저장소
+metrics = Metrics()
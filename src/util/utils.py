@@ -5,3 +5,24 @@ def print_progress_bar(work, completed, total, bar_length=40):
     progress_bar = f"[{'#' * block}{'.' * (bar_length - block)}]"
     progress_percent = f"{progress * 100:.2f}%"
     print(f"\033[91m{work}진행 상황: {progress_bar} {progress_percent} ({completed}/{total})\033[0m", flush=True)
+
+
+def merge_summaries(top_articles_df):
+    """
+    선택된 기사 DataFrame의 summary 열을 섹션별로 문자열로 병합한 후 반환합니다.
+    :param top_articles_df: section_name, summary 열을 가진 DataFrame
+    :return: 섹션별로 병합된 summary 내용 (문자열)
+    """
+    # 섹션별로 그룹화하여 섹션 이름과 함께 summary를 병합
+    sections = top_articles_df['section_name'].unique()  # 'section_name'으로 그룹화
+
+    merged_content = []
+    for section in sections:
+        merged_content.append(f"*[{section}]*")  # 섹션 이름 추가
+        section_articles = top_articles_df[top_articles_df['section_name'] == section]['summary'].tolist()
+        merged_content.extend([f"● {summary}" for summary in section_articles])
+
+    # 전체를 "\n\n"으로 구분하여 하나의 문자열로 병합
+    final_content = "\n\n".join(merged_content)
+
+    return final_content
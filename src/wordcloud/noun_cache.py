@@ -0,0 +1,100 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+
+
+def text_key(text, version):
+    """정규화한 기사 본문과 명사 추출 방식의 버전으로 캐시 키를 만드는 함수"""
+    normalized = re.sub(r"\s+", " ", str(text)).strip()
+    return hashlib.sha256(f"{version}\0{normalized}".encode("utf-8")).hexdigest()
+
+
+class NounCache:
+    """
+    본문 내용 해시를 키로 기사별 명사 빈도(Counter)를 저장하는 SQLite 기반 디스크 캐시.
+    다시 실행하면 새로 수집된 기사만 형태소 분석합니다.
+    """
+
+    def __init__(self, db_path, max_age=30 * 24 * 3600, max_entries=50000):
+        """
+        :param db_path: SQLite 파일 경로
+        :param max_age: 이 시간(초)보다 오래된 항목은 삭제
+        :param max_entries: 최대 보관 항목 수 (초과 시 오래 사용되지 않은 항목부터 삭제)
+        """
+        self.db_path = db_path
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS noun_counts (
+                key TEXT PRIMARY KEY,
+                counts TEXT,
+                created_at REAL,
+                accessed_at REAL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_noun_counts_accessed_at ON noun_counts (accessed_at)")
+        self.conn.commit()
+
+    def get_many(self, keys):
+        """저장된 명사 빈도들을 {키: {명사: 빈도}}로 반환하는 함수 (없는 키는 제외)"""
+        keys = list(set(keys))
+        found = {}
+        with self.lock:
+            # SQLite 변수 개수 제한을 넘지 않도록 나누어 조회
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT key, counts FROM noun_counts WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                found.update((key, json.loads(counts)) for key, counts in rows)
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+            self.conn.executemany("UPDATE noun_counts SET accessed_at = ? WHERE key = ?",
+                                  [(time.time(), key) for key in found])
+            self.conn.commit()
+        return found
+
+    def put_many(self, items):
+        """{키: {명사: 빈도}}를 저장하는 함수"""
+        now = time.time()
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO noun_counts (key, counts, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                [(key, json.dumps(counts, ensure_ascii=False), now, now) for key, counts in items.items()]
+            )
+            self.conn.commit()
+
+    def evict(self):
+        """max_age보다 오래된 항목과 max_entries를 넘는 항목을 삭제하는 함수"""
+        with self.lock:
+            self.conn.execute("DELETE FROM noun_counts WHERE created_at < ?", (time.time() - self.max_age,))
+            self.conn.execute(
+                """
+                DELETE FROM noun_counts WHERE key IN (
+                    SELECT key FROM noun_counts ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            )
+            self.conn.commit()
+
+    def close(self):
+        """캐시를 정리하고 연결을 닫는 함수"""
+        self.evict()
+        self.conn.close()
+
+    def stats_message(self):
+        return f"명사 빈도 캐시 - 적중: {self.hits}, 미스: {self.misses}"
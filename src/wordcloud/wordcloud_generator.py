@@ -4,8 +4,41 @@ import matplotlib.pyplot as plt
 from konlpy.tag import Okt
 import re
 import random
+import time
+from collections import Counter
 from colorsys import hsv_to_rgb
+from concurrent.futures import ProcessPoolExecutor
 import os  # 추가: 파일 경로를 처리하기 위해 필요
+from src.wordcloud.noun_cache import text_key
+
+# 제외할 단어 (set으로 조회)
+EXCLUDE_WORDS = frozenset({"대해", "라며", "지난", "기자", "오늘", "내일", "어제", "위해", "때문", "연합뉴스", "이후", "지금", "관련",
+                           "통해", "제공"})
+# 명사 추출 방식(제외 단어, 필터 조건 등)을 바꾸면 캐시가 무효화되도록 버전을 올려 주세요.
+NOUN_COUNT_VERSION = "okt-nouns-v1"
+
+# 워커 프로세스마다 하나씩 생성되는 형태소 분석기 (각 프로세스가 자신의 JVM을 가짐)
+_okt = None
+
+
+def init_noun_worker():
+    """프로세스 풀 워커 초기화 함수 - 워커마다 Okt(JVM)를 한 번만 생성합니다."""
+    global _okt
+    _okt = Okt()
+
+
+def count_nouns(text, okt):
+    """기사 본문 하나의 명사 빈도를 Counter로 반환하는 함수"""
+    # 특수 문자 제거
+    text = re.sub(r'[^\w\s]', '', str(text))
+
+    # 형태소 분석을 통해 명사만 추출하고, 1글자짜리 명사와 제외할 단어는 제거
+    return Counter(noun for noun in okt.nouns(text) if len(noun) > 1 and noun not in EXCLUDE_WORDS)
+
+
+def count_nouns_batch(texts):
+    """워커 프로세스에서 여러 기사의 명사 빈도를 계산하는 함수"""
+    return [dict(count_nouns(text, _okt)) for text in texts]
 
 
 def generate_color_func(hue_min, hue_max):
@@ -23,13 +56,29 @@ def generate_color_func(hue_min, hue_max):
 
 
 class WordCloudGenerator:
-    def __init__(self, csv_file, font_path=None, output_image='../output/wordcloud.png'):
+    """
+    기사 본문의 명사 빈도로 워드 클라우드 이미지를 만드는 클래스.
+
+    기사별 명사 빈도는 본문 내용 해시로 캐시되어 새로 수집된 기사만 분석하며,
+    캐시에 없는 기사는 프로세스 풀(워커마다 별도의 JVM)에서 묶음 단위로 동시에 분석합니다.
+    """
+
+    def __init__(self, csv_file=None, font_path=None, output_image='../output/wordcloud.png', cache=None,
+                 workers=None, batch_size=20):
+        """
+        :param csv_file: 기사 CSV 파일 경로 (generate_wordcloud에 본문을 직접 넘기면 사용하지 않음)
+        :param font_path: 한글 폰트 파일 경로
+        :param output_image: 이미지를 저장할 파일 경로
+        :param cache: 명사 빈도 캐시 (NounCache 인스턴스, None이면 캐시 사용 안 함)
+        :param workers: 형태소 분석 프로세스 수 (None이면 CPU 코어 수)
+        :param batch_size: 한 번에 워커에 넘길 기사 수
+        """
         self.csv_file = csv_file
         self.font_path = font_path
         self.output_image = output_image
-        self.okt = Okt()
-        self.exclude_words = ["대해", "라며", "지난", "기자", "오늘", "내일", "어제", "위해", "때문", "연합뉴스", "이후", "지금", "관련", "통해",
-                              "제공"]
+        self.cache = cache
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
 
         # 다양한 톤의 색상 팔레트 정의
         self.color_palettes = {
@@ -45,43 +94,66 @@ class WordCloudGenerator:
             'magenta': generate_color_func(0.8, 1.0)  # 마젠타 톤
         }
 
-    def preprocess_text(self, text):
-        # 특수 문자 제거
-        text = re.sub(r'[^\w\s]', '', text)
-
-        # 형태소 분석을 통해 명사만 추출
-        nouns = self.okt.nouns(text)
-
-        # 1글자짜리 명사는 의미 없는 경우가 많아 제거
-        nouns = [noun for noun in nouns if len(noun) > 1]
-
-        # 제외할 단어 필터링
-        nouns = [noun for noun in nouns if noun not in self.exclude_words]
-
-        # 다시 하나의 문자열로 결합
-        return ' '.join(nouns)
-
-    def generate_wordcloud(self):
+    def analyze(self, texts):
+        """
+        캐시에 없는 본문들을 프로세스 풀에서 분석하는 함수
+        :return: {캐시 키: {명사: 빈도}}
+        """
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        workers = min(self.workers, len(batches))
+        print(f"{len(texts)}개의 기사를 {workers}개의 프로세스로 형태소 분석합니다.")
+
+        counts = {}
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_noun_worker) as executor:
+            for batch, batch_counts in zip(batches, executor.map(count_nouns_batch, batches)):
+                counts.update((text_key(text, NOUN_COUNT_VERSION), noun_counts)
+                              for text, noun_counts in zip(batch, batch_counts))
+        return counts
+
+    def word_frequencies(self, texts):
+        """모든 기사의 명사 빈도를 합친 Counter를 반환하는 함수"""
+        keys = [text_key(text, NOUN_COUNT_VERSION) for text in texts]
+        counts = self.cache.get_many(keys) if self.cache is not None else {}
+
+        # 같은 본문은 한 번만 분석
+        pending = list({key: text for key, text in zip(keys, texts) if key not in counts}.values())
+        if pending:
+            analyzed = self.analyze(pending)
+            if self.cache is not None:
+                self.cache.put_many(analyzed)
+            counts.update(analyzed)
+
+        frequencies = Counter()
+        for key in keys:
+            frequencies.update(counts[key])
+        return frequencies
+
+    def generate_wordcloud(self, texts=None):
+        """
+        :param texts: 기사 본문 리스트 (None이면 csv_file의 'main' 열 사용)
+        """
         print(f"\033[95m워드 클라우드 이미지 생성중...\033[0m")
-        # CSV 파일에서 데이터 불러오기
-        df = pd.read_csv(self.csv_file)
-
-        # 'main' 열의 텍스트를 모두 연결하여 하나의 문자열로 만듦
-        text = " ".join(df['main'].tolist())
+        start_time = time.time()
+        if texts is None:
+            # CSV 파일에서 본문만 불러오기
+            texts = pd.read_csv(self.csv_file, usecols=['main'])['main'].tolist()
+        texts = [str(text) for text in texts if isinstance(text, str) and text != "N/A"]
 
-        # 전처리 수행
-        processed_text = self.preprocess_text(text)
+        frequencies = self.word_frequencies(texts)
+        if self.cache is not None:
+            print(f"\033[92m{self.cache.stats_message()}\033[0m")
 
-        # 워드 클라우드 생성
+        # 워드 클라우드 생성 (이미 센 빈도를 사용하므로 다시 토큰화하지 않음)
         selected_palette_name = random.choice(list(self.color_palettes.keys()))
         selected_color_func = self.color_palettes[selected_palette_name]
         wordcloud = WordCloud(font_path=self.font_path, width=1600, height=800, background_color='white',
                               collocations=False, max_words=80, scale=10, max_font_size=200,
-                              color_func=selected_color_func).generate(processed_text)
+                              color_func=selected_color_func).generate_from_frequencies(frequencies)
 
         # 워드 클라우드 이미지 파일로 저장
         wordcloud.to_file(self.output_image)
-        print(f"\033[95m워드 클라우드 이미지가 {self.output_image} 파일로 저장되었습니다.\033[0m")
+        print(f"\033[95m워드 클라우드 이미지가 {self.output_image} 파일로 저장되었습니다. "
+              f"(소요 시간: {time.time() - start_time:.2f}초)\033[0m")
 
         # 워드 클라우드 출력 (옵션)
         # plt.figure(figsize=(10, 5))
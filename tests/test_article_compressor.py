@@ -0,0 +1,23 @@
+import pytest
+from src.gpt.article_compressor import ArticleCompressor
+
+
+@pytest.mark.parametrize("text", [
+    "정부는 웹/API 개방과 데이터 공유를 추진합니다.",
+    "한미 정상은 경주/APEC 회의에서 만났습니다.",
+    "경주/APEC 회의가 열렸습니다.",
+    "회사는 앱/APP 서비스를 출시했습니다.",
+])
+def test_body_text_with_slash_is_kept(text):
+    assert ArticleCompressor.strip_boilerplate(text) == text
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("사진은 기사와 관련 없음 / 연합뉴스시장에서는 기대가 큽니다.", "시장에서는 기대가 큽니다."),
+    ("첫 문장입니다.코스피 지수가 표시돼 있다 / 연합뉴스", "첫 문장입니다."),
+    ("첫 문장입니다. (코스피 지수 / 뉴스1 제공) 다음입니다.", "첫 문장입니다. 다음입니다."),
+    ("경제가 좋습니다.서울 시내 / 로이터 연합뉴스", "경제가 좋습니다."),
+    ("(서울=연합뉴스) 홍길동 기자 = 코스피가 올랐다. 홍길동 기자 (hong@yna.co.kr)", "코스피가 올랐다."),
+])
+def test_captions_and_bylines_are_stripped(text, expected):
+    assert ArticleCompressor.strip_boilerplate(text) == expected